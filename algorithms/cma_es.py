@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CMA-ES z restartami IPOP dla optymalizacji trasy drona
+Optymalizowane są współrzędne punktów pośrednich (2 * (W - 2) wymiarów, w 3D 3 * (W - 2))
+"""
+
+import numpy as np
+import time
+from collections import deque
+from drone_path_optimization import (
+    GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, GENERATIONS,
+    WIND_SPEED, WIND_DIRECTION, repair_population, space_bounds, OBSTACLES
+)
+from geometry import compile_obstacles, evaluate_paths, resample_path
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
+)
+from seeding import initial_seeds
+from random_streams import make_rng
+from smoothing import smooth_result
+
+# Kara za odległość próbki od jej naprawionej wersji (utrzymuje rozkład w obszarze dopuszczalnym)
+REPAIR_PENALTY = 0.01
+# Restart, gdy rozkład się skurczył lub najlepszy fitness przestał się zmieniać
+TOL_X = 1e-2
+TOL_FUN = 1e-2
+
+
+class CMAES:
+    """CMA-ES z restartami IPOP dla optymalizacji trasy drona"""
+
+    def __init__(self, generations=GENERATIONS,
+                 population_size=None,
+                 sigma0=GRID_WIDTH * 0.1,
+                 restarts=4, num_waypoints=NUM_WAYPOINTS,
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False,
+                 altitude_layers=None, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
+        self.generations = generations
+        self.num_waypoints = num_waypoints
+        self.start = list(start) if start is not None else [0, 0]
+        # Start (x, y, z) włącza tryb 3D
+        self.ndim = len(self.start)
+        self.dim = self.ndim * (num_waypoints - 2)
+        # Domyślna liczebność λ = 4 + 3 ln(D); IPOP podwaja ją przy każdym restarcie
+        self.population_size = population_size or 4 + int(3 * np.log(self.dim))
+        self.sigma0 = sigma0
+        self.restarts = restarts
+        self.goal = list(goal) if goal is not None else [GRID_WIDTH, GRID_HEIGHT] + self.start[2:]
+        # Dozwolone wysokości lotu w 3D (None - dowolna w [0, MAX_ALTITUDE])
+        self.altitude_layers = altitude_layers
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        # Trasy startowe - najlepsza z nich jest średnią pierwszego rozkładu
+        self.initial_paths = list(initial_paths or [])
+        # Opcjonalny seeding ('astar') - bezkolizyjne trasy z A* jako punkt startowy
+        self.seeding = seeding
+        # Skracanie i wygładzanie najlepszej trasy po zakończeniu
+        self.smooth = smooth
+        # Własny generator (int, SeedSequence lub np.random.Generator) - bez globalnego random
+        self.rng = make_rng(seed)
+        self.observers = list(observers or [])
+        if verbose:
+            self.observers.insert(0, ProgressPrinter(
+                fmt=ProgressPrinter.DEFAULT_FORMAT + " (λ={lam}, restart {restart})"))
+        self.best_fitness = []
+        self.avg_fitness = []
+        self.evaluations = 0
+        self.restarts_done = 0
+
+    def _to_paths(self, x):
+        """Wektory (N, D) -> naprawione trasy (N, W, 2) lub (N, W, 3)"""
+        paths = np.empty((len(x), self.num_waypoints, self.ndim))
+        paths[:, 1:-1] = x.reshape(len(x), -1, self.ndim)
+        return repair_population(paths, self.start, self.goal, self.geometry,
+                                 altitude_layers=self.altitude_layers)
+
+    def _evaluate(self, x):
+        """Fitness naprawionych tras + kara za naprawę -> (paths, fitness, ranking)"""
+        paths = self._to_paths(x)
+        fits = evaluate_paths(paths, self.geometry, self.wind_speed, self.wind_direction)
+        self.evaluations += len(x)
+        repair_dist = ((paths[:, 1:-1].reshape(len(x), -1) - x) ** 2).sum(axis=1)
+        return paths, fits, fits + REPAIR_PENALTY * repair_dist
+
+    def _line_mean(self, noise=0.0):
+        """Punkty pośrednie odcinka start-meta (z opcjonalnym szumem) jako wektor (D,)"""
+        t = np.linspace(0, 1, self.num_waypoints)[1:-1, None]
+        line = np.asarray(self.start, dtype=float) + t * np.subtract(self.goal, self.start)
+        line = line + self.rng.normal(0, noise, line.shape) if noise else line
+        return np.clip(line, 0, space_bounds(self.ndim)).ravel()
+
+    def _initial_mean(self):
+        """Średnia pierwszego rozkładu: najlepsza trasa startowa lub odcinek start-meta"""
+        seeds = initial_seeds(self, 3)
+        if not seeds:
+            return self._line_mean()
+        seeds = np.array([resample_path(s, self.num_waypoints) for s in seeds])
+        fits = evaluate_paths(seeds, self.geometry, self.wind_speed, self.wind_direction)
+        self.evaluations += len(seeds)
+        return seeds[int(np.argmin(fits)), 1:-1].ravel()
+
+    def _inject(self, individuals, best):
+        """Ocena wstrzykniętych tras - lepsza od dotychczasowej zostaje najlepszą"""
+        paths = np.array([resample_path(p, self.num_waypoints) for p in individuals])
+        paths = repair_population(paths, self.start, self.goal, self.geometry,
+                                  altitude_layers=self.altitude_layers)
+        fits = evaluate_paths(paths, self.geometry, self.wind_speed, self.wind_direction)
+        self.evaluations += len(paths)
+        i = int(np.argmin(fits))
+        if fits[i] < best[1]:
+            return paths[i], float(fits[i])
+        return best
+
+    def run(self):
+        """Uruchamia CMA-ES z restartami IPOP"""
+        n = self.dim
+        chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+        mean = self._initial_mean()
+        # Naprawiona średnia startowa jako najlepsza - wynik istnieje także bez żadnej generacji
+        paths, fits, _ = self._evaluate(mean[None])
+        best = (paths[0], float(fits[0]))
+        lam = self.population_size
+        gen = 0
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
+
+        stop = False
+        while gen < self.generations and not stop:
+            # Parametry strategii dla bieżącego λ
+            mu = lam // 2
+            weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+            weights /= weights.sum()
+            mueff = 1 / (weights ** 2).sum()
+            cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+            cs = (mueff + 2) / (n + mueff + 5)
+            c1 = 2 / ((n + 1.3) ** 2 + mueff)
+            cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+            damps = 1 + 2 * max(0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+
+            sigma = self.sigma0
+            pc, ps = np.zeros(n), np.zeros(n)
+            B, D = np.eye(n), np.ones(n)
+            C = np.eye(n)
+            eigen_every = max(1, int(1 / ((c1 + cmu) * n * 10)))
+            history = deque(maxlen=10 + int(30 * n / lam))
+
+            for it in range(self.generations - gen):
+                # Próbkowanie λ kandydatów jednym iloczynem macierzy
+                z = self.rng.standard_normal((lam, n))
+                y = (z * D) @ B.T
+                x = mean + sigma * y
+
+                paths, fits, ranking = self._evaluate(x)
+                order = np.argsort(ranking)
+                gen += 1
+
+                i = int(np.argmin(fits))
+                if fits[i] < best[1]:
+                    best = (paths[i], float(fits[i]))
+                self.best_fitness.append(best[1])
+                self.avg_fitness.append(float(fits.mean()))
+
+                if self.observers:
+                    state = notify_generation(self.observers, GenerationState(
+                        'CMA-ES', gen, self.generations, paths, fits, best[1],
+                        self.evaluations, time.perf_counter() - start_time,
+                        info={'lam': lam, 'restart': self.restarts_done}))
+                    if state.injected:
+                        best = self._inject(state.injected, best)
+                    if state.stop_requested:
+                        stop = True
+                        break
+
+                # Aktualizacja średniej, ścieżek ewolucji i kowariancji
+                y_sel = y[order[:mu]]
+                y_w = weights @ y_sel
+                mean = mean + sigma * y_w
+
+                c_inv_sqrt_yw = B @ ((B.T @ y_w) / D)
+                ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mueff) * c_inv_sqrt_yw
+                hsig = (np.linalg.norm(ps) / np.sqrt(1 - (1 - cs) ** (2 * (it + 1))) / chi_n
+                        < 1.4 + 2 / (n + 1))
+                pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * y_w
+
+                rank_mu = (weights[:, None] * y_sel).T @ y_sel
+                C = ((1 - c1 - cmu) * C
+                     + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C)
+                     + cmu * rank_mu)
+                sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+
+                if it % eigen_every == 0:
+                    C = np.triu(C) + np.triu(C, 1).T
+                    eigvals, B = np.linalg.eigh(C)
+                    D = np.sqrt(np.maximum(eigvals, 1e-20))
+
+                # Kryteria restartu: zbieżność, stagnacja, złe uwarunkowanie
+                history.append(fits[i])
+                stagnated = (len(history) == history.maxlen
+                             and max(history) - min(history) < TOL_FUN)
+                if sigma * D.max() < TOL_X or stagnated or D.max() > 1e7 * D.min():
+                    break
+
+            if stop or gen >= self.generations or self.restarts_done >= self.restarts:
+                break
+            # IPOP: podwojenie populacji i nowa, zaburzona średnia
+            self.restarts_done += 1
+            lam *= 2
+            mean = self._line_mean(noise=self.sigma0)
+
+        result = {
+            'best_individual': best[0].tolist(),
+            'best_fitness': self.best_fitness,
+            'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
+            'algorithm': 'CMA-ES'
+        }
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Differential Evolution dla optymalizacji trasy drona
+Cała populacja przechowywana jest jako tablica (N, W, 2)
+"""
+
+import numpy as np
+import time
+from drone_path_optimization import (
+    GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, POPULATION_SIZE, GENERATIONS,
+    MAX_ALTITUDE, WIND_SPEED, WIND_DIRECTION, repair_population, OBSTACLES
+)
+from geometry import compile_obstacles, evaluate_paths
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
+)
+from seeding import initial_seeds
+from random_streams import make_rng
+from smoothing import smooth_result
+
+STRATEGIES = ('rand/1/bin', 'current-to-best/1/bin')
+
+
+class DifferentialEvolution:
+    """Differential Evolution dla optymalizacji trasy drona"""
+
+    def __init__(self, population_size=POPULATION_SIZE,
+                 generations=GENERATIONS,
+                 F=0.6, CR=0.9, strategy='rand/1/bin',
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False,
+                 altitude_layers=None, num_waypoints=NUM_WAYPOINTS, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Nieznana strategia: {strategy!r} (dostępne: {', '.join(STRATEGIES)})")
+        if population_size < 4:
+            raise ValueError("DE wymaga co najmniej 4 osobników")
+        self.population_size = population_size
+        self.generations = generations
+        self.F = F  # Współczynnik różnicowy
+        self.CR = CR  # Prawdopodobieństwo krzyżowania
+        self.strategy = strategy
+        self.start = list(start) if start is not None else [0, 0]
+        # Start (x, y, z) włącza tryb 3D - trasy mają kształt (N, W, 3)
+        self.goal = list(goal) if goal is not None else [GRID_WIDTH, GRID_HEIGHT] + self.start[2:]
+        self.ndim = len(self.start)
+        self.num_waypoints = num_waypoints
+        # Dozwolone wysokości lotu w 3D (None - dowolna w [0, MAX_ALTITUDE])
+        self.altitude_layers = altitude_layers
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        # Trasy startowe (ciepły start) zastępujące część losowej populacji
+        self.initial_paths = list(initial_paths or [])
+        # Opcjonalny seeding ('astar') - bezkolizyjne trasy z A* w populacji startowej
+        self.seeding = seeding
+        # Skracanie i wygładzanie najlepszej trasy po zakończeniu
+        self.smooth = smooth
+        # Własny generator (int, SeedSequence lub np.random.Generator) - bez globalnego random
+        self.rng = make_rng(seed)
+        self.observers = list(observers or [])
+        if verbose:
+            self.observers.insert(0, ProgressPrinter())
+        self.best_fitness = []
+        self.avg_fitness = []
+        self.evaluations = 0
+        # Końcowa populacja i jej fitness (np. do przeniesienia na gęstszą siatkę waypointów)
+        self.population = None
+        self.fitnesses = None
+
+    def _repair_population(self, pop):
+        """Naprawia całą populację (N, W, 2) lub (N, W, 3): granice, start, meta i przeszkody"""
+        return repair_population(pop, self.start, self.goal, self.geometry,
+                                 altitude_layers=self.altitude_layers)
+
+    def _evaluate_population(self, pop):
+        """Ewaluuje fitness całej populacji jednym wywołaniem wektorowym"""
+        self.evaluations += len(pop)
+        return evaluate_paths(pop, self.geometry, self.wind_speed, self.wind_direction)
+
+    def _initial_population(self):
+        """Populacja startowa: trasy startowe + losowe punkty"""
+        seeds = initial_seeds(self, max(1, self.population_size // 5))[:self.population_size]
+        pop = np.empty((self.population_size, self.num_waypoints, self.ndim))
+        pop[..., 0] = self.rng.uniform(0, GRID_WIDTH, pop.shape[:2])
+        pop[..., 1] = self.rng.uniform(0, GRID_HEIGHT, pop.shape[:2])
+        if self.ndim == 3:
+            pop[..., 2] = self.rng.uniform(0, MAX_ALTITUDE, pop.shape[:2])
+        for i, path in enumerate(seeds):
+            pop[-1 - i] = np.asarray(path, dtype=float)
+        return self._repair_population(pop)
+
+    def _donor_indices(self, n):
+        """Trzy różne indeksy (3, n), każdy różny od i - losowane ponownie tylko przy kolizjach"""
+        idx = np.arange(n)
+        r = np.empty((3, n), dtype=int)
+        for k in range(3):
+            bad = np.ones(n, dtype=bool)
+            while bad.any():
+                r[k, bad] = self.rng.integers(0, n, bad.sum())
+                bad = (r[k] == idx) | (r[:k] == r[k]).any(axis=0)
+        return r
+
+    def _mutants(self, pop, fits):
+        """Wektory mutantów dla całej populacji"""
+        r1, r2, r3 = self._donor_indices(len(pop))
+
+        if self.strategy == 'rand/1/bin':
+            return pop[r1] + self.F * (pop[r2] - pop[r3])
+        best = pop[np.argmin(fits)]
+        return pop + self.F * (best - pop) + self.F * (pop[r1] - pop[r2])
+
+    def _crossover(self, pop, mutants):
+        """Krzyżowanie dwumianowe na poziomie waypointów"""
+        n, w = pop.shape[:2]
+        mask = self.rng.random((n, w)) < self.CR
+        # Co najmniej jeden punkt pośredni zawsze pochodzi od mutanta
+        mask[np.arange(n), self.rng.integers(1, w - 1, n)] = True
+        return np.where(mask[..., None], mutants, pop)
+
+    def _inject(self, pop, fits, individuals):
+        """Zastępuje najgorszych osobników wstrzykniętymi przez obserwatorów"""
+        individuals = individuals[:len(pop)]
+        worst = np.argsort(fits)[::-1][:len(individuals)]
+        pop[worst] = self._repair_population(individuals)
+        fits[worst] = self._evaluate_population(pop[worst])
+
+    def run(self):
+        """Uruchamia algorytm DE"""
+        pop = self._initial_population()
+        fits = self._evaluate_population(pop)
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
+
+        for gen in range(self.generations):
+            self.best_fitness.append(float(fits.min()))
+            self.avg_fitness.append(float(fits.mean()))
+
+            state = None
+            if self.observers:
+                state = notify_generation(self.observers, GenerationState(
+                    'DE', gen + 1, self.generations, pop, fits, float(fits.min()),
+                    self.evaluations, time.perf_counter() - start_time))
+                if state.injected:
+                    self._inject(pop, fits, state.injected)
+                if state.stop_requested:
+                    break
+
+            trials = self._repair_population(self._crossover(pop, self._mutants(pop, fits)))
+            trial_fits = self._evaluate_population(trials)
+
+            # Selekcja jeden-na-jeden
+            better = trial_fits <= fits
+            pop[better] = trials[better]
+            fits[better] = trial_fits[better]
+
+        self.population, self.fitnesses = pop, fits
+        best_idx = int(np.argmin(fits))
+        result = {
+            'best_individual': pop[best_idx].tolist(),
+            'best_fitness': self.best_fitness,
+            'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
+            'algorithm': 'Differential Evolution'
+        }
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
@@ -6,14 +6,34 @@ Część systemu optymalizacji trasy drona
 """
 
 import numpy as np
-import random
-from deap import base, creator, tools
+import time
+
+import individuals
 from drone_path_optimization import (
     GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, POPULATION_SIZE, GENERATIONS,
-    MUTATION_RATE, CROSSOVER_PROB, ELITE_SIZE, BLX_ALPHA,
-    calculate_path_length, is_line_intersecting_obstacle,
-    repair_individual, repair_waypoint, wind_effect, OBSTACLES
+    MUTATION_RATE, CROSSOVER_PROB, ELITE_SIZE, BLX_ALPHA, WIND_SPEED, WIND_DIRECTION,
+    repair_individual, repair_waypoint, OBSTACLES,
+    crossover_blx_variable, crossover_splice, mutate_add_waypoint, mutate_delete_waypoint,
+    select_tournament
+)
+from geometry import (
+    compile_obstacles, evaluate_paths, obstacles_bounds, pad_paths, segments_touch_bounds
+)
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
 )
+from seeding import initial_seeds
+from random_streams import make_rng, python_rng
+from smoothing import smooth_result
+from surrogate import SurrogateScreening
+
+MUTATION_TYPES = ('gaussian', 'uniform', 'repair')
+# Przypisanie zasług: wygładzanie jakości operatora i minimalne prawdopodobieństwo wyboru
+CREDIT_DECAY = 0.3
+MIN_OPERATOR_PROB = 0.05
+# Zakres samoadaptacyjnego kroku mutacji gaussowskiej
+SIGMA_BOUNDS = (0.1, GRID_WIDTH * 0.25)
 
 
 class GeneticAlgorithm:
@@ -22,64 +42,135 @@ class GeneticAlgorithm:
     def __init__(self, population_size=POPULATION_SIZE,
                  generations=GENERATIONS,
                  mutation_rate=MUTATION_RATE,
-                 crossover_prob=CROSSOVER_PROB):
+                 crossover_prob=CROSSOVER_PROB,
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False,
+                 memetic=False, memetic_k=5, memetic_steps=3, adaptive=False,
+                 variable_length=False, min_waypoints=3, max_waypoints=4 * NUM_WAYPOINTS,
+                 length_mutation_prob=0.3, surrogate=False, surrogate_fraction=0.25,
+                 seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_prob = crossover_prob
+        # Własny generator (int, SeedSequence lub np.random.Generator) - bez globalnego random
+        self.rng = make_rng(seed)
+        self.random = python_rng(self.rng)
+        self.start = list(start) if start is not None else [0, 0]
+        self.goal = list(goal) if goal is not None else [GRID_WIDTH, GRID_HEIGHT]
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        # Trasy startowe (ciepły start) zastępujące część losowej populacji
+        self.initial_paths = list(initial_paths or [])
+        # Opcjonalny seeding ('astar') - bezkolizyjne trasy z A* w populacji startowej
+        self.seeding = seeding
+        # Skracanie i wygładzanie najlepszej trasy po zakończeniu
+        self.smooth = smooth
+        # Tryb memetyczny - kroki gradientowe długości trasy dla k najlepszych
+        self.memetic = memetic
+        self.memetic_k = memetic_k
+        self.memetic_steps = memetic_steps
+        self.memetic_improved = 0
+        # Adaptacyjny wybór typu mutacji (przypisanie zasług) i samoadaptacja kroku
+        self.adaptive = adaptive
+        self.operator_quality = {op: 0.0 for op in MUTATION_TYPES}
+        self.operator_probs = {op: 1 / len(MUTATION_TYPES) for op in MUTATION_TYPES}
+        self.operator_history = []
+        # Genomy zmiennej długości - mutacje dodające / usuwające waypointy i krzyżowanie
+        # z cięciem; populacja oceniana jako tablica dopełniona (pad_paths) z długościami
+        self.variable_length = variable_length
+        self.min_waypoints = min_waypoints
+        self.max_waypoints = max_waypoints
+        self.length_mutation_prob = length_mutation_prob
+        self.length_history = []
+        # Wstępna selekcja potomków modelem zastępczym - pula 1/surrogate_fraction razy
+        # większa, prawdziwą ewaluację dostają tylko najlepiej rokujący
+        self.surrogate = SurrogateScreening(surrogate_fraction) if surrogate else None
+        self.observers = list(observers or [])
+        if verbose:
+            self.observers.insert(0, ProgressPrinter())
         self.best_fitness = []
         self.avg_fitness = []
+        self.evaluations = 0
+        self.rescored = 0
         self.toolbox = None
 
     def setup_deap(self):
-        """Konfiguruje framework DEAP"""
-        if hasattr(creator, "FitnessMin"):
-            del creator.FitnessMin
-        if hasattr(creator, "Individual"):
-            del creator.Individual
-
-        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMin)
+        """Konfiguruje framework DEAP (toolbox tej instancji, typy osobników wspólne)"""
+        from deap import base, tools
 
         self.toolbox = base.Toolbox()
 
-        self.toolbox.register("individual", tools.initIterate, creator.Individual,
+        self.toolbox.register("individual", tools.initIterate, individuals.Individual,
                               lambda: self._create_individual())
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
         self.toolbox.register("evaluate", self._evaluate_fitness)
-        self.toolbox.register("mate", self._crossover_blx)
+        self.toolbox.register("mate", self._crossover_variable if self.variable_length
+                              else self._crossover_blx)
         self.toolbox.register("mutate", self._mutate)
-        self.toolbox.register("select", tools.selTournament, tournsize=3)
+        self.toolbox.register("select", self._select_tournament, tournsize=3)
+
+    def _select_tournament(self, population, k, tournsize):
+        """Selekcja turniejowa jak tools.selTournament, ale z generatora tej instancji"""
+        return select_tournament(population, k, tournsize, rng=self.random)
+
+    def _repair(self, individual):
+        """Naprawia osobnika względem startu, mety i przeszkód tej instancji"""
+        return repair_individual(individual, start=self.start, goal=self.goal,
+                                 obstacles=self.geometry)
 
     def _create_individual(self):
         """Tworzy osobnika"""
-        individual = [[0, 0]]
-        for _ in range(NUM_WAYPOINTS - 2):
-            individual.append([random.uniform(0, GRID_WIDTH),
-                               random.uniform(0, GRID_HEIGHT)])
-        individual.append([GRID_WIDTH, GRID_HEIGHT])
-        return repair_individual(individual)
+        num_waypoints = NUM_WAYPOINTS
+        if self.variable_length:
+            num_waypoints = self.random.randint(max(self.min_waypoints, NUM_WAYPOINTS // 2),
+                                                min(self.max_waypoints, 2 * NUM_WAYPOINTS))
+        individual = [self.start]
+        for _ in range(num_waypoints - 2):
+            individual.append([self.random.uniform(0, GRID_WIDTH),
+                               self.random.uniform(0, GRID_HEIGHT)])
+        individual.append(self.goal)
+        return self._repair(individual)
 
     def _evaluate_fitness(self, individual):
         """Ewaluuje fitness osobnika"""
-        path_length = calculate_path_length(individual)
-
-        obstacle_penalty = 0.0
-        for i in range(len(individual) - 1):
-            if is_line_intersecting_obstacle(individual[i], individual[i + 1]):
-                obstacle_penalty += 100.0
-
-        wind_penalty = 0.0
-        for point in individual:
-            affected = wind_effect(point, 5.0, 45)
-            drift = np.sqrt((affected[0] - point[0]) ** 2 + (affected[1] - point[1]) ** 2)
-            wind_penalty += drift * 0.5
-
-        return (path_length + obstacle_penalty + wind_penalty,)
+        return (float(self._evaluate_population([individual])[0]),)
+
+    def _evaluate_population(self, population):
+        """Ewaluuje fitness całej populacji jednym wywołaniem wektorowym"""
+        if self.variable_length:
+            # Kolizje sprawdzane z gęstością próbek trasy o NUM_WAYPOINTS punktach
+            paths, lengths = pad_paths(population)
+            max_segment = np.hypot(GRID_WIDTH, GRID_HEIGHT) / (NUM_WAYPOINTS - 1)
+            return evaluate_paths(paths, self.geometry, self.wind_speed, self.wind_direction,
+                                  lengths, max_segment=max_segment)
+        return evaluate_paths(population, self.geometry, self.wind_speed, self.wind_direction)
+
+    def _population_array(self, population):
+        """Populacja jako tablica (N, W, 2) - dla genomów zmiennej długości dopełniona"""
+        if self.variable_length:
+            return pad_paths(population)[0]
+        return population
+
+    def _crossover_variable(self, ind1, ind2):
+        """Krzyżowanie genomów zmiennej długości: cięcie (zmienia długości) lub BLX-α po długości trasy"""
+        if self.random.random() < self.crossover_prob:
+            if self.random.random() < 0.5:
+                crossover_splice(ind1, ind2, self.min_waypoints, self.max_waypoints,
+                                 rng=self.random)
+            else:
+                crossover_blx_variable(ind1, ind2, rng=self.random)
+        return ind1, ind2
 
     def _crossover_blx(self, ind1, ind2):
         """Krzyżowanie BLX-α"""
-        if random.random() < self.crossover_prob:
+        if len(ind1) != len(ind2):
+            if self.random.random() < self.crossover_prob:
+                crossover_blx_variable(ind1, ind2, rng=self.random)
+            return ind1, ind2
+        if self.random.random() < self.crossover_prob:
             for i in range(1, len(ind1) - 1):
                 x1, y1 = ind1[i]
                 x2, y2 = ind2[i]
@@ -92,53 +183,235 @@ class GeneticAlgorithm:
                 y_min = max(0, min(y1, y2) - BLX_ALPHA * d)
                 y_max = min(GRID_HEIGHT, max(y1, y2) + BLX_ALPHA * d)
 
-                ind1[i] = [random.uniform(x_min, x_max), random.uniform(y_min, y_max)]
-                ind2[i] = [random.uniform(x_min, x_max), random.uniform(y_min, y_max)]
+                ind1[i] = [self.random.uniform(x_min, x_max), self.random.uniform(y_min, y_max)]
+                ind2[i] = [self.random.uniform(x_min, x_max), self.random.uniform(y_min, y_max)]
 
         return ind1, ind2
 
+    def _choose_operator(self):
+        """Losuje typ mutacji proporcjonalnie do prawdopodobieństw z przypisania zasług"""
+        return self.random.choices(MUTATION_TYPES,
+                                   weights=[self.operator_probs[op] for op in MUTATION_TYPES])[0]
+
+    def _update_operator_credit(self, evaluated):
+        """Aktualizuje jakość operatorów na podstawie poprawy fitness potomków.
+
+        Poprawa względem rodzica zawiera też efekt krzyżowania, dlatego
+        punktem odniesienia są potomkowie bez mutacji - operator dostaje
+        tylko nadwyżkę ponad ich średnią poprawę (wygładzaną wykładniczo).
+        """
+        gains = {op: [] for op in (None,) + MUTATION_TYPES}
+        for ind in evaluated:
+            if hasattr(ind, 'parent_fitness'):
+                gains[ind.operator].append(ind.parent_fitness - ind.fitness.values[0])
+
+        baseline = np.mean(gains[None]) if gains[None] else 0.0
+        for op in MUTATION_TYPES:
+            if gains[op]:
+                reward = max(0.0, np.mean(gains[op]) - baseline)
+                self.operator_quality[op] += CREDIT_DECAY * (reward - self.operator_quality[op])
+
+        total = sum(self.operator_quality.values())
+        for op in MUTATION_TYPES:
+            share = self.operator_quality[op] / total if total > 0 else 1 / len(MUTATION_TYPES)
+            self.operator_probs[op] = (MIN_OPERATOR_PROB
+                                       + (1 - len(MUTATION_TYPES) * MIN_OPERATOR_PROB) * share)
+        self.operator_history.append(dict(self.operator_probs))
+
     def _mutate(self, individual):
         """Mutacja osobnika"""
-        if random.random() < self.mutation_rate:
+        sigma_x, sigma_y = GRID_WIDTH * 0.05, GRID_HEIGHT * 0.05
+        if self.variable_length and self.random.random() < self.length_mutation_prob:
+            if self.random.random() < 0.5:
+                mutate_add_waypoint(individual, self.max_waypoints, rng=self.random)
+            else:
+                mutate_delete_waypoint(individual, self.min_waypoints, rng=self.random)
+        if self.random.random() < self.mutation_rate:
+            if self.adaptive:
+                # Jeden operator na osobnika (dla przypisania zasług) i log-normalna
+                # samoadaptacja kroku dziedziczonego przez potomków
+                operator = individual.operator = self._choose_operator()
+                tau = 1 / np.sqrt(2 * (len(individual) - 2))
+                sigma = getattr(individual, 'sigma', GRID_WIDTH * 0.05)
+                individual.sigma = float(np.clip(sigma * np.exp(tau * self.random.gauss(0, 1)),
+                                                 *SIGMA_BOUNDS))
+                sigma_x = sigma_y = individual.sigma
+
             for i in range(1, len(individual) - 1):
-                if random.random() < 0.2:
-                    mutation_type = random.choice(['gaussian', 'uniform', 'repair'])
+                if self.random.random() < 0.2:
+                    if self.adaptive:
+                        mutation_type = operator
+                    else:
+                        mutation_type = self.random.choice(MUTATION_TYPES)
 
                     if mutation_type == 'gaussian':
-                        individual[i][0] += random.gauss(0, GRID_WIDTH * 0.05)
-                        individual[i][1] += random.gauss(0, GRID_HEIGHT * 0.05)
+                        individual[i][0] += self.random.gauss(0, sigma_x)
+                        individual[i][1] += self.random.gauss(0, sigma_y)
                     elif mutation_type == 'uniform':
-                        individual[i][0] = random.uniform(0, GRID_WIDTH)
-                        individual[i][1] = random.uniform(0, GRID_HEIGHT)
+                        individual[i][0] = self.random.uniform(0, GRID_WIDTH)
+                        individual[i][1] = self.random.uniform(0, GRID_HEIGHT)
                     else:
-                        individual[i] = repair_waypoint(individual[i])
+                        individual[i] = repair_waypoint(individual[i], obstacles=self.geometry)
 
                     individual[i][0] = np.clip(individual[i][0], 0, GRID_WIDTH)
                     individual[i][1] = np.clip(individual[i][1], 0, GRID_HEIGHT)
 
-            individual = repair_individual(individual)
+            individual = self._repair(individual)
 
         return (individual,)
 
+    def _inject(self, pop, injected):
+        """Zastępuje najgorszych osobników wstrzykniętymi przez obserwatorów"""
+        pop.sort(key=lambda x: x.fitness.values[0])
+        for k, ind in enumerate(injected[:len(pop)]):
+            new_ind = individuals.Individual(self._repair(ind))
+            new_ind.fitness.values = self.toolbox.evaluate(new_ind)
+            pop[len(pop) - 1 - k] = new_ind
+            self.evaluations += 1
+
+    def _evaluate_invalid(self, pop):
+        """Ewaluuje tylko osobników bez ważnego fitness (elity zachowują swój)"""
+        invalid = [ind for ind in pop if not ind.fitness.valid]
+        if invalid:
+            fits = self._evaluate_population(invalid)
+            for ind, fit in zip(invalid, fits):
+                ind.fitness.values = (float(fit),)
+            self.evaluations += len(invalid)
+            if self.surrogate is not None:
+                predicted = [getattr(ind, 'predicted', None) for ind in invalid]
+                self.surrogate.record(invalid, fits, None if None in predicted else predicted)
+                for ind in invalid:
+                    ind.predicted = None
+        return invalid
+
+    def _screen(self, candidates, n):
+        """Wybiera ``n`` kandydatów o najlepszym fitness przewidzianym przez model zastępczy"""
+        chosen, predicted = self.surrogate.select(candidates, n)
+        selected = [candidates[i] for i in chosen]
+        if predicted is not None:
+            for ind, value in zip(selected, predicted[chosen]):
+                ind.predicted = float(value)
+        return selected
+
+    def _local_search(self, pop):
+        """Kroki spadku gradientu długości trasy dla ``memetic_k`` najlepszych.
+
+        Gradient liczony jest analitycznie dla wszystkich elit naraz, krok
+        rzutowany jest naprawą osobnika i przyjmowany tylko gdy poprawia
+        fitness; w przeciwnym razie krok danego osobnika jest połowiony.
+        """
+        order = sorted(range(len(pop)), key=lambda i: pop[i].fitness.values[0])
+        # Genomy zmiennej długości - osobno każda grupa o tej samej liczbie waypointów
+        groups = {}
+        for i in order[:self.memetic_k]:
+            groups.setdefault(len(pop[i]), []).append(i)
+        for idx in groups.values():
+            self._local_search_group(pop, idx)
+
+    def _local_search_group(self, pop, idx):
+        """Lokalne przeszukiwanie osobników ``idx`` o równej liczbie waypointów"""
+        paths = np.array([pop[i] for i in idx], dtype=float)
+        fits = np.array([pop[i].fitness.values[0] for i in idx])
+        eta = np.full(len(idx), GRID_WIDTH * 0.02)
+
+        for _ in range(self.memetic_steps):
+            d = np.diff(paths, axis=1)
+            u = d / np.maximum(np.linalg.norm(d, axis=2, keepdims=True), 1e-12)
+            grad = u[:, :-1] - u[:, 1:]
+
+            candidates = paths.copy()
+            candidates[:, 1:-1] -= eta[:, None, None] * grad
+            candidates = np.array([self._repair(c.tolist()) for c in candidates], dtype=float)
+            new_fits = self._evaluate_population(candidates)
+            self.evaluations += len(idx)
+
+            better = new_fits < fits
+            paths[better] = candidates[better]
+            fits[better] = new_fits[better]
+            eta[~better] *= 0.5
+
+        for k, i in enumerate(idx):
+            if fits[k] < pop[i].fitness.values[0]:
+                pop[i][:] = paths[k].tolist()
+                pop[i].fitness.values = (float(fits[k]),)
+                self.memetic_improved += 1
+
     def run(self):
         """Uruchamia algorytm"""
         self.setup_deap()
-        pop = self.toolbox.population(n=self.population_size)
-
-        for gen in range(self.generations):
-            fitnesses = list(map(self.toolbox.evaluate, pop))
-            for ind, fit in zip(pop, fitnesses):
-                ind.fitness.values = fit
+        seeds = initial_seeds(self, max(1, self.population_size // 5))[:self.population_size]
+        pop = self.toolbox.population(n=self.population_size - len(seeds))
+        pop += [individuals.Individual(self._repair(path)) for path in seeds]
+        return self._evolve(pop, self.generations)
+
+    def replan(self, population, obstacle_diff, generations=None):
+        """Kontynuuje ewolucję po zmianie przeszkód.
+
+        ``obstacle_diff`` to słownik z listami ``added`` i ``removed``
+        (przesunięcie = usunięcie + dodanie). Ponownie oceniani są tylko
+        osobnicy, których odcinki (prostokąty otaczające) dotykają obszaru
+        zmiany; pozostali zachowują dotychczasowy fitness.
+        """
+        if self.toolbox is None:
+            self.setup_deap()
+
+        added = list(obstacle_diff.get('added', []))
+        removed = list(obstacle_diff.get('removed', []))
+        obstacles = [o for o in self.geometry.obstacles if o not in removed] + added
+        self.geometry = compile_obstacles(obstacles)
+
+        pop = []
+        for ind in population:
+            new_ind = individuals.Individual([list(wp) for wp in ind])
+            fitness = getattr(ind, 'fitness', None)
+            if fitness is not None and fitness.valid:
+                new_ind.fitness.values = fitness.values
+            pop.append(new_ind)
+
+        touched = segments_touch_bounds(pad_paths(pop)[0],
+                                        obstacles_bounds(added + removed))
+        for i in np.flatnonzero(touched):
+            pop[i] = individuals.Individual(self._repair(pop[i]))
+        self.rescored = int(touched.sum())
+
+        return self._evolve(pop, self.generations if generations is None else generations)
+
+    def _evolve(self, pop, generations):
+        """Główna pętla ewolucji od zadanej populacji"""
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
+
+        for gen in range(generations):
+            evaluated = self._evaluate_invalid(pop)
+            if self.adaptive:
+                self._update_operator_credit(evaluated)
+            if self.memetic:
+                self._local_search(pop)
 
             fits = [ind.fitness.values[0] for ind in pop]
             self.best_fitness.append(min(fits))
             self.avg_fitness.append(np.mean(fits))
-
-            if (gen + 1) % 20 == 0:
-                print(f"GA Gen {gen + 1}/{self.generations} - Best: {min(fits):.2f}")
-
-            offspring = self.toolbox.select(pop, len(pop))
+            if self.variable_length:
+                self.length_history.append(float(np.mean([len(ind) for ind in pop])))
+
+            if self.observers:
+                state = notify_generation(self.observers, GenerationState(
+                    'GA', gen + 1, generations, self._population_array(pop), fits, min(fits),
+                    self.evaluations, time.perf_counter() - start_time))
+                if state.injected:
+                    self._inject(pop, state.injected)
+                if state.stop_requested:
+                    break
+
+            n = len(pop)
+            if self.surrogate is not None:
+                n = self.surrogate.pool_size(n - ELITE_SIZE) + ELITE_SIZE
+            offspring = self.toolbox.select(pop, n)
             offspring = [self.toolbox.clone(ind) for ind in offspring]
+            if self.adaptive:
+                for child in offspring:
+                    child.parent_fitness = child.fitness.values[0]
+                    child.operator = None
 
             for child1, child2 in zip(offspring[::2], offspring[1::2]):
                 self.toolbox.mate(child1, child2)
@@ -150,18 +423,26 @@ class GeneticAlgorithm:
                 del mutant.fitness.values
 
             pop.sort(key=lambda x: x.fitness.values[0])
-            offspring = pop[:ELITE_SIZE] + offspring[ELITE_SIZE:]
+            if self.surrogate is not None:
+                offspring = pop[:ELITE_SIZE] + self._screen(offspring, len(pop) - ELITE_SIZE)
+            else:
+                offspring = pop[:ELITE_SIZE] + offspring[ELITE_SIZE:]
             pop = offspring
 
-        fitnesses = list(map(self.toolbox.evaluate, pop))
-        for ind, fit in zip(pop, fitnesses):
-            ind.fitness.values = fit
+        self._evaluate_invalid(pop)
 
         best_ind = min(pop, key=lambda x: x.fitness.values[0])
 
-        return {
+        result = {
             'best_individual': best_ind,
+            'population': pop,
             'best_fitness': self.best_fitness,
             'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
             'algorithm': 'Genetic Algorithm'
-        }
\ No newline at end of file
+        }
+        if self.surrogate is not None:
+            result['surrogate'] = self.surrogate.report()
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NSGA-II dla wielokryterialnej optymalizacji trasy drona
+Kryteria: długość, energia (wiatr czołowy + zakręty), odstęp od przeszkód.
+Sortowanie niezdominowane i odległość zatłoczenia liczone są w NumPy.
+"""
+
+import numpy as np
+import time
+from drone_path_optimization import (
+    GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, POPULATION_SIZE, GENERATIONS,
+    MUTATION_RATE, CROSSOVER_PROB, BLX_ALPHA, WIND_SPEED, WIND_DIRECTION,
+    repair_population, OBSTACLES
+)
+from geometry import (
+    SEGMENT_CHECKS, OBSTACLE_PENALTY, WIND_PENALTY_WEIGHT, compile_obstacles
+)
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
+)
+from seeding import initial_seeds
+from random_streams import make_rng
+from smoothing import smooth_result
+
+OBJECTIVES = ('length', 'energy', 'clearance')
+# Model energii: prędkość własna drona i koszt zakrętu [jednostki długości / radian]
+AIRSPEED = 15.0
+TURN_COST = 5.0
+# Liczba wierszy macierzy dominacji liczonych naraz (pamięć ~ chunk * N * M)
+DOMINANCE_CHUNK = 512
+
+
+def evaluate_objectives(paths, geometry, wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION,
+                        distance_field=None):
+    """Kryteria tras (N, W, 2) -> (objectives (N, 3), violation (N,), scalar (N,)).
+
+    Wszystkie kryteria są minimalizowane (odstęp jako wartość ujemna).
+    ``violation`` to liczba kolidujących odcinków, ``scalar`` - fitness
+    z evaluate_paths dla porównania z pozostałymi algorytmami. Z
+    ``distance_field`` (np. ``Scenario.distance_field``) odstęp odczytywany
+    jest z obciętego pola odległości zamiast liczenia od przeszkód.
+    """
+    paths = np.asarray(paths, dtype=float)
+    seg = np.diff(paths, axis=1)
+    seg_len = np.sqrt((seg ** 2).sum(axis=-1))
+    length = seg_len.sum(axis=1)
+
+    wind_rad = np.radians(wind_direction)
+    wind = wind_speed * np.array([np.cos(wind_rad), np.sin(wind_rad)])
+    unit = seg / np.maximum(seg_len, 1e-12)[..., None]
+    # Wiatr w plecy zmniejsza koszt odcinka, czołowy zwiększa
+    headwind = 1 - (unit @ wind) / AIRSPEED
+    turns = np.arccos(np.clip((unit[:, :-1] * unit[:, 1:]).sum(axis=-1), -1, 1))
+    energy = (seg_len * headwind).sum(axis=1) + TURN_COST * turns.sum(axis=1)
+
+    # Kolizje jak w evaluate_paths (także dla rastrów); próbki odcinków tylko do odstępu
+    violation = geometry.segments_blocked(paths[:, :-1], paths[:, 1:]).sum(axis=1)
+    t = (np.arange(SEGMENT_CHECKS + 1) / SEGMENT_CHECKS)[:, None]
+    samples = paths[:, :-1, None, :] + t * seg[:, :, None, :]
+    if distance_field is not None:
+        clearance = distance_field(samples).min(axis=(1, 2))
+    else:
+        clearance = geometry.distance(samples, max(GRID_WIDTH, GRID_HEIGHT)).min(axis=(1, 2))
+
+    drift = np.hypot(wind[0], wind[1])
+    scalar = length + OBSTACLE_PENALTY * violation + WIND_PENALTY_WEIGHT * drift * paths.shape[1]
+    return np.stack([length, energy, -clearance], axis=1), violation, scalar
+
+
+def _dominates(fa, va, fb, vb):
+    """Macierz dominacji (A, B) z ograniczeniami: mniejsze naruszenie wygrywa.
+
+    Porównania liczone są kryterium po kryterium na tablicach 2D - bez
+    pośredniej tablicy (A, B, M).
+    """
+    le = np.ones((len(fa), len(fb)), dtype=bool)
+    ge = np.ones_like(le)
+    for k in range(fa.shape[1]):
+        le &= fa[:, k, None] <= fb[None, :, k]
+        ge &= fa[:, k, None] >= fb[None, :, k]
+    # a <= b we wszystkich kryteriach i nie b <= a  =>  a dominuje b
+    pareto = le & ~ge
+    return (va[:, None] < vb[None]) | ((va[:, None] == vb[None]) & pareto)
+
+
+def non_dominated_sort(objectives, violation=None, n_keep=None, chunk=DOMINANCE_CHUNK):
+    """Numery frontów (N,) - 0 to front Pareto.
+
+    Macierz dominacji liczona jest raz, blokami wierszy, i przechowywana
+    spakowana bitowo (N * N / 8 bajtów). Fronty zdejmowane są przez
+    odejmowanie wkładu bieżącego frontu od liczników dominacji. Przy
+    ``n_keep`` sortowanie kończy się, gdy sklasyfikowano co najmniej tylu
+    osobników - pozostali dostają wspólny, najgorszy numer.
+    """
+    f = np.asarray(objectives, dtype=float)
+    n = len(f)
+    v = np.zeros(n) if violation is None else np.asarray(violation, dtype=float)
+    n_keep = n if n_keep is None else n_keep
+
+    packed = np.empty((n, (n + 7) // 8), dtype=np.uint8)
+    counts = np.zeros(n, dtype=np.int64)
+    for s in range(0, n, chunk):
+        dom = _dominates(f[s:s + chunk], v[s:s + chunk], f, v)
+        counts += dom.sum(axis=0)
+        packed[s:s + chunk] = np.packbits(dom, axis=1)
+
+    rank = np.full(n, -1, dtype=np.int64)
+    front = np.flatnonzero(counts == 0)
+    level = ranked = 0
+    while len(front) and ranked < n_keep:
+        rank[front] = level
+        ranked += len(front)
+        counts[front] = -1
+        for s in range(0, len(front), chunk):
+            rows = np.unpackbits(packed[front[s:s + chunk]], axis=1, count=n)
+            counts -= rows.sum(axis=0, dtype=np.int64)
+        front = np.flatnonzero(counts == 0)
+        level += 1
+    rank[rank < 0] = level
+    return rank
+
+
+def crowding_distance(objectives, rank):
+    """Odległość zatłoczenia w obrębie frontów (N,) - skrajne punkty mają inf"""
+    f = np.asarray(objectives, dtype=float)
+    n, m = f.shape
+    distance = np.zeros(n)
+    for k in range(m):
+        order = np.lexsort((f[:, k], rank))
+        fr, fk = rank[order], f[order, k]
+        first = np.r_[True, fr[1:] != fr[:-1]]
+        last = np.r_[fr[1:] != fr[:-1], True]
+
+        # Rozpiętość kryterium w każdym froncie
+        span = (fk[last] - fk[first])[np.cumsum(first) - 1]
+
+        gap = np.zeros(n)
+        gap[1:-1] = fk[2:] - fk[:-2]
+        d = np.where(span > 0, gap / np.where(span > 0, span, 1), 0)
+        d[first | last] = np.inf
+        distance[order] += d
+    return distance
+
+
+class NSGA2:
+    """NSGA-II dla optymalizacji trasy drona (długość / energia / odstęp)"""
+
+    def __init__(self, population_size=POPULATION_SIZE,
+                 generations=GENERATIONS,
+                 mutation_rate=MUTATION_RATE,
+                 crossover_prob=CROSSOVER_PROB,
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION, distance_field=None):
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.crossover_prob = crossover_prob
+        self.start = list(start) if start is not None else [0, 0]
+        self.goal = list(goal) if goal is not None else [GRID_WIDTH, GRID_HEIGHT]
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        # Obcięte pole odległości do kryterium odstępu (None - dokładna odległość od przeszkód)
+        self.distance_field = distance_field
+        # Trasy startowe (ciepły start) zastępujące część losowej populacji
+        self.initial_paths = list(initial_paths or [])
+        # Opcjonalny seeding ('astar') - bezkolizyjne trasy z A* w populacji startowej
+        self.seeding = seeding
+        # Skracanie i wygładzanie najlepszej trasy po zakończeniu
+        self.smooth = smooth
+        # Własny generator (int, SeedSequence lub np.random.Generator) - bez globalnego random
+        self.rng = make_rng(seed)
+        self.observers = list(observers or [])
+        if verbose:
+            self.observers.insert(0, ProgressPrinter(
+                fmt=ProgressPrinter.DEFAULT_FORMAT + " (front: {front})"))
+        self.best_fitness = []
+        self.avg_fitness = []
+        self.evaluations = 0
+
+    def _repair_population(self, pop):
+        """Naprawia całą populację (N, W, 2)"""
+        return repair_population(pop, self.start, self.goal, self.geometry)
+
+    def _evaluate(self, pop):
+        """Kryteria, naruszenia i fitness skalarny populacji"""
+        self.evaluations += len(pop)
+        return evaluate_objectives(pop, self.geometry, self.wind_speed, self.wind_direction,
+                                   self.distance_field)
+
+    def _initial_population(self):
+        """Populacja startowa: trasy startowe + losowe punkty"""
+        seeds = initial_seeds(self, max(1, self.population_size // 5))[:self.population_size]
+        pop = np.empty((self.population_size, NUM_WAYPOINTS, 2))
+        pop[..., 0] = self.rng.uniform(0, GRID_WIDTH, pop.shape[:2])
+        pop[..., 1] = self.rng.uniform(0, GRID_HEIGHT, pop.shape[:2])
+        for i, path in enumerate(seeds):
+            pop[-1 - i] = np.asarray(path, dtype=float)
+        return self._repair_population(pop)
+
+    def _tournament(self, rank, crowding, n):
+        """Turniej binarny: niższy front, a przy remisie większe zatłoczenie"""
+        a = self.rng.integers(0, len(rank), n)
+        b = self.rng.integers(0, len(rank), n)
+        a_wins = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (crowding[a] >= crowding[b]))
+        return np.where(a_wins, a, b)
+
+    def _crossover_blx(self, p1, p2):
+        """Krzyżowanie BLX-α par rodziców (jak GeneticAlgorithm._crossover_blx)"""
+        lo = np.minimum(p1, p2)
+        hi = np.maximum(p1, p2)
+        d = hi - lo
+        lo = np.maximum(lo - BLX_ALPHA * d, 0)
+        hi = np.minimum(hi + BLX_ALPHA * d, [GRID_WIDTH, GRID_HEIGHT])
+        c1 = self.rng.uniform(lo, hi)
+        c2 = self.rng.uniform(lo, hi)
+
+        # Pary bez krzyżowania pozostają kopiami rodziców
+        skip = self.rng.random(len(p1)) >= self.crossover_prob
+        c1[skip], c2[skip] = p1[skip], p2[skip]
+        return c1, c2
+
+    def _mutate(self, pop):
+        """Mutacja (jak GeneticAlgorithm._mutate): 20% punktów osobnika, gauss lub uniform"""
+        n, w = pop.shape[:2]
+        pop = pop.copy()
+        mutate = self.rng.random(n) < self.mutation_rate
+        points = mutate[:, None] & (self.rng.random((n, w)) < 0.2)
+        points[:, [0, -1]] = False
+        kind = self.rng.integers(0, 3, (n, w))
+
+        gaussian = points & (kind == 0)
+        pop[gaussian] += self.rng.normal(0, 1, (gaussian.sum(), 2)) * [GRID_WIDTH * 0.05,
+                                                                       GRID_HEIGHT * 0.05]
+        uniform = points & (kind == 1)
+        pop[uniform] = self.rng.uniform(0, [GRID_WIDTH, GRID_HEIGHT], (uniform.sum(), 2))
+        # Trzeci typ (repair) wykonuje naprawa całej populacji
+        return pop
+
+    def _select(self, objectives, violation, n):
+        """Selekcja środowiskowa: fronty, a w ostatnim froncie zatłoczenie"""
+        rank = non_dominated_sort(objectives, violation, n_keep=n)
+        crowding = crowding_distance(objectives, rank)
+        keep = np.lexsort((-crowding, rank))[:n]
+        return keep, rank[keep], crowding[keep]
+
+    def run(self):
+        """Uruchamia NSGA-II"""
+        pop = self._initial_population()
+        obj, viol, scalar = self._evaluate(pop)
+        rank = non_dominated_sort(obj, viol)
+        crowding = crowding_distance(obj, rank)
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
+
+        n = self.population_size
+        for gen in range(self.generations):
+            self.best_fitness.append(float(scalar.min()))
+            self.avg_fitness.append(float(scalar.mean()))
+
+            if self.observers:
+                state = notify_generation(self.observers, GenerationState(
+                    'NSGA-II', gen + 1, self.generations, pop, scalar, float(scalar.min()),
+                    self.evaluations, time.perf_counter() - start_time,
+                    info={'front': int((rank == 0).sum())}))
+                if state.injected:
+                    injected = self._repair_population(state.injected[:n])
+                    worst = np.lexsort((crowding, -rank))[:len(injected)]
+                    pop[worst] = injected
+                    obj[worst], viol[worst], scalar[worst] = self._evaluate(injected)
+                    rank = non_dominated_sort(obj, viol)
+                    crowding = crowding_distance(obj, rank)
+                if state.stop_requested:
+                    break
+
+            # Potomstwo: turniej, BLX-α, mutacja i naprawa - całe pokolenie naraz
+            parents = self._tournament(rank, crowding, 2 * ((n + 1) // 2))
+            c1, c2 = self._crossover_blx(pop[parents[0::2]], pop[parents[1::2]])
+            offspring = self._repair_population(self._mutate(np.concatenate([c1, c2])[:n]))
+            off_obj, off_viol, off_scalar = self._evaluate(offspring)
+
+            # (μ + λ): rodzice i potomkowie razem
+            pop = np.concatenate([pop, offspring])
+            obj = np.concatenate([obj, off_obj])
+            viol = np.concatenate([viol, off_viol])
+            scalar = np.concatenate([scalar, off_scalar])
+            keep, rank, crowding = self._select(obj, viol, n)
+            pop, obj, viol, scalar = pop[keep], obj[keep], viol[keep], scalar[keep]
+
+        front = rank == 0
+        result = {
+            'best_individual': pop[int(np.argmin(scalar))].tolist(),
+            'pareto_front': pop[front].tolist(),
+            'pareto_objectives': obj[front] * [1, 1, -1],
+            'objectives': OBJECTIVES,
+            'best_fitness': self.best_fitness,
+            'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
+            'algorithm': 'NSGA-II'
+        }
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
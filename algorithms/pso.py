@@ -5,12 +5,20 @@ Particle Swarm Optimization dla optymalizacji trasy drona
 """
 
 import numpy as np
-import random
+import time
 from drone_path_optimization import (
     GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, POPULATION_SIZE, GENERATIONS,
-    calculate_path_length, is_line_intersecting_obstacle,
-    repair_individual, repair_waypoint, wind_effect, OBSTACLES
+    WIND_SPEED, WIND_DIRECTION, repair_individual, OBSTACLES
 )
+from geometry import compile_obstacles, evaluate_paths, resample_path
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
+)
+from seeding import initial_seeds
+from random_streams import make_rng, python_rng
+from smoothing import smooth_result
+from surrogate import SurrogateScreening
 
 
 class ParticleSwarmOptimization:
@@ -18,40 +26,85 @@ class ParticleSwarmOptimization:
 
     def __init__(self, population_size=POPULATION_SIZE,
                  generations=GENERATIONS,
-                 w=0.7, c1=1.5, c2=1.5):
+                 w=0.7, c1=1.5, c2=1.5,
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False,
+                 surrogate=False, surrogate_fraction=0.25, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
         self.population_size = population_size
         self.generations = generations
         self.w = w  # Inertia weight
         self.c1 = c1  # Cognitive parameter
         self.c2 = c2  # Social parameter
+        # Własny generator (int, SeedSequence lub np.random.Generator) - bez globalnego random
+        self.rng = make_rng(seed)
+        self.random = python_rng(self.rng)
+        self.start = list(start) if start is not None else [0, 0]
+        self.goal = list(goal) if goal is not None else [GRID_WIDTH, GRID_HEIGHT]
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        # Trasy startowe (ciepły start) zastępujące część losowego roju
+        self.initial_paths = list(initial_paths or [])
+        # Opcjonalny seeding ('astar') - bezkolizyjne trasy z A* w populacji startowej
+        self.seeding = seeding
+        # Skracanie i wygładzanie najlepszej trasy po zakończeniu
+        self.smooth = smooth
+        # Wstępna selekcja modelem zastępczym - prawdziwą ewaluację dostaje tylko
+        # surrogate_fraction najlepiej rokujących cząstek
+        self.surrogate = SurrogateScreening(surrogate_fraction) if surrogate else None
+        self.observers = list(observers or [])
+        if verbose:
+            self.observers.insert(0, ProgressPrinter())
         self.best_fitness = []
         self.avg_fitness = []
+        self.evaluations = 0
+
+    def _repair(self, particle):
+        """Naprawia cząstkę względem startu, mety i przeszkód tej instancji"""
+        return repair_individual(particle, start=self.start, goal=self.goal,
+                                 obstacles=self.geometry)
+
+    def _particle_from_path(self, path):
+        """Cząstka z gotowej trasy - prędkości zakładają NUM_WAYPOINTS punktów"""
+        if len(path) != NUM_WAYPOINTS:
+            path = resample_path(path, NUM_WAYPOINTS).tolist()
+        return self._repair(path)
 
     def _create_particle(self):
         """Tworzy cząstkę (pozycję)"""
-        particle = [[0, 0]]
+        particle = [self.start]
         for _ in range(NUM_WAYPOINTS - 2):
-            particle.append([random.uniform(0, GRID_WIDTH),
-                             random.uniform(0, GRID_HEIGHT)])
-        particle.append([GRID_WIDTH, GRID_HEIGHT])
-        return repair_individual(particle)
+            particle.append([self.random.uniform(0, GRID_WIDTH),
+                             self.random.uniform(0, GRID_HEIGHT)])
+        particle.append(self.goal)
+        return self._repair(particle)
 
     def _evaluate_fitness(self, particle):
         """Ewaluuje fitness cząstki"""
-        path_length = calculate_path_length(particle)
-
-        obstacle_penalty = 0.0
-        for i in range(len(particle) - 1):
-            if is_line_intersecting_obstacle(particle[i], particle[i + 1]):
-                obstacle_penalty += 100.0
-
-        wind_penalty = 0.0
-        for point in particle:
-            affected = wind_effect(point, 5.0, 45)
-            drift = np.sqrt((affected[0] - point[0]) ** 2 + (affected[1] - point[1]) ** 2)
-            wind_penalty += drift * 0.5
-
-        return path_length + obstacle_penalty + wind_penalty
+        return float(self._evaluate_swarm([particle])[0])
+
+    def _evaluate_swarm(self, particles):
+        """Ewaluuje fitness wszystkich cząstek jednym wywołaniem wektorowym"""
+        return evaluate_paths(particles, self.geometry, self.wind_speed, self.wind_direction)
+
+    def _evaluate_screened(self, particles):
+        """Ewaluuje najlepiej rokujące cząstki; reszta dostaje fitness przewidziany przez model.
+
+        Zwraca fitness wszystkich cząstek i maskę cząstek ocenionych naprawdę -
+        tylko one mogą poprawić najlepsze pozycje.
+        """
+        chosen, predicted = self.surrogate.select(particles, self.surrogate.keep_size(len(particles)))
+        selected = [particles[i] for i in chosen]
+        true = self._evaluate_swarm(selected)
+        self.evaluations += len(selected)
+        self.surrogate.record(selected, true, None if predicted is None else predicted[chosen])
+
+        fitnesses = np.empty(len(particles)) if predicted is None else predicted.copy()
+        fitnesses[chosen] = true
+        evaluated = np.zeros(len(particles), dtype=bool)
+        evaluated[chosen] = True
+        return fitnesses.tolist(), evaluated
 
     def _update_velocity(self, particle, velocity, best_particle, best_global):
         """Aktualizuje prędkość cząstki"""
@@ -61,7 +114,7 @@ class ParticleSwarmOptimization:
                 new_velocity.append([0, 0])
                 continue
 
-            r1, r2 = random.random(), random.random()
+            r1, r2 = self.random.random(), self.random.random()
             vx = (self.w * velocity[i][0] +
                   self.c1 * r1 * (best_particle[i][0] - particle[i][0]) +
                   self.c2 * r2 * (best_global[i][0] - particle[i][0]))
@@ -75,25 +128,45 @@ class ParticleSwarmOptimization:
 
     def _update_position(self, particle, velocity):
         """Aktualizuje pozycję cząstki"""
-        new_particle = [[0, 0]]
+        # Przycięcie do siatki wykonuje _repair (wektorowo dla całej cząstki)
+        new_particle = [self.start]
         for i in range(1, len(particle) - 1):
-            x = np.clip(particle[i][0] + velocity[i][0], 0, GRID_WIDTH)
-            y = np.clip(particle[i][1] + velocity[i][1], 0, GRID_HEIGHT)
-            new_particle.append([x, y])
-        new_particle.append([GRID_WIDTH, GRID_HEIGHT])
-        return repair_individual(new_particle)
+            new_particle.append([particle[i][0] + velocity[i][0],
+                                 particle[i][1] + velocity[i][1]])
+        new_particle.append(self.goal)
+        return self._repair(new_particle)
+
+    def _inject(self, particles, velocities, fitnesses, individuals):
+        """Zastępuje najgorsze cząstki wstrzykniętymi przez obserwatorów - zwraca ich indeksy"""
+        worst = np.argsort(fitnesses)[::-1][:len(individuals)]
+        for i, ind in zip(worst, individuals):
+            particles[i] = self._particle_from_path(ind)
+            velocities[i] = [[0, 0] for _ in range(len(particles[i]))]
+            fitnesses[i] = self._evaluate_fitness(particles[i])
+            self.evaluations += 1
+        if self.surrogate is not None:
+            self.surrogate.record([particles[i] for i in worst], [fitnesses[i] for i in worst])
+        return worst
 
     def run(self):
         """Uruchamia algorytm PSO"""
         # Inicjalizuj cząstki i prędkości
-        particles = [self._create_particle() for _ in range(self.population_size)]
-        velocities = [[[random.uniform(-1, 1), random.uniform(-1, 1)]
+        seeds = initial_seeds(self, max(1, self.population_size // 5))[:self.population_size]
+        particles = [self._particle_from_path(path) for path in seeds]
+        particles += [self._create_particle() for _ in range(self.population_size - len(seeds))]
+        velocities = [[[self.random.uniform(-1, 1), self.random.uniform(-1, 1)]
                        for _ in range(NUM_WAYPOINTS)]
                       for _ in range(self.population_size)]
 
         # Najlepsze pozycje cząstek
         best_particles = [p[:] for p in particles]
-        best_fitnesses = [self._evaluate_fitness(p) for p in particles]
+        best_fitnesses = self._evaluate_swarm(particles).tolist()
+        self.evaluations += len(particles)
+        true_fitnesses = np.array(best_fitnesses)
+        if self.surrogate is not None:
+            self.surrogate.record(particles, best_fitnesses)
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
 
         # Globalne najlepsze
         best_idx = np.argmin(best_fitnesses)
@@ -102,16 +175,34 @@ class ParticleSwarmOptimization:
 
         # Główna pętla
         for gen in range(self.generations):
-            fitnesses = [self._evaluate_fitness(p) for p in particles]
-
+            if self.surrogate is not None:
+                fitnesses, evaluated = self._evaluate_screened(particles)
+            else:
+                fitnesses = self._evaluate_swarm(particles).tolist()
+                evaluated = np.ones(len(particles), dtype=bool)
+                self.evaluations += len(particles)
+
+            # Przewidywania modelu służą tylko selekcji - statystyki i obserwatorzy
+            # dostają ostatni prawdziwy fitness każdej cząstki
+            true_fitnesses = np.where(evaluated, fitnesses, true_fitnesses)
             self.best_fitness.append(best_global_fitness)
-            self.avg_fitness.append(np.mean(fitnesses))
-
-            if (gen + 1) % 20 == 0:
-                print(f"PSO Gen {gen + 1}/{self.generations} - Best: {best_global_fitness:.2f}")
+            self.avg_fitness.append(float(true_fitnesses.mean()))
+
+            state = None
+            if self.observers:
+                state = notify_generation(self.observers, GenerationState(
+                    'PSO', gen + 1, self.generations, particles, true_fitnesses,
+                    best_global_fitness, self.evaluations,
+                    time.perf_counter() - start_time))
+                if state.injected:
+                    # Wstrzyknięte cząstki mają prawdziwą ocenę - aktualizują najlepsze pozycje
+                    evaluated[self._inject(particles, velocities, fitnesses, state.injected)] = True
+                    true_fitnesses = np.where(evaluated, fitnesses, true_fitnesses)
 
             # Aktualizuj najlepsze pozycje
             for i in range(self.population_size):
+                if not evaluated[i]:
+                    continue
                 if fitnesses[i] < best_fitnesses[i]:
                     best_particles[i] = particles[i][:]
                     best_fitnesses[i] = fitnesses[i]
@@ -126,9 +217,18 @@ class ParticleSwarmOptimization:
                                                       best_particles[i], best_global)
                 particles[i] = self._update_position(particles[i], velocities[i])
 
-        return {
+            if state is not None and state.stop_requested:
+                break
+
+        result = {
             'best_individual': best_global,
             'best_fitness': self.best_fitness,
             'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
             'algorithm': 'Particle Swarm Optimization'
-        }
\ No newline at end of file
+        }
+        if self.surrogate is not None:
+            result['surrogate'] = self.surrogate.report()
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
\ No newline at end of file
@@ -5,13 +5,20 @@ Simulated Annealing dla optymalizacji trasy drona
 """
 
 import numpy as np
-import random
 import math
+import time
 from drone_path_optimization import (
     GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, GENERATIONS,
-    calculate_path_length, is_line_intersecting_obstacle,
-    repair_individual, repair_waypoint, wind_effect, OBSTACLES
+    WIND_SPEED, WIND_DIRECTION, repair_individual, repair_population, OBSTACLES
 )
+from geometry import compile_obstacles, evaluate_paths
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
+)
+from seeding import initial_seeds
+from random_streams import make_rng, python_rng
+from smoothing import smooth_result
 
 
 class SimulatedAnnealing:
@@ -19,55 +26,178 @@ class SimulatedAnnealing:
 
     def __init__(self, generations=GENERATIONS,
                  initial_temp=100.0,
-                 cooling_rate=0.95):
+                 cooling_rate=0.95,
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False,
+                 chains=1, max_temp=20.0, min_temp=0.1, swap_every=10, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
         self.generations = generations
         self.initial_temp = initial_temp
         self.cooling_rate = cooling_rate
+        # Własny generator (int, SeedSequence lub np.random.Generator) - bez globalnego random
+        self.rng = make_rng(seed)
+        self.random = python_rng(self.rng)
+        # Tryb wielołańcuchowy (parallel tempering): chains > 1 łańcuchów na stałej
+        # drabinie temperatur od max_temp do min_temp, wymiana co swap_every kroków
+        self.chains = chains
+        self.max_temp = max_temp
+        self.min_temp = min_temp
+        self.swap_every = swap_every
+        self.swap_attempts = 0
+        self.swaps_accepted = 0
+        self.start = list(start) if start is not None else [0, 0]
+        self.goal = list(goal) if goal is not None else [GRID_WIDTH, GRID_HEIGHT]
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        # Trasy startowe - najlepsza z nich jest punktem startowym łańcucha
+        self.initial_paths = list(initial_paths or [])
+        # Opcjonalny seeding ('astar') - bezkolizyjne trasy z A* w populacji startowej
+        self.seeding = seeding
+        # Skracanie i wygładzanie najlepszej trasy po zakończeniu
+        self.smooth = smooth
+        self.observers = list(observers or [])
+        if verbose:
+            self.observers.insert(0, ProgressPrinter(
+                fmt=ProgressPrinter.DEFAULT_FORMAT + " (T={T:.2f})"))
         self.best_fitness = []
         self.avg_fitness = []
+        self.evaluations = 0
+
+    def _repair(self, solution):
+        """Naprawia rozwiązanie względem startu, mety i przeszkód tej instancji"""
+        return repair_individual(solution, start=self.start, goal=self.goal,
+                                 obstacles=self.geometry)
 
     def _create_solution(self):
         """Tworzy losowe rozwiązanie"""
-        solution = [[0, 0]]
+        solution = [self.start]
         for _ in range(NUM_WAYPOINTS - 2):
-            solution.append([random.uniform(0, GRID_WIDTH),
-                             random.uniform(0, GRID_HEIGHT)])
-        solution.append([GRID_WIDTH, GRID_HEIGHT])
-        return repair_individual(solution)
+            solution.append([self.random.uniform(0, GRID_WIDTH),
+                             self.random.uniform(0, GRID_HEIGHT)])
+        solution.append(self.goal)
+        return self._repair(solution)
 
     def _evaluate_fitness(self, solution):
         """Ewaluuje fitness rozwiązania"""
-        path_length = calculate_path_length(solution)
-
-        obstacle_penalty = 0.0
-        for i in range(len(solution) - 1):
-            if is_line_intersecting_obstacle(solution[i], solution[i + 1]):
-                obstacle_penalty += 100.0
-
-        wind_penalty = 0.0
-        for point in solution:
-            affected = wind_effect(point, 5.0, 45)
-            drift = np.sqrt((affected[0] - point[0]) ** 2 + (affected[1] - point[1]) ** 2)
-            wind_penalty += drift * 0.5
-
-        return path_length + obstacle_penalty + wind_penalty
+        return float(evaluate_paths([solution], self.geometry, self.wind_speed, self.wind_direction)[0])
 
     def _generate_neighbor(self, solution):
         """Generuje sąsiednie rozwiązanie"""
         neighbor = [row[:] for row in solution]
 
         # Zmień jeden losowy punkt
-        idx = random.randint(1, len(neighbor) - 2)
-        neighbor[idx][0] = np.clip(neighbor[idx][0] + random.gauss(0, 5), 0, GRID_WIDTH)
-        neighbor[idx][1] = np.clip(neighbor[idx][1] + random.gauss(0, 5), 0, GRID_HEIGHT)
+        idx = self.random.randint(1, len(neighbor) - 2)
+        neighbor[idx][0] = np.clip(neighbor[idx][0] + self.random.gauss(0, 5), 0, GRID_WIDTH)
+        neighbor[idx][1] = np.clip(neighbor[idx][1] + self.random.gauss(0, 5), 0, GRID_HEIGHT)
+
+        return self._repair(neighbor)
 
-        return repair_individual(neighbor)
+    def temperature_ladder(self):
+        """Geometryczna drabina temperatur (K,) od max_temp do min_temp"""
+        return np.geomspace(self.max_temp, self.min_temp, self.chains)
+
+    def _propose(self, states):
+        """Sąsiedzi dla wszystkich łańcuchów naraz - jeden losowy punkt na łańcuch"""
+        k, w = states.shape[:2]
+        neighbors = states.copy()
+        idx = self.rng.integers(1, w - 1, k)
+        # Ten sam krok co w _generate_neighbor
+        neighbors[np.arange(k), idx] += self.rng.normal(0, 5, (k, 2))
+        return repair_population(neighbors, self.start, self.goal, self.geometry)
+
+    def _exchange(self, states, fits, temps, offset):
+        """Wymiana stanów sąsiednich temperatur (pary od ``offset``) z kryterium Metropolisa"""
+        i = np.arange(offset, len(temps) - 1, 2)
+        if not len(i):
+            return
+        j = i + 1
+        log_p = (fits[i] - fits[j]) * (1 / temps[i] - 1 / temps[j])
+        swap = np.log(self.rng.random(len(i))) < np.minimum(log_p, 0)
+        i, j = i[swap], j[swap]
+        states[i], states[j] = states[j].copy(), states[i].copy()
+        fits[i], fits[j] = fits[j].copy(), fits[i].copy()
+        self.swap_attempts += len(swap)
+        self.swaps_accepted += len(i)
+
+    def _run_tempering(self):
+        """Parallel tempering: K łańcuchów jako jedna tablica stanów (K, W, 2)"""
+        temps = self.temperature_ladder()
+        seeds = initial_seeds(self, 3)
+        states = np.empty((self.chains, NUM_WAYPOINTS, 2))
+        states[..., 0] = self.rng.uniform(0, GRID_WIDTH, states.shape[:2])
+        states[..., 1] = self.rng.uniform(0, GRID_HEIGHT, states.shape[:2])
+        # Trasy startowe trafiają do najzimniejszych łańcuchów
+        for k, path in enumerate(seeds[:self.chains]):
+            states[-1 - k] = np.asarray(path, dtype=float)
+        states = repair_population(states, self.start, self.goal, self.geometry)
+        fits = evaluate_paths(states, self.geometry, self.wind_speed, self.wind_direction)
+        self.evaluations += self.chains
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
+
+        b = int(np.argmin(fits))
+        best, best_fitness = states[b].copy(), float(fits[b])
+
+        for gen in range(self.generations):
+            neighbors = self._propose(states)
+            neighbor_fits = evaluate_paths(neighbors, self.geometry, self.wind_speed, self.wind_direction)
+            self.evaluations += self.chains
+
+            # Kryterium Metropolisa dla wszystkich łańcuchów naraz
+            delta = neighbor_fits - fits
+            accept = np.log(self.rng.random(self.chains)) < np.minimum(-delta / temps, 0)
+            states[accept] = neighbors[accept]
+            fits[accept] = neighbor_fits[accept]
+
+            if (gen + 1) % self.swap_every == 0:
+                self._exchange(states, fits, temps, (gen // self.swap_every) % 2)
+
+            b = int(np.argmin(fits))
+            if fits[b] < best_fitness:
+                best, best_fitness = states[b].copy(), float(fits[b])
+
+            self.best_fitness.append(best_fitness)
+            self.avg_fitness.append(float(fits.mean()))
+
+            if self.observers:
+                state = notify_generation(self.observers, GenerationState(
+                    'SA', gen + 1, self.generations, states, fits, best_fitness,
+                    self.evaluations, time.perf_counter() - start_time,
+                    info={'T': temps[-1]}))
+                if state.injected:
+                    # Wstrzyknięte rozwiązania zastępują najgorsze łańcuchy
+                    injected = repair_population(state.injected[:self.chains],
+                                                 self.start, self.goal, self.geometry)
+                    worst = np.argsort(fits)[::-1][:len(injected)]
+                    states[worst] = injected
+                    fits[worst] = evaluate_paths(injected, self.geometry,
+                                                 self.wind_speed, self.wind_direction)
+                    self.evaluations += len(injected)
+                if state.stop_requested:
+                    break
+
+        return best.tolist()
 
     def run(self):
         """Uruchamia algorytm Simulated Annealing"""
+        if self.chains > 1:
+            return self._finish(self._run_tempering())
+
         # Inicjalizuj rozwiązanie
-        current = self._create_solution()
-        current_fitness = self._evaluate_fitness(current)
+        seeds = initial_seeds(self, 3)
+        if seeds:
+            candidates = [self._repair(path) for path in seeds]
+            fits = evaluate_paths(candidates, self.geometry, self.wind_speed, self.wind_direction)
+            current = candidates[int(np.argmin(fits))]
+            current_fitness = float(fits.min())
+            self.evaluations += len(candidates)
+        else:
+            current = self._create_solution()
+            current_fitness = self._evaluate_fitness(current)
+            self.evaluations += 1
+        start_time = time.perf_counter()
+        notify_run_start(self.observers, self)
 
         best = current[:]
         best_fitness = current_fitness
@@ -78,12 +208,13 @@ class SimulatedAnnealing:
             # Generuj sąsiednie rozwiązanie
             neighbor = self._generate_neighbor(current)
             neighbor_fitness = self._evaluate_fitness(neighbor)
+            self.evaluations += 1
 
             # Oblicz różnicę
             delta = neighbor_fitness - current_fitness
 
             # Akceptuj lub odrzuć
-            if delta < 0 or random.random() < math.exp(-delta / temperature):
+            if delta < 0 or self.random.random() < math.exp(-delta / temperature):
                 current = neighbor
                 current_fitness = neighbor_fitness
 
@@ -95,15 +226,36 @@ class SimulatedAnnealing:
             self.best_fitness.append(best_fitness)
             self.avg_fitness.append(current_fitness)
 
-            if (gen + 1) % 20 == 0:
-                print(f"SA Gen {gen + 1}/{self.generations} - Best: {best_fitness:.2f} (T={temperature:.2f})")
+            if self.observers:
+                state = notify_generation(self.observers, GenerationState(
+                    'SA', gen + 1, self.generations, [current], [current_fitness],
+                    best_fitness, self.evaluations, time.perf_counter() - start_time,
+                    info={'T': temperature}))
+                if state.injected:
+                    # Wstrzyknięte rozwiązanie staje się bieżącym punktem łańcucha
+                    current = self._repair(state.injected[0])
+                    current_fitness = self._evaluate_fitness(current)
+                    self.evaluations += 1
+                    if current_fitness < best_fitness:
+                        best = current[:]
+                        best_fitness = current_fitness
+                if state.stop_requested:
+                    break
 
             # Schłodź
             temperature *= self.cooling_rate
 
-        return {
+        return self._finish(best)
+
+    def _finish(self, best):
+        """Buduje słownik wyniku"""
+        result = {
             'best_individual': best,
             'best_fitness': self.best_fitness,
             'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
             'algorithm': 'Simulated Annealing'
-        }
\ No newline at end of file
+        }
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
\ No newline at end of file
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark czasu startu - import modułu algorytmu w świeżym procesie
+Użycie: python benchmark_startup.py [moduł] [powtórzenia]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "dt = time.perf_counter() - t\n"
+    "heavy = [m for m in ('matplotlib', 'deap') if m in sys.modules]\n"
+    "print(dt, ','.join(heavy))\n"
+)
+
+
+def measure_import(module='algorithms.pso', repeats=10):
+    """Mierzy czas importu modułu w nowych procesach (mediana, min)"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    heavy = ''
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                             cwd=root, capture_output=True, text=True, check=True)
+        dt, _, heavy = out.stdout.strip().partition(' ')
+        times.append(float(dt))
+    return statistics.median(times), min(times), heavy
+
+
+def main():
+    """Główna funkcja"""
+    module = sys.argv[1] if len(sys.argv) > 1 else 'algorithms.pso'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    median, best, heavy = measure_import(module, repeats)
+    print(f"import {module}: mediana {median * 1000:.1f} ms, "
+          f"min {best * 1000:.1f} ms ({repeats} powtórzeń)")
+    print(f"Załadowane ciężkie moduły: {heavy or 'brak'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Porównanie trzech algorytmów optymalizacji trasy drona
+Porównanie algorytmów optymalizacji trasy drona
 """
 
 import time
@@ -17,14 +17,19 @@ from drone_path_optimization import (
     create_individual, evaluate_fitness, repair_individual,
     calculate_path_length, OBSTACLES
 )
+from algorithms.cma_es import CMAES
+from algorithms.differential_evolution import DifferentialEvolution
+from random_streams import make_rng, python_rng, spawn_seeds
 
 
-def run_genetic_algorithm_simple(generations=100, population_size=50):
+def run_genetic_algorithm_simple(generations=100, population_size=50, seed=None):
     """Prosty algorytm genetyczny"""
+    rng = make_rng(seed)
+    py_rng = python_rng(rng)
     print("  Inicjalizacja populacji...", end="", flush=True)
 
     # Inicjata populacji
-    population = [create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT)
+    population = [create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT, rng=py_rng)
                   for _ in range(population_size)]
     fitness_vals = []
 
@@ -48,12 +53,12 @@ def run_genetic_algorithm_simple(generations=100, population_size=50):
         new_fitness = [fitness_vals[i] for i in elite_indices]
 
         while len(new_pop) < population_size:
-            parent1 = elite[np.random.randint(0, len(elite))]
-            parent2 = elite[np.random.randint(0, len(elite))]
+            parent1 = elite[rng.integers(0, len(elite))]
+            parent2 = elite[rng.integers(0, len(elite))]
 
             # Krzyżowanie
             child = [
-                [(parent1[i][j] + parent2[i][j]) / 2 + np.random.normal(0, 0.5)
+                [(parent1[i][j] + parent2[i][j]) / 2 + rng.normal(0, 0.5)
                  for j in range(2)]
                 for i in range(NUM_WAYPOINTS)
             ]
@@ -78,14 +83,16 @@ def run_genetic_algorithm_simple(generations=100, population_size=50):
     return best_fitness, best_individual
 
 
-def run_pso_simple(generations=100, population_size=50):
+def run_pso_simple(generations=100, population_size=50, seed=None):
     """Prosty algorytm PSO"""
+    rng = make_rng(seed)
+    py_rng = python_rng(rng)
     print("  Inicjalizacja cząstek...", end="", flush=True)
 
     # Inicjata cząstek
-    particles = [create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT)
+    particles = [create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT, rng=py_rng)
                  for _ in range(population_size)]
-    velocities = [[np.random.uniform(-1, 1, 2) for _ in range(NUM_WAYPOINTS)]
+    velocities = [[rng.uniform(-1, 1, 2) for _ in range(NUM_WAYPOINTS)]
                   for _ in range(population_size)]
 
     # Ocena fitness
@@ -114,7 +121,7 @@ def run_pso_simple(generations=100, population_size=50):
             # Update velocity
             for j in range(NUM_WAYPOINTS):
                 for k in range(2):
-                    r1, r2 = np.random.random(), np.random.random()
+                    r1, r2 = rng.random(), rng.random()
                     velocities[i][j][k] = (
                             w * velocities[i][j][k] +
                             c1 * r1 * (best_positions[i][j][k] - particle[j][k]) +
@@ -145,11 +152,13 @@ def run_pso_simple(generations=100, population_size=50):
     return best_fitness, global_best
 
 
-def run_sa_simple(iterations=5000):
+def run_sa_simple(iterations=5000, seed=None):
     """Prosty Simulated Annealing"""
+    rng = make_rng(seed)
+    py_rng = python_rng(rng)
     print("  Inicjalizacja rozwiązania...", end="", flush=True)
 
-    current = create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT)
+    current = create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT, rng=py_rng)
     current_rep = repair_individual(current)
     current_fitness = evaluate_fitness(current_rep)[0]
 
@@ -163,10 +172,10 @@ def run_sa_simple(iterations=5000):
     for iteration in range(iterations):
         # Generuj sąsiada
         neighbor = [row[:] for row in current]
-        i = np.random.randint(0, NUM_WAYPOINTS)
+        i = rng.integers(0, NUM_WAYPOINTS)
         neighbor[i] = [
-            neighbor[i][0] + np.random.normal(0, 2),
-            neighbor[i][1] + np.random.normal(0, 2)
+            neighbor[i][0] + rng.normal(0, 2),
+            neighbor[i][1] + rng.normal(0, 2)
         ]
 
         neighbor_rep = repair_individual(neighbor)
@@ -174,7 +183,7 @@ def run_sa_simple(iterations=5000):
 
         # Metropolis acceptance
         delta = neighbor_fitness - current_fitness
-        if delta < 0 or np.random.random() < np.exp(-delta / T):
+        if delta < 0 or rng.random() < np.exp(-delta / T):
             current = neighbor
             current_fitness = neighbor_fitness
 
@@ -190,8 +199,23 @@ def run_sa_simple(iterations=5000):
     return best_fitness, best
 
 
-def main():
-    """Główna funkcja"""
+def run_de_simple(generations=100, population_size=50, strategy='rand/1/bin', seed=None):
+    """Differential Evolution (wektorowo na tablicy populacji)"""
+    de = DifferentialEvolution(population_size=population_size, generations=generations,
+                               strategy=strategy, verbose=False, seed=seed)
+    result = de.run()
+    return result['best_fitness'][-1], result['best_individual']
+
+
+def run_cmaes_simple(generations=300, seed=None):
+    """CMA-ES z restartami IPOP (próbkowanie i ewaluacja całych pokoleń naraz)"""
+    result = CMAES(generations=generations, verbose=False, seed=seed).run()
+    return result['best_fitness'][-1], result['best_individual']
+
+
+def main(seed=None):
+    """Główna funkcja (to samo ziarno - te same wyniki)"""
+    ga_seed, pso_seed, sa_seed, de_seed, cma_seed = spawn_seeds(seed, 5)
     print("\n" + "=" * 75)
     print("PORÓWNANIE ALGORYTMÓW OPTYMALIZACJI TRASY DRONA")
     print("=" * 75)
@@ -204,7 +228,7 @@ def main():
     # 1. Algorytm Genetyczny
     print("1. Algorytm Genetyczny")
     start = time.time()
-    ga_fitness, ga_path = run_genetic_algorithm_simple(generations=100, population_size=50)
+    ga_fitness, ga_path = run_genetic_algorithm_simple(generations=100, population_size=50, seed=ga_seed)
     ga_time = time.time() - start
     ga_length = calculate_path_length(ga_path)
     results.append(('GA', ga_fitness, ga_time, ga_length))
@@ -213,7 +237,7 @@ def main():
     # 2. PSO
     print("2. Particle Swarm Optimization (PSO)")
     start = time.time()
-    pso_fitness, pso_path = run_pso_simple(generations=100, population_size=50)
+    pso_fitness, pso_path = run_pso_simple(generations=100, population_size=50, seed=pso_seed)
     pso_time = time.time() - start
     pso_length = calculate_path_length(pso_path)
     results.append(('PSO', pso_fitness, pso_time, pso_length))
@@ -222,12 +246,30 @@ def main():
     # 3. Simulated Annealing
     print("3. Simulated Annealing (SA)")
     start = time.time()
-    sa_fitness, sa_path = run_sa_simple(iterations=5000)
+    sa_fitness, sa_path = run_sa_simple(iterations=5000, seed=sa_seed)
     sa_time = time.time() - start
     sa_length = calculate_path_length(sa_path)
     results.append(('SA', sa_fitness, sa_time, sa_length))
     print(f"   ✓ Wynik: Fitness={sa_fitness:.2f}, Czas={sa_time:.2f}s\n")
 
+    # 4. Differential Evolution
+    print("4. Differential Evolution (DE)")
+    start = time.time()
+    de_fitness, de_path = run_de_simple(generations=100, population_size=50, seed=de_seed)
+    de_time = time.time() - start
+    de_length = calculate_path_length(de_path)
+    results.append(('DE', de_fitness, de_time, de_length))
+    print(f"   ✓ Wynik: Fitness={de_fitness:.2f}, Czas={de_time:.2f}s\n")
+
+    # 5. CMA-ES
+    print("5. CMA-ES (IPOP)")
+    start = time.time()
+    cma_fitness, cma_path = run_cmaes_simple(generations=300, seed=cma_seed)
+    cma_time = time.time() - start
+    cma_length = calculate_path_length(cma_path)
+    results.append(('CMA-ES', cma_fitness, cma_time, cma_length))
+    print(f"   ✓ Wynik: Fitness={cma_fitness:.2f}, Czas={cma_time:.2f}s\n")
+
     # Tabela wyników
     print("\n" + "=" * 80)
     print("TABELA PORÓWNANIA")
@@ -8,16 +8,23 @@ Autorzy: Marek Marszałek, Mateusz Bierowiec
 Data: 2026-01-15
 """
 
+import bisect
+import math
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import Rectangle, Circle
 import os
 import random
+import sys
 from datetime import datetime
 import pickle
+import time
 import warnings
-from deap import base, creator, tools, algorithms
+import individuals
+from geometry import CLIMB_PENALTY_WEIGHT, CompiledObstacles
+from observers import (
+    GenerationState, ProgressPrinter,
+    notify_run_start, notify_generation, notify_run_end
+)
+from random_streams import make_rng, python_rng
 
 warnings.filterwarnings('ignore')
 
@@ -38,6 +45,8 @@ WIND_DIRECTION = 45
 BLX_ALPHA = 0.1
 REPAIR_RATIO = 0.3
 WAYPOINT_SAFETY_DISTANCE = 2.0
+# Tryb 3D: pułap lotu (oś z); przeszkody z kluczem 'top' mają skończoną wysokość
+MAX_ALTITUDE = 30.0
 
 # ============================================================================
 # GLOBAL CONSTANTS
@@ -64,28 +73,53 @@ def wind_effect(position, wind_speed, wind_direction):
     return np.array([position[0] + wind_x, position[1] + wind_y])
 
 
-def is_point_in_circle(point, center, radius):
-    """Sprawdza czy punkt jest wewnątrz koła."""
+def _below_top(point, top):
+    """Czy punkt 3D leży poniżej wierzchołka przeszkody (punkt 2D lub brak 'top' - zawsze)."""
+    return top is None or len(point) < 3 or point[2] < top
+
+
+def is_point_in_circle(point, center, radius, top=None):
+    """Sprawdza czy punkt jest wewnątrz koła (w 3D: walca o wysokości ``top``)."""
     distance = np.sqrt((point[0] - center[0]) ** 2 + (point[1] - center[1]) ** 2)
-    return distance < radius
+    return distance < radius and _below_top(point, top)
+
 
+def is_point_in_rect(point, x, y, width, height, top=None):
+    """Sprawdza czy punkt jest wewnątrz prostokąta (w 3D: prostopadłościanu o wysokości ``top``)."""
+    return ((x <= point[0] <= x + width) and (y <= point[1] <= y + height)
+            and _below_top(point, top))
 
-def is_point_in_rect(point, x, y, width, height):
-    """Sprawdza czy punkt jest wewnątrz prostokąta."""
-    return (x <= point[0] <= x + width) and (y <= point[1] <= y + height)
+
+def is_point_in_polygon(point, vertices, top=None):
+    """Sprawdza czy punkt jest wewnątrz wielokąta (reguła parzystości promienia)."""
+    x, y = point[0], point[1]
+    inside = False
+    for (ax, ay), (bx, by) in zip(vertices, list(vertices[1:]) + [vertices[0]]):
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+    return inside and _below_top(point, top)
 
 
 def is_point_in_obstacle(point, obstacles=None):
     """Sprawdza czy punkt jest w jakiejś przeszkodzie."""
     if obstacles is None:
         obstacles = OBSTACLES
+    if isinstance(obstacles, CompiledObstacles):
+        return bool(obstacles.contains(point))
 
     for obs in obstacles:
         if obs['type'] == 'circle':
-            if is_point_in_circle(point, obs['center'], obs['radius']):
+            if is_point_in_circle(point, obs['center'], obs['radius'], obs.get('top')):
                 return True
         elif obs['type'] == 'rect':
-            if is_point_in_rect(point, obs['x'], obs['y'], obs['width'], obs['height']):
+            if is_point_in_rect(point, obs['x'], obs['y'], obs['width'], obs['height'],
+                                obs.get('top')):
+                return True
+        elif obs['type'] == 'polygon':
+            if is_point_in_polygon(point, obs['vertices'], obs.get('top')):
+                return True
+        elif obs['type'] == 'raster':
+            if obs['raster'].contains(np.atleast_2d(np.asarray(point, dtype=float)))[0]:
                 return True
     return False
 
@@ -94,14 +128,15 @@ def is_line_intersecting_obstacle(p1, p2, obstacles=None):
     """Sprawdza czy linia między p1 a p2 przecina przeszkodę."""
     if obstacles is None:
         obstacles = OBSTACLES
+    if isinstance(obstacles, CompiledObstacles):
+        return bool(obstacles.segments_blocked(p1, p2))
 
+    p1 = np.asarray(p1, dtype=float)
+    p2 = np.asarray(p2, dtype=float)
     num_checks = 20
     for i in range(1, num_checks):
         t = i / num_checks
-        point = np.array([
-            p1[0] + t * (p2[0] - p1[0]),
-            p1[1] + t * (p2[1] - p1[1])
-        ])
+        point = p1 + t * (p2 - p1)
         if is_point_in_obstacle(point, obstacles):
             return True
     return False
@@ -111,9 +146,7 @@ def calculate_path_length(waypoints):
     """Oblicza całkowitą długość trasy."""
     length = 0.0
     for i in range(len(waypoints) - 1):
-        dx = waypoints[i + 1][0] - waypoints[i][0]
-        dy = waypoints[i + 1][1] - waypoints[i][1]
-        length += np.sqrt(dx ** 2 + dy ** 2)
+        length += np.sqrt(sum((b - a) ** 2 for a, b in zip(waypoints[i], waypoints[i + 1])))
     return length
 
 
@@ -148,6 +181,9 @@ def repair_waypoint(waypoint, obstacles=None, grid_width=GRID_WIDTH, grid_height
 
     # Jeśli punkt jest w przeszkodzie, przesuń go
     if is_point_in_obstacle((x, y), obstacles):
+        if isinstance(obstacles, CompiledObstacles):
+            return _repair_waypoint_compiled(x, y, obstacles, grid_width, grid_height)
+
         # Spróbuj znaleźć najbliższy bezpieczny punkt
         for angle in np.linspace(0, 2 * np.pi, 16):
             for distance in np.linspace(WAYPOINT_SAFETY_DISTANCE, 20, 10):
@@ -166,46 +202,133 @@ def repair_waypoint(waypoint, obstacles=None, grid_width=GRID_WIDTH, grid_height
     return [x, y]
 
 
-def repair_individual(individual, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
-    """Naprawia całego osobnika (reparacja konwencjonalna)."""
+# Kandydaci przesunięcia w kolejności przeszukiwania repair_waypoint (kąt, potem odległość)
+_REPAIR_ANGLES, _REPAIR_DISTANCES = np.meshgrid(
+    np.linspace(0, 2 * np.pi, 16), np.linspace(WAYPOINT_SAFETY_DISTANCE, 20, 10), indexing='ij')
+_REPAIR_OFFSETS = np.stack([(_REPAIR_DISTANCES * np.cos(_REPAIR_ANGLES)).ravel(),
+                            (_REPAIR_DISTANCES * np.sin(_REPAIR_ANGLES)).ravel()], axis=1)
+
+
+def space_bounds(ndim, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+    """Górne granice przestrzeni dla punktów 2D lub 3D."""
+    return np.array([grid_width, grid_height, MAX_ALTITUDE][:ndim], dtype=float)
+
+
+def repair_points(points, geometry, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+    """Przesuwa punkty (M, 2) lub (M, 3) leżące w przeszkodach - repair_waypoint dla wielu naraz.
+
+    Każdy punkt dostaje pierwszego wolnego kandydata w kolejności
+    repair_waypoint; wszyscy kandydaci sprawdzani są jednym wywołaniem.
+    Punkty 3D przesuwane są poziomo, na stałej wysokości.
+    """
+    points = np.asarray(points, dtype=float)
+    points = points.reshape(-1, points.shape[-1])
+    offsets = np.zeros((len(_REPAIR_OFFSETS), points.shape[1]))
+    offsets[:, :2] = _REPAIR_OFFSETS
+    candidates = points[:, None, :] + offsets
+    valid = ((candidates[..., 0] >= 0) & (candidates[..., 0] <= grid_width) &
+             (candidates[..., 1] >= 0) & (candidates[..., 1] <= grid_height))
+    valid &= ~geometry.contains(candidates)
+    repaired = candidates[np.arange(len(points)), np.argmax(valid, axis=1)]
+    repaired[~valid.any(axis=1), :2] = WAYPOINT_SAFETY_DISTANCE
+    return repaired
+
+
+def repair_population(pop, start, goal, geometry, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT,
+                      altitude_layers=None):
+    """Naprawia populację tras (N, W, 2) lub (N, W, 3): granice, start, meta i przeszkody.
+
+    W 3D ``altitude_layers`` (lista wysokości) przyciąga punkty pośrednie
+    do najbliższej dozwolonej warstwy.
+    """
+    pop = np.array(pop, dtype=float)
+    pop[:, 1:-1] = np.clip(pop[:, 1:-1], 0, space_bounds(pop.shape[-1], grid_width, grid_height))
+    if altitude_layers is not None and pop.shape[-1] == 3:
+        layers = np.asarray(altitude_layers, dtype=float)
+        z = pop[:, 1:-1, 2, None]
+        pop[:, 1:-1, 2] = layers[np.abs(z - layers).argmin(axis=-1)]
+    pop[:, 0] = start
+    pop[:, -1] = goal
+
+    # Przesuwane są tylko punkty, które faktycznie leżą w przeszkodach
+    inside = np.zeros(pop.shape[:2], dtype=bool)
+    inside[:, 1:-1] = geometry.contains(pop[:, 1:-1])
+    if inside.any():
+        pop[inside] = repair_points(pop[inside], geometry, grid_width, grid_height)
+    return pop
+
+
+def _repair_waypoint_compiled(x, y, geometry, grid_width, grid_height):
+    """Zwektoryzowane przeszukanie kandydatów repair_waypoint."""
+    return repair_points([[x, y]], geometry, grid_width, grid_height)[0].tolist()
+
+
+def _repair_individual_compiled(individual, grid_width, grid_height, start, goal, geometry):
+    """Zwektoryzowana wersja repair_individual dla skompilowanych przeszkód."""
+    interior = np.asarray(individual[1:-1], dtype=float).reshape(-1, 2)
+    interior = np.clip(interior, 0, [grid_width, grid_height])
+    repaired = [list(start) if start is not None else [0, 0]]
+    repaired.extend(interior.tolist())
+
+    # Naprawiaj tylko punkty, które faktycznie leżą w przeszkodach
+    for i in np.flatnonzero(geometry.contains(interior)):
+        x, y = interior[i]
+        repaired[i + 1] = _repair_waypoint_compiled(x, y, geometry, grid_width, grid_height)
+
+    repaired.append(list(goal) if goal is not None else [grid_width, grid_height])
+    return repaired
+
+
+def repair_individual(individual, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT,
+                      start=None, goal=None, obstacles=None):
+    """Naprawia całego osobnika (reparacja konwencjonalna).
+
+    Domyślnie start = (0, 0), meta = (grid_width, grid_height).
+    """
+    if isinstance(obstacles, CompiledObstacles):
+        return _repair_individual_compiled(individual, grid_width, grid_height,
+                                           start, goal, obstacles)
+
     repaired = []
 
     # Pierwszy punkt = start
-    start = [0, 0]
-    repaired.append(start)
+    repaired.append(list(start) if start is not None else [0, 0])
 
     # Napraw punkty pośrednie
     for i in range(1, len(individual) - 1):
         x = np.clip(individual[i][0], 0, grid_width)
         y = np.clip(individual[i][1], 0, grid_height)
-        waypoint = repair_waypoint([x, y], grid_width=grid_width, grid_height=grid_height)
+        waypoint = repair_waypoint([x, y], obstacles=obstacles,
+                                   grid_width=grid_width, grid_height=grid_height)
         repaired.append(waypoint)
 
     # Ostatni punkt = meta
-    end = [grid_width, grid_height]
-    repaired.append(end)
+    repaired.append(list(goal) if goal is not None else [grid_width, grid_height])
 
     return repaired
 
 
-def create_individual(num_waypoints=NUM_WAYPOINTS, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
-    """Tworzy losowego osobnika."""
+def create_individual(num_waypoints=NUM_WAYPOINTS, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT,
+                      start=None, goal=None, obstacles=None, rng=None):
+    """Tworzy losowego osobnika (``rng`` - np. ``random.Random``, domyślnie moduł random)."""
+    rng = random if rng is None else rng
     individual = []
 
     # Punkt startowy
-    individual.append([0, 0])
+    individual.append(list(start) if start is not None else [0, 0])
 
     # Losowe punkty pośrednie
     for _ in range(num_waypoints - 2):
-        x = random.uniform(0, grid_width)
-        y = random.uniform(0, grid_height)
+        x = rng.uniform(0, grid_width)
+        y = rng.uniform(0, grid_height)
         individual.append([x, y])
 
     # Punkt docelowy
-    individual.append([grid_width, grid_height])
+    individual.append(list(goal) if goal is not None else [grid_width, grid_height])
 
     # Napraw osobnika
-    individual = repair_individual(individual, grid_width, grid_height)
+    individual = repair_individual(individual, grid_width, grid_height,
+                                   start=start, goal=goal, obstacles=obstacles)
 
     return individual
 
@@ -231,42 +354,152 @@ def evaluate_fitness(individual, obstacles=None, wind_speed=WIND_SPEED,
         drift = np.sqrt((affected[0] - point[0]) ** 2 + (affected[1] - point[1]) ** 2)
         wind_penalty += drift * 0.5
 
+    # Kara za wznoszenie (tylko trasy 3D)
+    climb_penalty = 0.0
+    for a, b in zip(individual[:-1], individual[1:]):
+        if len(a) == 3:
+            climb_penalty += max(b[2] - a[2], 0) * CLIMB_PENALTY_WEIGHT
+
     # Fitness = suma kar + długość ścieżki
-    fitness = path_length + obstacle_penalty + wind_penalty
+    fitness = path_length + obstacle_penalty + wind_penalty + climb_penalty
 
     return (fitness,)
 
 
-def setup_deap():
-    """Konfiguruje framework DEAP."""
-    # Wyczyść istniejące klasy jeśli istnieją
-    if hasattr(creator, "FitnessMin"):
-        del creator.FitnessMin
-    if hasattr(creator, "Individual"):
-        del creator.Individual
+def select_tournament(population, k, tournsize, rng=None):
+    """Selekcja turniejowa jak tools.selTournament, ale z podanego generatora."""
+    rng = random if rng is None else rng
+    return [min((rng.choice(population) for _ in range(tournsize)),
+                key=lambda ind: ind.fitness.values[0])
+            for _ in range(k)]
+
 
-    # Utwórz nowe klasy
-    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-    creator.create("Individual", list, fitness=creator.FitnessMin)
+def setup_deap(rng=None):
+    """Konfiguruje framework DEAP (``rng`` - generator operatorów, domyślnie moduł random)."""
+    # Import leniwy - DEAP jest potrzebny dopiero przy uruchomieniu GA
+    from deap import base, tools
 
-    # Stwórz toolbox
+    # Nowy toolbox; typy osobników są wspólne dla procesu (bez globalnego deap.creator)
     toolbox = base.Toolbox()
 
-    # Rejestruj operatory genetyczne
-    toolbox.register("individual", tools.initIterate, creator.Individual,
-                     lambda: create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT))
+    # Rejestruj operatory genetyczne - wszystkie losują z tego samego generatora
+    toolbox.register("individual", tools.initIterate, individuals.Individual,
+                     lambda: create_individual(NUM_WAYPOINTS, GRID_WIDTH, GRID_HEIGHT, rng=rng))
     toolbox.register("population", tools.initRepeat, list, toolbox.individual)
     toolbox.register("evaluate", evaluate_fitness)
-    toolbox.register("mate", crossover_blx)
-    toolbox.register("mutate", mutate_individual)
-    toolbox.register("select", tools.selTournament, tournsize=3)
+    toolbox.register("mate", crossover_blx, rng=rng)
+    toolbox.register("mutate", mutate_individual, rng=rng)
+    toolbox.register("select", select_tournament, tournsize=3, rng=rng)
 
     return toolbox
 
 
-def crossover_blx(ind1, ind2, alpha=BLX_ALPHA):
+def _arc_fractions(path):
+    """Ułamki długości trasy w kolejnych waypointach (0 ... 1)."""
+    s = [0.0]
+    for a, b in zip(path[:-1], path[1:]):
+        s.append(s[-1] + math.dist(a, b))
+    if s[-1] <= 0:
+        return [i / (len(path) - 1) for i in range(len(path))]
+    return [v / s[-1] for v in s]
+
+
+def arc_partners(path, other):
+    """Punkty trasy ``other`` w tych samych ułamkach długości co waypointy ``path``.
+
+    Pozwala parować waypointy tras o różnej liczbie punktów. Trasy są
+    krótkie, więc zwykły Python jest tu szybszy od małych tablic NumPy.
+    """
+    v = _arc_fractions(other)
+    partners = []
+    for u in _arc_fractions(path):
+        k = min(max(bisect.bisect_right(v, u) - 1, 0), len(other) - 2)
+        f = (u - v[k]) / (v[k + 1] - v[k]) if v[k + 1] > v[k] else 0.0
+        f = min(max(f, 0.0), 1.0)
+        partners.append([a + f * (b - a) for a, b in zip(other[k], other[k + 1])])
+    return partners
+
+
+def _blx_point(p1, p2, alpha=BLX_ALPHA, rng=random):
+    """Losowy punkt BLX-α z pary punktów 2D (przycięty do siatki)."""
+    (x1, y1), (x2, y2) = p1[:2], p2[:2]
+    d = abs(x2 - x1)
+    x_min, x_max = max(0, min(x1, x2) - alpha * d), min(GRID_WIDTH, max(x1, x2) + alpha * d)
+    d = abs(y2 - y1)
+    y_min, y_max = max(0, min(y1, y2) - alpha * d), min(GRID_HEIGHT, max(y1, y2) + alpha * d)
+    return [rng.uniform(x_min, x_max), rng.uniform(y_min, y_max)]
+
+
+def crossover_blx_variable(ind1, ind2, alpha=BLX_ALPHA, rng=None):
+    """BLX-α dla tras różnej długości - pary waypointów po ułamku długości trasy.
+
+    Każdy potomek zachowuje liczbę waypointów swojego rodzica.
+    """
+    rng = random if rng is None else rng
+    partners1, partners2 = arc_partners(ind1, ind2), arc_partners(ind2, ind1)
+    for i in range(1, len(ind1) - 1):
+        ind1[i] = _blx_point(ind1[i], partners1[i], alpha, rng)
+    for i in range(1, len(ind2) - 1):
+        ind2[i] = _blx_point(ind2[i], partners2[i], alpha, rng)
+    return ind1, ind2
+
+
+def crossover_splice(ind1, ind2, min_waypoints=3, max_waypoints=None, rng=None):
+    """Krzyżowanie jednopunktowe tras różnej długości - cięcie w tym samym ułamku długości.
+
+    Potomkowie wymieniają się końcówkami, więc ich długości się zmieniają;
+    cięcie dające trasę spoza [min_waypoints, max_waypoints] jest pomijane.
+    """
+    rng = random if rng is None else rng
+    u = rng.random()
+    # Pierwszy waypoint za ułamkiem u (co najmniej 1, najwyżej meta)
+    i = min(max(bisect.bisect_right(_arc_fractions(ind1), u), 1), len(ind1) - 1)
+    j = min(max(bisect.bisect_right(_arc_fractions(ind2), u), 1), len(ind2) - 1)
+    n1, n2 = i + len(ind2) - j, j + len(ind1) - i
+    limit = max_waypoints if max_waypoints is not None else max(n1, n2)
+    if min(n1, n2) >= min_waypoints and max(n1, n2) <= limit:
+        ind1[i:], ind2[j:] = ind2[j:], ind1[i:]
+    return ind1, ind2
+
+
+def mutate_add_waypoint(individual, max_waypoints=None, sigma=GRID_WIDTH * 0.05, rng=None):
+    """Wstawia waypoint w środek odcinka losowanego proporcjonalnie do długości (z szumem)."""
+    rng = random if rng is None else rng
+    if max_waypoints is not None and len(individual) >= max_waypoints:
+        return individual
+    points = np.asarray(individual, dtype=float)
+    seg = np.sqrt((np.diff(points, axis=0) ** 2).sum(axis=1)) + 1e-9
+    k = rng.choices(range(len(seg)), weights=seg)[0]
+    mid = (points[k] + points[k + 1]) / 2
+    mid[:2] += [rng.gauss(0, sigma), rng.gauss(0, sigma)]
+    individual.insert(k + 1, np.clip(mid, 0, space_bounds(len(mid))).tolist())
+    return individual
+
+
+def mutate_delete_waypoint(individual, min_waypoints=3, rng=None):
+    """Usuwa waypoint pośredni - z dwóch losowych ten o mniejszym objeździe (najmniej zmienia trasę)."""
+    rng = random if rng is None else rng
+    if len(individual) <= max(min_waypoints, 3):
+        return individual
+    points = np.asarray(individual, dtype=float)
+    candidates = rng.sample(range(1, len(points) - 1), min(2, len(points) - 2))
+    k = np.array(candidates)
+    # Objazd przez punkt k względem bezpośredniego odcinka k-1 -> k+1
+    detour = (np.linalg.norm(points[k] - points[k - 1], axis=1)
+              + np.linalg.norm(points[k + 1] - points[k], axis=1)
+              - np.linalg.norm(points[k + 1] - points[k - 1], axis=1))
+    del individual[int(k[np.argmin(detour)])]
+    return individual
+
+
+def crossover_blx(ind1, ind2, alpha=BLX_ALPHA, rng=None):
     """Krzyżowanie BLX-α dla waypoints."""
-    if random.random() < CROSSOVER_PROB:
+    rng = random if rng is None else rng
+    if len(ind1) != len(ind2):
+        if rng.random() < CROSSOVER_PROB:
+            crossover_blx_variable(ind1, ind2, alpha, rng)
+        return ind1, ind2
+    if rng.random() < CROSSOVER_PROB:
         # Krzyż punkty pośrednie (nie start i koniec)
         for i in range(1, len(ind1) - 1):
             x1, y1 = ind1[i]
@@ -278,7 +511,7 @@ def crossover_blx(ind1, ind2, alpha=BLX_ALPHA):
             x_max = max(x1, x2) + alpha * d
             x_min = max(0, x_min)
             x_max = min(GRID_WIDTH, x_max)
-            new_x = random.uniform(x_min, x_max)
+            new_x = rng.uniform(x_min, x_max)
 
             # BLX-α dla współrzędnej y
             d = abs(y2 - y1)
@@ -286,37 +519,38 @@ def crossover_blx(ind1, ind2, alpha=BLX_ALPHA):
             y_max = max(y1, y2) + alpha * d
             y_min = max(0, y_min)
             y_max = min(GRID_HEIGHT, y_max)
-            new_y = random.uniform(y_min, y_max)
+            new_y = rng.uniform(y_min, y_max)
 
             ind1[i] = [new_x, new_y]
-            ind2[i] = [random.uniform(x_min, x_max), random.uniform(y_min, y_max)]
+            ind2[i] = [rng.uniform(x_min, x_max), rng.uniform(y_min, y_max)]
 
     return ind1, ind2
 
 
-def mutate_individual(individual, indpb=0.2):
+def mutate_individual(individual, indpb=0.2, rng=None):
     """Mutacja osobnika."""
-    if random.random() < MUTATION_RATE:
+    rng = random if rng is None else rng
+    if rng.random() < MUTATION_RATE:
         # Mutuj losowe punkty pośrednie
         for i in range(1, len(individual) - 1):
-            if random.random() < indpb:
+            if rng.random() < indpb:
                 # Wybierz typ mutacji
-                mutation_type = random.choice(['gaussian', 'uniform', 'repair'])
+                mutation_type = rng.choice(['gaussian', 'uniform', 'repair'])
 
                 if mutation_type == 'gaussian':
                     # Mutacja gaussowska
-                    individual[i][0] += random.gauss(0, GRID_WIDTH * 0.05)
-                    individual[i][1] += random.gauss(0, GRID_HEIGHT * 0.05)
+                    individual[i][0] += rng.gauss(0, GRID_WIDTH * 0.05)
+                    individual[i][1] += rng.gauss(0, GRID_HEIGHT * 0.05)
 
                 elif mutation_type == 'uniform':
                     # Mutacja uniformna
-                    individual[i][0] = random.uniform(0, GRID_WIDTH)
-                    individual[i][1] = random.uniform(0, GRID_HEIGHT)
+                    individual[i][0] = rng.uniform(0, GRID_WIDTH)
+                    individual[i][1] = rng.uniform(0, GRID_HEIGHT)
 
                 elif mutation_type == 'repair':
                     # Mutacja + naprawa
-                    individual[i][0] += random.gauss(0, GRID_WIDTH * 0.03)
-                    individual[i][1] += random.gauss(0, GRID_HEIGHT * 0.03)
+                    individual[i][0] += rng.gauss(0, GRID_WIDTH * 0.03)
+                    individual[i][1] += rng.gauss(0, GRID_HEIGHT * 0.03)
                     individual[i] = repair_waypoint(individual[i])
 
                 # Ogranicz do granic
@@ -329,8 +563,8 @@ def mutate_individual(individual, indpb=0.2):
     return (individual,)
 
 
-def run_algorithm():
-    """Główna funkcja algorytmu genetycznego."""
+def run_algorithm(observers=None, verbose=True, seed=None):
+    """Główna funkcja algorytmu genetycznego (``seed`` jak w random_streams.make_rng)."""
     print("=" * 70)
     print("Optymalizacja Trasy Drona - Algorytm Genetyczny")
     print("=" * 70)
@@ -342,8 +576,8 @@ def run_algorithm():
     print(f"Wiatr: kierunek {WIND_DIRECTION}°, prędkość {WIND_SPEED}")
     print("=" * 70)
 
-    # Konfiguruj DEAP
-    toolbox = setup_deap()
+    # Konfiguruj DEAP z własnym generatorem - bez globalnego random
+    toolbox = setup_deap(python_rng(make_rng(seed)))
 
     # Utwórz populację
     pop = toolbox.population(n=POPULATION_SIZE)
@@ -351,6 +585,14 @@ def run_algorithm():
     # Listy do śledzenia najlepszego fitness
     best_fitness = []
     avg_fitness = []
+    evaluations = 0
+    start_time = time.perf_counter()
+
+    observers = list(observers or [])
+    if verbose:
+        observers.insert(0, ProgressPrinter(
+            fmt="Generacja {generation}/{total} - Najlepsze: {best:.2f}, Średnie: {mean:.2f}"))
+    notify_run_start(observers, None)
 
     # Główna pętla algorytmu
     for gen in range(GENERATIONS):
@@ -358,14 +600,18 @@ def run_algorithm():
         fitnesses = list(map(toolbox.evaluate, pop))
         for ind, fit in zip(pop, fitnesses):
             ind.fitness.values = fit
+        evaluations += len(pop)
 
         # Zapamiętaj statystyki
         fits = [ind.fitness.values[0] for ind in pop]
         best_fitness.append(min(fits))
         avg_fitness.append(np.mean(fits))
 
-        if (gen + 1) % 20 == 0:
-            print(f"Generacja {gen + 1}/{GENERATIONS} - Najlepsze: {min(fits):.2f}, Średnie: {np.mean(fits):.2f}")
+        state = notify_generation(observers, GenerationState(
+            'GA', gen + 1, GENERATIONS, pop, fits, min(fits),
+            evaluations, time.perf_counter() - start_time))
+        if state.stop_requested:
+            break
 
         # Selekcja
         offspring = toolbox.select(pop, len(pop))
@@ -403,17 +649,23 @@ def run_algorithm():
     print(f"Liczba waypoints: {len(best_ind)}")
     print("=" * 70)
 
-    return {
+    results = {
         'best_individual': best_ind,
         'population': pop,
         'best_fitness': best_fitness,
         'avg_fitness': avg_fitness,
         'generations': GENERATIONS
     }
+    notify_run_end(observers, None, results)
+    return results
 
 
 def visualize_results(results):
     """Wizualizuje wyniki algorytmu."""
+    # Import leniwy - matplotlib ładowany tylko przy rysowaniu
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Rectangle, Circle, Polygon
+
     best_ind = results['best_individual']
     best_fitness = results['best_fitness']
     avg_fitness = results['avg_fitness']
@@ -450,6 +702,11 @@ def visualize_results(results):
                              fill=True, alpha=0.3, color='red',
                              edgecolor='darkred', linewidth=2)
             ax2.add_patch(rect)
+        elif obs['type'] == 'polygon':
+            polygon = Polygon(obs['vertices'], closed=True,
+                              fill=True, alpha=0.3, color='red',
+                              edgecolor='darkred', linewidth=2)
+            ax2.add_patch(polygon)
 
     # Rysuj trasę
     waypoints = np.array(best_ind)
@@ -499,17 +756,24 @@ def save_results(results):
     print(f"✓ Dane: {pkl_file}")
 
 
-def main():
-    """Główna funkcja programu."""
+def main(headless=False, seed=None):
+    """Główna funkcja programu.
+
+    W trybie headless (``--headless``) matplotlib nie jest w ogóle importowany.
+    ``seed`` czyni bieg powtarzalnym.
+    """
     try:
         # Uruchom algorytm
-        results = run_algorithm()
+        results = run_algorithm(seed=seed)
 
         # Wizualizuj wyniki
-        fig = visualize_results(results)
-        fig.savefig('zbieznosc_i_trasa.png', dpi=150, bbox_inches='tight')
-        print("✓ Wykres: zbieznosc_i_trasa.png")
-        plt.show()
+        if not headless:
+            import matplotlib.pyplot as plt
+
+            fig = visualize_results(results)
+            fig.savefig('zbieznosc_i_trasa.png', dpi=150, bbox_inches='tight')
+            print("✓ Wykres: zbieznosc_i_trasa.png")
+            plt.show()
 
         # Zapisz wyniki
         save_results(results)
@@ -523,4 +787,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(headless='--headless' in sys.argv[1:])
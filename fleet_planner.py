@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planowanie floty - wspólna optymalizacja tras D dronów na jednej mapie.
+Drony lecą ze stałą prędkością, więc trasy są sparametryzowane czasem;
+konflikty (zbliżenie poniżej separacji w tym samym czasie) wykrywane są
+haszowaniem przestrzennym krótkich odcinków ruchu, a fitness floty
+dostaje karę za każdą konfliktową parę odcinków.
+"""
+
+import numpy as np
+
+from algorithms.differential_evolution import DifferentialEvolution
+from drone_path_optimization import (
+    GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS, GENERATIONS,
+    WIND_SPEED, WIND_DIRECTION, repair_population
+)
+from geometry import evaluate_paths
+from mission_planner import plan_missions
+from random_streams import spawn_seeds
+from seeding import astar_seed_paths
+
+# Minimalna odległość między dronami i prędkość lotu [jednostki siatki / jednostkę czasu]
+SEPARATION = 3.0
+DRONE_SPEED = 1.0
+CONFLICT_PENALTY = 100.0
+
+
+def trajectory_samples(paths, speed=DRONE_SPEED, dt=None, departures=None,
+                       separation=SEPARATION):
+    """Pozycje dronów w chwilach ``k * dt`` -> (pos (D, T, 2), segment (D, T), active (D, T - 1)).
+
+    Przed startem dron stoi w punkcie startowym, po przylocie w mecie.
+    ``segment`` to indeks odcinka trasy w danej chwili, ``active`` - czy
+    dron jest w powietrzu w przedziale [t_k, t_k+1]. Domyślne ``dt``
+    ogranicza drogę w jednym przedziale do połowy separacji.
+    """
+    paths = np.asarray(paths, dtype=float)
+    d, w = paths.shape[:2]
+    dt = separation / (2 * speed) if dt is None else dt
+    departures = np.zeros(d) if departures is None else np.asarray(departures, dtype=float)
+
+    seg_len = np.sqrt((np.diff(paths, axis=1) ** 2).sum(axis=-1))
+    times = departures[:, None] + np.concatenate(
+        [np.zeros((d, 1)), np.cumsum(seg_len, axis=1)], axis=1) / speed
+    t = np.arange(int(np.ceil(times[:, -1].max() / dt)) + 2) * dt
+
+    # Odcinek trasy w każdej chwili i postęp w jego obrębie
+    segment = np.clip((t[None, :, None] >= times[:, None, 1:]).sum(axis=-1), 0, w - 2)
+    rows = np.arange(d)[:, None]
+    t0, t1 = times[rows, segment], times[rows, segment + 1]
+    frac = np.clip((t - t0) / np.maximum(t1 - t0, 1e-12), 0, 1)[..., None]
+    pos = paths[rows, segment] + frac * (paths[rows, segment + 1] - paths[rows, segment])
+
+    active = (t[None, :-1] < times[:, -1:]) & (t[None, 1:] > departures[:, None])
+    return pos, segment, active
+
+
+def _neighbor_pairs(keys, offsets):
+    """Pary indeksów (i, j), gdzie klucz j = klucz i + offset - przez sortowanie i searchsorted"""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    src, dst = [], []
+    for offset in offsets:
+        # Zapytania w kolejności posortowanej - searchsorted przechodzi tablicę sekwencyjnie
+        query = sorted_keys + offset
+        lo = np.searchsorted(sorted_keys, query, 'left')
+        count = np.searchsorted(sorted_keys, query, 'right') - lo
+        total = count.sum()
+        if not total:
+            continue
+        starts = np.repeat(lo - np.cumsum(count) + count, count)
+        src.append(np.repeat(order, count))
+        dst.append(order[starts + np.arange(total)])
+    if not src:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    return np.concatenate(src), np.concatenate(dst)
+
+
+def detect_conflicts(paths, separation=SEPARATION, speed=DRONE_SPEED, dt=None, departures=None):
+    """Konflikty floty (D, W, 2) -> tablica (K, 4) wierszy (dron_a, odcinek_a, dron_b, odcinek_b).
+
+    Ruch dronów dzielony jest na krótkie odcinki o długości najwyżej
+    ``speed * dt``. Odcinek trafia do komórki (przedział czasu, x, y)
+    o boku ``separation + speed * dt``, więc kandydaci na konflikt leżą
+    w tej samej lub sąsiedniej komórce - koszt rośnie prawie liniowo
+    z liczbą dronów zamiast D² × W². Kandydaci sprawdzani są dokładnie
+    (minimalna odległość przy ruchu liniowym w przedziale).
+    """
+    paths = np.asarray(paths, dtype=float)
+    dt = separation / (2 * speed) if dt is None else dt
+    pos, segment, active = trajectory_samples(paths, speed, dt, departures, separation)
+
+    drone, slot = np.nonzero(active)
+    if len(drone) < 2:
+        return np.empty((0, 4), dtype=int)
+    a, b = pos[drone, slot], pos[drone, slot + 1]
+
+    size = separation + speed * dt
+    cell = np.floor((a + b) / 2 / size).astype(np.int64)
+    cell -= cell.min(axis=0) - 1
+    nx, ny = cell[:, 0].max() + 2, cell[:, 1].max() + 2
+    keys = (slot * ny + cell[:, 1]) * nx + cell[:, 0]
+    offsets = [oy * nx + ox for oy in (-1, 0, 1) for ox in (-1, 0, 1)]
+
+    i, j = _neighbor_pairs(keys, offsets)
+    keep = drone[i] < drone[j]
+    i, j = i[keep], j[keep]
+
+    # Minimalna odległość względnego ruchu liniowego na przedziale
+    p = a[i] - a[j]
+    v = (b[i] - a[i]) - (b[j] - a[j])
+    s = np.clip(-(p * v).sum(axis=1) / np.maximum((v ** 2).sum(axis=1), 1e-12), 0, 1)
+    close = np.sqrt(((p + s[:, None] * v) ** 2).sum(axis=1)) < separation
+    i, j = i[close], j[close]
+
+    conflicts = np.stack([drone[i], segment[drone[i], slot[i]],
+                          drone[j], segment[drone[j], slot[j]]], axis=1)
+    return np.unique(conflicts, axis=0)
+
+
+def conflict_counts(paths, separation=SEPARATION, speed=DRONE_SPEED, dt=None, departures=None):
+    """Liczba konfliktowych par odcinków każdego drona -> (D,)"""
+    conflicts = detect_conflicts(paths, separation, speed, dt, departures)
+    return np.bincount(conflicts[:, [0, 2]].ravel(), minlength=len(paths))
+
+
+class FleetPlanner(DifferentialEvolution):
+    """Wspólna optymalizacja tras floty (DE na tablicach (N, D, W, 2))"""
+
+    def __init__(self, missions, population_size=30,
+                 generations=GENERATIONS,
+                 F=0.6, CR=0.9, strategy='rand/1/bin',
+                 separation=SEPARATION, speed=DRONE_SPEED, departures=None,
+                 init_spread=0.05, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
+        super().__init__(population_size=population_size, generations=generations,
+                         F=F, CR=CR, strategy=strategy, obstacles=obstacles,
+                         observers=observers, verbose=verbose, seeding=seeding, seed=seed,
+                         wind_speed=wind_speed, wind_direction=wind_direction)
+        self.starts = np.array([m[0] for m in missions], dtype=float)
+        self.goals = np.array([m[1] for m in missions], dtype=float)
+        self.separation = separation
+        self.speed = speed
+        self.departures = departures
+        # Trasy startowe floty - po jednej na drona (np. z plan_missions)
+        self.initial_paths = list(initial_paths or [])
+        # Odchylenie zaburzeń floty startowej (ułamek szerokości mapy)
+        self.init_spread = init_spread
+        self.conflicts = None
+
+    def detect_conflicts(self, fleet):
+        """Konflikty jednej floty (D, W, 2)"""
+        return detect_conflicts(fleet, self.separation, self.speed, departures=self.departures)
+
+    def _repair_population(self, pop):
+        """Naprawia wszystkie trasy wszystkich flot (N, D, W, 2)"""
+        pop = np.asarray(pop, dtype=float)
+        n, d = pop.shape[:2]
+        flat = repair_population(pop.reshape((n * d,) + pop.shape[2:]),
+                                 np.tile(self.starts, (n, 1)), np.tile(self.goals, (n, 1)),
+                                 self.geometry)
+        return flat.reshape(pop.shape)
+
+    def _evaluate_population(self, pop):
+        """Suma fitness tras floty + kara za konflikty"""
+        n, d = pop.shape[:2]
+        self.evaluations += n
+        fits = evaluate_paths(pop.reshape((n * d,) + pop.shape[2:]), self.geometry,
+                              self.wind_speed, self.wind_direction).reshape(n, d).sum(axis=1)
+        conflicts = np.array([len(self.detect_conflicts(fleet)) for fleet in pop])
+        return fits + CONFLICT_PENALTY * conflicts
+
+    def _initial_population(self):
+        """Floty startowe: trasy startowe, seeding A* i zaburzone odcinki start-meta"""
+        n, d = self.population_size, len(self.starts)
+        if self.initial_paths:
+            base = np.asarray(self.initial_paths, dtype=float)[None]
+        else:
+            t = np.linspace(0, 1, NUM_WAYPOINTS)[None, None, :, None]
+            base = self.starts[None, :, None] + t * (self.goals - self.starts)[None, :, None]
+        # Rosnące zaburzenie: pierwsza flota to dokładnie trasy bazowe
+        noise = self.rng.normal(0, 1, (n, d, NUM_WAYPOINTS, 2))
+        pop = base + noise * np.linspace(0, GRID_WIDTH * self.init_spread, n)[:, None, None, None]
+
+        if self.seeding == 'astar':
+            count = max(1, n // 5)
+            for k in range(d):
+                seeds = astar_seed_paths(self.geometry, self.starts[k], self.goals[k], count=count,
+                                         rng=self.rng)
+                # Meta nieosiągalna w A* - dron zostaje z zaburzonym odcinkiem
+                if seeds:
+                    pop[-len(seeds):, k] = np.asarray(seeds, dtype=float)
+        elif self.seeding is not None:
+            raise ValueError(f"Nieznany seeding: {self.seeding!r}")
+        return self._repair_population(pop)
+
+    def _crossover(self, pop, mutants):
+        """Krzyżowanie dwumianowe waypointów każdego drona"""
+        n, d, w = pop.shape[:3]
+        mask = self.rng.random((n, d, w)) < self.CR
+        mask[np.arange(n)[:, None], np.arange(d), self.rng.integers(1, w - 1, (n, d))] = True
+        return np.where(mask[..., None], mutants, pop)
+
+    def run(self):
+        """Uruchamia planowanie floty"""
+        result = super().run()
+        fleet = np.asarray(result['best_individual'])
+        self.conflicts = self.detect_conflicts(fleet)
+        result.update({
+            'paths': result['best_individual'],
+            'conflicts': self.conflicts.tolist(),
+            'algorithm': 'Fleet DE',
+        })
+        return result
+
+
+def plan_fleet(missions, algorithm='pso', obstacles=None, workers=0, independent_params=None,
+               seed=None, **params):
+    """Planuje misje niezależnie (plan_missions), a potem rozwiązuje konflikty FleetPlanner."""
+    independent_seed, fleet_seed = spawn_seeds(seed, 2)
+    independent = plan_missions(missions, algorithm, obstacles=obstacles, workers=workers,
+                                seed=independent_seed, **(independent_params or {}))
+    planner = FleetPlanner(missions, obstacles=obstacles, seed=fleet_seed,
+                           initial_paths=[r['best_individual'] for r in independent], **params)
+    return planner.run()
+
+
+def main():
+    """Przykład: sześć dronów na krzyżujących się trasach"""
+    missions = [([0, 10 + 16 * k], [GRID_WIDTH, GRID_HEIGHT - 10 - 16 * k]) for k in range(6)]
+    result = plan_fleet(missions, independent_params={'population_size': 30, 'generations': 40},
+                        population_size=30, generations=100, verbose=False)
+    print(f"Flota {len(missions)} dronów: fitness={result['best_fitness'][-1]:.2f}, "
+          f"konflikty={len(result['conflicts'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,777 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Skompilowana geometria przeszkód i zwektoryzowane testy kolizji.
+Przeszkody z listy słowników zamieniane są raz na tablice NumPy,
+a punkty i odcinki sprawdzane są hurtowo.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Liczba próbek na odcinku - jak w is_line_intersecting_obstacle
+SEGMENT_CHECKS = 20
+OBSTACLE_PENALTY = 100.0
+WIND_PENALTY_WEIGHT = 0.5
+# Tryb 3D: koszt jednostki wznoszenia (opadanie jest darmowe)
+CLIMB_PENALTY_WEIGHT = 2.0
+# Indeks krawędzi wielokątów: liczba komórek siatki na dłuższym boku obszaru
+POLYGON_GRID_CELLS = 64
+# Od tylu kół i prostokątów testy punktów korzystają z siatki zamiast przeglądu wszystkich
+PRIMITIVE_INDEX_MIN = 32
+# Rastry zajętości: promień okna (w komórkach) przy liczeniu odległości
+# i liczba komórek przechodzonych naraz przez DDA
+RASTER_DISTANCE_CELLS = 8
+RASTER_CHUNK = 2 ** 22
+# Liczba punktów, dla których liczona jest naraz odległość od przeszkód
+DISTANCE_CHUNK = 1024
+
+
+def _json_default(obj):
+    """Serializacja nie-JSON-owych wartości przeszkód do skrótu zawartości."""
+    if isinstance(obj, OccupancyRaster):
+        return obj.fingerprint()
+    return list(obj)
+
+
+def obstacles_fingerprint(obstacles):
+    """Zwraca skrót zawartości listy przeszkód (klucz cache)."""
+    payload = json.dumps(obstacles, sort_keys=True, default=_json_default)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def expand_ranges(lo, hi):
+    """Rozwija przedziały [lo, hi) -> (numer przedziału, wartość) dla wszystkich elementów."""
+    count = np.maximum(hi - lo, 0)
+    owner = np.repeat(np.arange(len(lo)), count)
+    offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    return owner, np.repeat(lo, count) + offset
+
+
+def _csr(keys, values, size):
+    """Grupuje ``values`` według ``keys`` -> (ptr (size + 1,), values posortowane po kluczu)."""
+    order = np.argsort(keys, kind='stable')
+    ptr = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=size))])
+    return ptr, values[order]
+
+
+class PolygonIndex:
+    """Wielokąty jako tablice krawędzi z jednorodną siatką indeksu.
+
+    Krawędzie rejestrowane są w komórkach siatki, które pokrywa ich prostokąt
+    otaczający (zapytania o odcinki), oraz w poziomych pasach siatki
+    (test parzystości promienia dla punktów). Zapytania sprawdzają tylko
+    krawędzie z odwiedzanych komórek - bez pętli po krawędziach w Pythonie.
+    """
+
+    def __init__(self, polygons):
+        vertices = [np.asarray(p['vertices'], dtype=float).reshape(-1, 2) for p in polygons]
+        self.edge_a = np.concatenate(vertices)
+        self.edge_b = np.concatenate([np.roll(v, -1, axis=0) for v in vertices])
+        self.edge_poly = np.repeat(np.arange(len(vertices)), [len(v) for v in vertices])
+        self.lo = np.array([v.min(axis=0) for v in vertices])
+        self.hi = np.array([v.max(axis=0) for v in vertices])
+        self.tops = np.array([p.get('top', np.inf) for p in polygons], dtype=float)
+
+        self.origin = self.lo.min(axis=0)
+        extent = self.hi.max(axis=0) - self.origin
+        self.cell = max(extent.max() / POLYGON_GRID_CELLS, 1e-9)
+        self.shape = (extent // self.cell).astype(int) + 1
+
+        # Komórki pokrywane przez prostokąty otaczające krawędzi
+        e_lo = self._cells(np.minimum(self.edge_a, self.edge_b))
+        e_hi = self._cells(np.maximum(self.edge_a, self.edge_b))
+        width = e_hi[:, 0] - e_lo[:, 0] + 1
+        edge, k = expand_ranges(np.zeros(len(width), dtype=int),
+                                 width * (e_hi[:, 1] - e_lo[:, 1] + 1))
+        cx = e_lo[edge, 0] + k % width[edge]
+        cy = e_lo[edge, 1] + k // width[edge]
+        self.cell_ptr, self.cell_edges = _csr(cy * self.shape[0] + cx, edge,
+                                              self.shape[0] * self.shape[1])
+
+        # Pasy poziome (wiersze siatki) - krawędzie przecinające dany zakres y
+        edge, row = expand_ranges(e_lo[:, 1], e_hi[:, 1] + 1)
+        self.band_ptr, self.band_edges = _csr(row, edge, self.shape[1])
+
+    def _cells(self, points):
+        """Współrzędne komórek siatki (przycięte do indeksu) -> int (..., 2)."""
+        return np.clip(((points - self.origin) // self.cell).astype(int), 0, self.shape - 1)
+
+    def contains(self, points):
+        """Test parzystości promienia dla punktów (M, 2) lub (M, 3) -> bool (M,)."""
+        points = np.asarray(points, dtype=float)
+        inside = np.zeros(len(points), dtype=bool)
+        # Prefiltr: prostokąt otaczający wszystkich wielokątów
+        idx = np.flatnonzero(((points[:, :2] >= self.origin)
+                              & (points[:, :2] <= self.hi.max(axis=0))).all(axis=1))
+        if not len(idx):
+            return inside
+
+        rows = self._cells(points[idx, :2])[:, 1]
+        for row in np.unique(rows):
+            edges = self.band_edges[self.band_ptr[row]:self.band_ptr[row + 1]]
+            if not len(edges):
+                continue
+            sel = idx[rows == row]
+            px, py = points[sel, 0, None], points[sel, 1, None]
+            (ax, ay), (bx, by) = self.edge_a[edges].T, self.edge_b[edges].T
+            straddle = (ay > py) != (by > py)
+            dy = np.where(by == ay, 1.0, by - ay)
+            crossing = straddle & (px < ax + (py - ay) * (bx - ax) / dy)
+
+            # Krawędzie w pasie są posortowane - parzystość przecięć per wielokąt przez reduceat
+            poly = self.edge_poly[edges]
+            starts = np.flatnonzero(np.r_[True, poly[1:] != poly[:-1]])
+            odd = np.logical_xor.reduceat(crossing, starts, axis=1)
+            if points.shape[1] == 3:
+                odd &= points[sel, 2, None] < self.tops[poly[starts]]
+            inside[sel] = odd.any(axis=1)
+        return inside
+
+    def _segment_cells(self, a, b):
+        """Komórki siatki, przez które przechodzą odcinki a->b (M, 2) -> (numer odcinka, komórka).
+
+        Dla każdej kolumny siatki między końcami odcinka liczony jest zakres
+        y odcinka w tej kolumnie - tylko komórki faktycznie przecinane,
+        a nie cały prostokąt otaczający.
+        """
+        c_lo, c_hi = self._cells(np.minimum(a, b)), self._cells(np.maximum(a, b))
+        seg, col = expand_ranges(c_lo[:, 0], c_hi[:, 0] + 1)
+
+        # Fragment odcinka w kolumnie: x przycięte do kolumny i do końców odcinka
+        ax, ay = a[seg, 0], a[seg, 1]
+        dx, dy = b[seg, 0] - ax, b[seg, 1] - ay
+        x_lo = np.maximum(self.origin[0] + col * self.cell, np.minimum(ax, ax + dx))
+        x_hi = np.minimum(self.origin[0] + (col + 1) * self.cell, np.maximum(ax, ax + dx))
+        vertical = dx == 0
+        safe_dx = np.where(vertical, 1.0, dx)
+        y0 = np.where(vertical, ay, ay + (x_lo - ax) / safe_dx * dy)
+        y1 = np.where(vertical, ay + dy, ay + (x_hi - ax) / safe_dx * dy)
+        r_lo = self._cells(np.c_[x_lo, np.minimum(y0, y1)])[:, 1]
+        r_hi = self._cells(np.c_[x_lo, np.maximum(y0, y1)])[:, 1]
+
+        part, row = expand_ranges(r_lo, r_hi + 1)
+        return seg[part], row * self.shape[0] + col[part]
+
+    def segments_hit(self, a, b):
+        """Czy odcinki a->b (M, 2) lub (M, 3) przecinają wielokąty -> bool (M,).
+
+        Dokładny test przecięcia z krawędziami z komórek pokrywanych przez
+        odcinek; odcinek bez przecięć leży cały wewnątrz lub na zewnątrz,
+        co rozstrzyga test jego środka.
+        """
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        hit = np.zeros(len(a), dtype=bool)
+        s_lo, s_hi = np.minimum(a[:, :2], b[:, :2]), np.maximum(a[:, :2], b[:, :2])
+        idx = np.flatnonzero(((s_hi >= self.origin) & (s_lo <= self.hi.max(axis=0))).all(axis=1))
+
+        if len(idx):
+            seg, cell = self._segment_cells(a[idx, :2], b[idx, :2])
+            pair, pos = expand_ranges(self.cell_ptr[cell], self.cell_ptr[cell + 1])
+            seg, edge = idx[seg[pair]], self.cell_edges[pos]
+
+            p, r = a[seg, :2], b[seg, :2] - a[seg, :2]
+            q, e = self.edge_a[edge], self.edge_b[edge] - self.edge_a[edge]
+            d1 = np.cross(e, p - q)
+            d2 = np.cross(e, p + r - q)
+            d3 = np.cross(r, q - p)
+            d4 = np.cross(r, q + e - p)
+            crosses = (d1 * d2 <= 0) & (d3 * d4 <= 0) & ((d1 != d2) | (d3 != d4))
+            if a.shape[1] == 3:
+                # Wysokość odcinka w punkcie przecięcia względem wierzchołka wielokąta
+                t = np.where(d1 != d2, d1 / np.where(d1 != d2, d1 - d2, 1), 0)
+                z = a[seg, 2] + t * (b[seg, 2] - a[seg, 2])
+                crosses &= z < self.tops[self.edge_poly[edge]]
+            hit[seg[crosses]] = True
+
+        mid = (a + b) / 2
+        if a.shape[1] == 3:
+            mid[:, 2] = np.minimum(a[:, 2], b[:, 2])
+        return hit | self.contains(mid)
+
+    def distance(self, points):
+        """Odległość ze znakiem od najbliższego wielokąta (ujemna wewnątrz) -> (M,)."""
+        points = np.asarray(points, dtype=float)
+        dist = np.empty(len(points))
+        for s in range(0, len(points), DISTANCE_CHUNK):
+            dist[s:s + DISTANCE_CHUNK] = self._boundary_distance(points[s:s + DISTANCE_CHUNK, :2])
+        return np.where(self.contains(points[:, :2]), -dist, dist)
+
+    def _edge_distance(self, p, edge):
+        """Odległość punktów od krawędzi ``edge`` (kształty jak w broadcastingu p[..., 0])."""
+        a = self.edge_a[edge]
+        e = self.edge_b[edge] - a
+        t = np.clip(((p - a) * e).sum(axis=-1) / np.maximum((e ** 2).sum(axis=-1), 1e-12), 0, 1)
+        return np.sqrt(((a + t[..., None] * e - p) ** 2).sum(axis=-1))
+
+    def _boundary_distance(self, p):
+        """Odległość punktów (M, 2) od najbliższej krawędzi przez siatkę indeksu -> (M,).
+
+        Jak CompiledObstacles._distance_indexed: promień przeszukania komórek
+        rośnie dwukrotnie, a gdy obejmowałby większość siatki, pozostałe punkty
+        liczone są względem wszystkich krawędzi.
+        """
+        dist = np.full(len(p), np.inf)
+        todo = np.arange(len(p))
+        radius = self.cell
+        while len(todo):
+            if (2 * radius / self.cell + 1) ** 2 >= self.shape.prod():
+                dist[todo] = self._edge_distance(p[todo, None], np.arange(len(self.edge_a))).min(axis=1)
+                break
+            lo, hi = self._cells(p[todo] - radius), self._cells(p[todo] + radius)
+            width = hi[:, 0] - lo[:, 0] + 1
+            pt, k = expand_ranges(np.zeros(len(todo), dtype=int), width * (hi[:, 1] - lo[:, 1] + 1))
+            cell = (lo[pt, 1] + k // width[pt]) * self.shape[0] + lo[pt, 0] + k % width[pt]
+            pair, pos = expand_ranges(self.cell_ptr[cell], self.cell_ptr[cell + 1])
+            if len(pair):
+                pt = pt[pair]
+                d = self._edge_distance(p[todo[pt]], self.cell_edges[pos])
+                first = np.flatnonzero(np.r_[True, pt[1:] != pt[:-1]])
+                owner = todo[pt[first]]
+                dist[owner] = np.minimum(dist[owner], np.minimum.reduceat(d, first))
+            # Krawędź bliższa niż promień leży w przeszukanych komórkach - wynik dokładny
+            todo = todo[dist[todo] > radius]
+            radius *= 2
+        return dist
+
+
+class PrimitiveIndex:
+    """Jednorodna siatka kół i prostokątów dla map z wieloma przeszkodami.
+
+    Przeszkoda rejestrowana jest w komórkach pokrywanych przez jej prostokąt
+    otaczający; punkt sprawdzany jest dokładnie tylko z przeszkodami swojej
+    komórki. Indeksy 0..C-1 to koła, C.. - prostokąty.
+    """
+
+    def __init__(self, centers, radii_sq, rect_lo, rect_hi):
+        radii = np.sqrt(radii_sq)[:, None]
+        self.num_circles = len(centers)
+        self.lo = np.concatenate([centers - radii, rect_lo])
+        self.hi = np.concatenate([centers + radii, rect_hi])
+
+        self.origin = self.lo.min(axis=0)
+        extent = self.hi.max(axis=0) - self.origin
+        # Komórka rzędu typowej przeszkody, ale nie drobniejsza niż 1/256 obszaru
+        self.cell = max(float(np.median((self.hi - self.lo).max(axis=1))),
+                        extent.max() / 256, 1e-9)
+        self.shape = (extent // self.cell).astype(int) + 1
+
+        c_lo, c_hi = self._cells(self.lo), self._cells(self.hi)
+        width = c_hi[:, 0] - c_lo[:, 0] + 1
+        prim, k = expand_ranges(np.zeros(len(width), dtype=int),
+                                 width * (c_hi[:, 1] - c_lo[:, 1] + 1))
+        cell = (c_lo[prim, 1] + k // width[prim]) * self.shape[0] + c_lo[prim, 0] + k % width[prim]
+        self.cell_ptr, self.cell_items = _csr(cell, prim, self.shape[0] * self.shape[1])
+
+    def _cells(self, points):
+        """Współrzędne komórek siatki (przycięte do indeksu) -> int (..., 2)."""
+        return np.clip(((points - self.origin) // self.cell).astype(int), 0, self.shape - 1)
+
+    def candidates(self, points):
+        """Pary (punkt, przeszkoda) z komórek punktów (M, 2) -> (indeksy punktów, przeszkód)."""
+        idx = np.flatnonzero(((points >= self.origin) & (points <= self.hi.max(axis=0))).all(axis=1))
+        c = self._cells(points[idx])
+        cell = c[:, 1] * self.shape[0] + c[:, 0]
+        pair, pos = expand_ranges(self.cell_ptr[cell], self.cell_ptr[cell + 1])
+        return idx[pair], self.cell_items[pos]
+
+    def near(self, points, radius):
+        """Pary (punkt, przeszkoda) z komórek w promieniu ``radius`` od punktów (M, 2).
+
+        Zwraca (indeksy punktów - niemalejące, przeszkód); każda przeszkoda
+        bliższa niż ``radius`` jest w parach, ale może wystąpić kilka razy.
+        """
+        lo, hi = self._cells(points - radius), self._cells(points + radius)
+        width = hi[:, 0] - lo[:, 0] + 1
+        pt, k = expand_ranges(np.zeros(len(points), dtype=int), width * (hi[:, 1] - lo[:, 1] + 1))
+        cell = (lo[pt, 1] + k // width[pt]) * self.shape[0] + lo[pt, 0] + k % width[pt]
+        pair, pos = expand_ranges(self.cell_ptr[cell], self.cell_ptr[cell + 1])
+        return pt[pair], self.cell_items[pos]
+
+
+class OccupancyRaster:
+    """Raster zajętości (wiersze = y) jako źródło przeszkód.
+
+    ``data`` to tablica 2D uint8 (niezerowa komórka = zajęta) albo, przy
+    ``packed=True``, bity spakowane wzdłuż x jak w ``np.packbits``. Tablica
+    może być ``np.memmap`` - zapytania odczytują tylko potrzebne komórki,
+    więc raster 20k × 20k nie jest wczytywany w całości. Zajęte komórki są
+    nieskończenie wysokie (wysokość punktów 3D jest pomijana), poza
+    rastrem jest wolna przestrzeń.
+    """
+
+    def __init__(self, data, origin=(0.0, 0.0), resolution=1.0, packed=False, width=None):
+        self.data = data
+        self.origin = np.asarray(origin, dtype=float)
+        self.resolution = float(resolution)
+        self.packed = packed
+        nx = width if width is not None else data.shape[1] * (8 if packed else 1)
+        self.shape = np.array([nx, data.shape[0]])
+
+    @classmethod
+    def open(cls, path, shape=None, packed=False, origin=(0.0, 0.0), resolution=1.0):
+        """Mapuje raster z pliku: ``.npy`` albo surowe bajty o kształcie ``shape`` (ny, nx)."""
+        if path.endswith('.npy'):
+            data = np.load(path, mmap_mode='r')
+        else:
+            ny, nx = shape
+            data = np.memmap(path, dtype=np.uint8, mode='r',
+                             shape=(ny, -(-nx // 8) if packed else nx))
+        width = shape[1] if shape is not None else None
+        return cls(data, origin, resolution, packed, width)
+
+    @property
+    def bounds(self):
+        """Prostokąt rastra -> (lo, hi)."""
+        return self.origin, self.origin + self.shape * self.resolution
+
+    def fingerprint(self):
+        """Skrót rastra - dla pliku ścieżka, rozmiar i czas modyfikacji, bez czytania danych."""
+        filename = getattr(self.data, 'filename', None)
+        if filename is not None:
+            st = os.stat(filename)
+            content = f"{os.path.abspath(filename)}:{st.st_size}:{st.st_mtime_ns}"
+        else:
+            content = hashlib.sha1(np.ascontiguousarray(self.data).tobytes()).hexdigest()
+        return [content, self.shape.tolist(), self.origin.tolist(), self.resolution, self.packed]
+
+    def __getstate__(self):
+        # Raster z pliku zapisywany jest jako ścieżka, nie jako dane
+        state = dict(self.__dict__)
+        filename = getattr(self.data, 'filename', None)
+        if filename is not None:
+            state['data'] = (filename, self.data.shape)
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state['data'], tuple):
+            filename, shape = state['data']
+            if filename.endswith('.npy'):
+                state['data'] = np.load(filename, mmap_mode='r')
+            else:
+                state['data'] = np.memmap(filename, dtype=np.uint8, mode='r', shape=shape)
+        self.__dict__.update(state)
+
+    def occupied(self, ix, iy):
+        """Zajętość komórek o indeksach z zakresu rastra -> bool."""
+        if self.packed:
+            byte = self.data[iy, ix >> 3]
+            return ((byte >> (7 - (ix & 7))) & 1).astype(bool)
+        return self.data[iy, ix] != 0
+
+    def contains(self, points):
+        """Które punkty (M, 2) lub (M, 3) leżą w zajętych komórkach -> bool (M,)."""
+        points = np.asarray(points, dtype=float)
+        g = np.floor((points[:, :2] - self.origin) / self.resolution).astype(np.int64)
+        idx = np.flatnonzero(((g >= 0) & (g < self.shape)).all(axis=1))
+        inside = np.zeros(len(points), dtype=bool)
+        inside[idx] = self.occupied(g[idx, 0], g[idx, 1])
+        return inside
+
+    def segments_hit(self, a, b):
+        """Które odcinki a->b (M, 2) lub (M, 3) przechodzą przez zajętą komórkę -> bool (M,).
+
+        Zwektoryzowane DDA: odcinek przycięty do rastra dzielony jest
+        w punktach przecięcia linii siatki, a każdy kawałek sprawdzany
+        w komórce swojego środka - dokładnie komórki, które odcinek przecina.
+        """
+        a = (np.asarray(a, dtype=float)[:, :2] - self.origin) / self.resolution
+        b = (np.asarray(b, dtype=float)[:, :2] - self.origin) / self.resolution
+        d = b - a
+        hit = np.zeros(len(a), dtype=bool)
+
+        # Przycięcie do prostokąta rastra (Liang-Barsky)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_lo = np.where(d != 0, -a / d, np.where(a >= 0, -np.inf, np.inf))
+            t_hi = np.where(d != 0, (self.shape - a) / d, np.where(a < self.shape, np.inf, -np.inf))
+        t0 = np.maximum(np.minimum(t_lo, t_hi).max(axis=1), 0.0)
+        t1 = np.minimum(np.maximum(t_lo, t_hi).min(axis=1), 1.0)
+        seg = np.flatnonzero(t0 <= t1)
+        if not len(seg):
+            return hit
+        a, d, t0, t1 = a[seg], d[seg], t0[seg], t1[seg]
+        p0, p1 = a + t0[:, None] * d, a + t1[:, None] * d
+        c0 = np.clip(np.floor(p0), 0, self.shape - 1).astype(np.int64)
+        c1 = np.clip(np.floor(p1), 0, self.shape - 1).astype(np.int64)
+        lines_lo = np.minimum(c0, c1) + 1
+        count = np.abs(c1 - c0)
+
+        # Porcje odcinków o ograniczonej łącznej liczbie przechodzonych komórek
+        total = np.cumsum(count.sum(axis=1) + 2)
+        bounds = np.searchsorted(total, np.arange(1, total[-1] // RASTER_CHUNK + 1) * RASTER_CHUNK)
+        for s, e in zip(np.r_[0, bounds], np.r_[bounds, len(seg)]):
+            if s == e:
+                continue
+            owners, ts = [np.arange(s, e)] * 2, [t0[s:e], t1[s:e]]
+            for axis in (0, 1):
+                owner, line = expand_ranges(lines_lo[s:e, axis], lines_lo[s:e, axis] + count[s:e, axis])
+                owner += s
+                owners.append(owner)
+                ts.append((line - a[owner, axis]) / d[owner, axis])
+            owner, t = np.concatenate(owners), np.concatenate(ts)
+            order = np.lexsort((t, owner))
+            owner, t = owner[order], t[order]
+
+            # Środki kolejnych kawałków tego samego odcinka
+            same = owner[1:] == owner[:-1]
+            owner = owner[1:][same]
+            mid = (t[1:][same] + t[:-1][same]) / 2
+            cell = np.clip(np.floor(a[owner] + mid[:, None] * d[owner]), 0, self.shape - 1).astype(np.int64)
+            blocked = self.occupied(cell[:, 0], cell[:, 1])
+            hit[seg[np.unique(owner[blocked])]] = True
+        return hit
+
+    def distance(self, points, cells=RASTER_DISTANCE_CELLS):
+        """Odległość ze znakiem od granicy zajętości w oknie ``cells`` komórek -> (M,).
+
+        Wynik jest obcięty do ``cells * resolution`` - dalej okno nie sięga.
+        """
+        points = np.asarray(points, dtype=float)
+        g = (points[:, :2] - self.origin) / self.resolution
+        center = np.floor(g).astype(np.int64)
+        off = np.arange(-cells, cells + 1)
+        ox, oy = [o.ravel() for o in np.meshgrid(off, off)]
+        cx, cy = center[:, 0, None] + ox, center[:, 1, None] + oy
+
+        def occupancy(ix, iy):
+            valid = (ix >= 0) & (ix < self.shape[0]) & (iy >= 0) & (iy < self.shape[1])
+            occ = np.zeros(ix.shape, dtype=bool)
+            occ[valid] = self.occupied(ix[valid], iy[valid])
+            return occ
+
+        occ = occupancy(cx, cy)
+        inside = occupancy(center[:, 0], center[:, 1])
+        # Odległość punktu od prostokąta komórki sąsiedniej
+        dx = np.maximum(np.maximum(cx - g[:, 0, None], g[:, 0, None] - (cx + 1)), 0)
+        dy = np.maximum(np.maximum(cy - g[:, 1, None], g[:, 1, None] - (cy + 1)), 0)
+        dist = np.where(occ != inside[:, None], np.hypot(dx, dy), np.inf).min(axis=1)
+        dist = np.minimum(dist, cells) * self.resolution
+        return np.where(inside, -dist, dist)
+
+
+class CompiledObstacles:
+    """Przeszkody w postaci tablic NumPy do zwektoryzowanych zapytań.
+
+    Zapytania przyjmują punkty 2D lub 3D. W 3D przeszkoda z kluczem ``'top'``
+    jest walcem / prostopadłościanem od ziemi do tej wysokości, bez niego -
+    nieskończenie wysoka.
+    """
+
+    def __init__(self, obstacles):
+        circles = [o for o in obstacles if o['type'] == 'circle']
+        rects = [o for o in obstacles if o['type'] == 'rect']
+        polygons = [o for o in obstacles if o['type'] == 'polygon']
+        self.rasters = [o['raster'] for o in obstacles if o['type'] == 'raster']
+
+        self.fingerprint = obstacles_fingerprint(obstacles)
+        self.obstacles = list(obstacles)
+        self.centers = np.array([o['center'] for o in circles], dtype=float).reshape(-1, 2)
+        self.radii_sq = np.array([o['radius'] for o in circles], dtype=float) ** 2
+        self.rect_lo = np.array([(o['x'], o['y']) for o in rects], dtype=float).reshape(-1, 2)
+        self.rect_hi = self.rect_lo + np.array(
+            [(o['width'], o['height']) for o in rects], dtype=float).reshape(-1, 2)
+        self.circle_tops = np.array([o.get('top', np.inf) for o in circles], dtype=float)
+        self.rect_tops = np.array([o.get('top', np.inf) for o in rects], dtype=float)
+        self.polygons = PolygonIndex(polygons) if polygons else None
+        self.index = None
+        if len(circles) + len(rects) >= PRIMITIVE_INDEX_MIN:
+            self.index = PrimitiveIndex(self.centers, self.radii_sq, self.rect_lo, self.rect_hi)
+
+    def __len__(self):
+        return len(self.obstacles)
+
+    def contains(self, points):
+        """Sprawdza które punkty (..., 2) lub (..., 3) leżą w przeszkodach -> bool (...)."""
+        points = np.asarray(points, dtype=float)
+        inside = self._contains_primitives(points)
+        if self.polygons is not None:
+            inside |= self.polygons.contains(
+                points.reshape(-1, points.shape[-1])).reshape(points.shape[:-1])
+        for raster in self.rasters:
+            inside |= raster.contains(points.reshape(-1, points.shape[-1])).reshape(points.shape[:-1])
+        return inside
+
+    def _contains_primitives(self, points):
+        """Test punktów dla kół i prostokątów -> bool (...)."""
+        if self.index is not None:
+            return self._contains_indexed(points)
+        inside = np.zeros(points.shape[:-1], dtype=bool)
+        p = points[..., None, :2]
+        z = points[..., None, 2] if points.shape[-1] == 3 else None
+
+        if len(self.radii_sq):
+            hit = ((p - self.centers) ** 2).sum(axis=-1) < self.radii_sq
+            if z is not None:
+                hit &= z < self.circle_tops
+            inside |= hit.any(axis=-1)
+        if len(self.rect_lo):
+            hit = ((p >= self.rect_lo) & (p <= self.rect_hi)).all(axis=-1)
+            if z is not None:
+                hit &= z < self.rect_tops
+            inside |= hit.any(axis=-1)
+        return inside
+
+    def _contains_indexed(self, points):
+        """Test punktów przez siatkę PrimitiveIndex - tylko przeszkody z komórki punktu."""
+        flat = points.reshape(-1, points.shape[-1])
+        inside = np.zeros(len(flat), dtype=bool)
+        pt, prim = self.index.candidates(flat[:, :2])
+        p = flat[pt, :2]
+
+        circle = prim < self.index.num_circles
+        c, r = prim[circle], prim[~circle] - self.index.num_circles
+        hit = np.empty(len(prim), dtype=bool)
+        hit[circle] = ((p[circle] - self.centers[c]) ** 2).sum(axis=-1) < self.radii_sq[c]
+        hit[~circle] = ((p[~circle] >= self.rect_lo[r]) & (p[~circle] <= self.rect_hi[r])).all(axis=-1)
+        if flat.shape[-1] == 3:
+            tops = np.concatenate([self.circle_tops, self.rect_tops])
+            hit &= flat[pt, 2] < tops[prim]
+        inside[pt[hit]] = True
+        return inside.reshape(points.shape[:-1])
+
+    def distance(self, points, max_distance=None):
+        """Odległość ze znakiem od najbliższej przeszkody (ujemna wewnątrz) -> (...).
+
+        Liczona w rzucie poziomym - wysokość punktów 3D jest pomijana.
+        Punkty przetwarzane są porcjami, a przy mapach z indeksem sprawdzane
+        są tylko przeszkody z pobliskich komórek. ``max_distance`` obcina
+        wynik i ogranicza przeszukiwanie.
+        """
+        points = np.asarray(points, dtype=float)
+        flat = points.reshape(-1, points.shape[-1])
+        dist = np.empty(len(flat))
+        for s in range(0, len(flat), DISTANCE_CHUNK):
+            p = flat[s:s + DISTANCE_CHUNK]
+            d = np.full(len(p), np.inf)
+            if len(self.radii_sq) or len(self.rect_lo):
+                if self.index is not None:
+                    d = self._distance_indexed(p[:, :2], max_distance)
+                else:
+                    d = self._distance_primitives(p[:, :2])
+            if self.polygons is not None:
+                d = np.minimum(d, self.polygons.distance(p))
+            for raster in self.rasters:
+                d = np.minimum(d, raster.distance(p))
+            dist[s:s + DISTANCE_CHUNK] = d
+        if max_distance is not None:
+            dist = np.minimum(dist, max_distance)
+        return dist.reshape(points.shape[:-1])
+
+    def _distance_primitives(self, p, prim=None):
+        """Odległość punktów (M, 2) od kół i prostokątów -> (M,).
+
+        Bez ``prim`` - minimum po wszystkich przeszkodach, z ``prim`` (M,) -
+        odległość każdego punktu od jednej przeszkody (indeksy jak w PrimitiveIndex).
+        """
+        num_circles = len(self.centers)
+        if prim is None:
+            prim = np.arange(num_circles + len(self.rect_lo))
+            p = p[:, None, :]
+        circle = prim < num_circles
+        c, r = prim[circle], prim[~circle] - num_circles
+
+        d = np.empty(np.broadcast_shapes(p.shape[:-1], prim.shape))
+        pc = np.broadcast_to(p, d.shape + (2,))[..., circle, :]
+        d[..., circle] = np.sqrt(((pc - self.centers[c]) ** 2).sum(axis=-1)) - np.sqrt(self.radii_sq[c])
+        q = np.broadcast_to(p, d.shape + (2,))[..., ~circle, :]
+        lo, hi = self.rect_lo[r], self.rect_hi[r]
+        outside = np.maximum(np.maximum(lo - q, q - hi), 0)
+        inside = np.minimum(q - lo, hi - q).min(axis=-1)
+        d[..., ~circle] = np.where(inside >= 0, -inside, np.sqrt((outside ** 2).sum(axis=-1)))
+        return d.min(axis=-1) if d.ndim == 2 else d
+
+    def _distance_indexed(self, p, max_distance=None):
+        """Odległość punktów (M, 2) od kół i prostokątów przez PrimitiveIndex -> (M,).
+
+        Promień przeszukania rośnie dwukrotnie od rozmiaru komórki; wynik punktu
+        jest dokładny, gdy najbliższa przeszkoda leży w promieniu. Gdy promień
+        obejmowałby większość siatki, pozostałe punkty liczone są wprost.
+        """
+        index = self.index
+        dist = np.full(len(p), np.inf)
+        todo = np.arange(len(p))
+        radius = index.cell
+        while len(todo):
+            if (2 * radius / index.cell + 1) ** 2 >= index.shape.prod():
+                dist[todo] = self._distance_primitives(p[todo])
+                break
+            pt, prim = index.near(p[todo], radius)
+            if len(pt):
+                d = self._distance_primitives(p[todo[pt]], prim)
+                first = np.flatnonzero(np.r_[True, pt[1:] != pt[:-1]])
+                owner = todo[pt[first]]
+                dist[owner] = np.minimum(dist[owner], np.minimum.reduceat(d, first))
+            if max_distance is not None and radius >= max_distance:
+                break
+            todo = todo[dist[todo] > radius]
+            radius *= 2
+        return dist
+
+    def segments_blocked(self, a, b):
+        """Sprawdza które odcinki a->b (..., 2) przecinają przeszkody -> bool (...).
+
+        Koła i prostokąty sprawdzane są próbkami jak w is_line_intersecting_obstacle,
+        wielokąty - dokładnym testem przecięcia krawędzi, rastry - przejściem DDA.
+        """
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        t = (np.arange(1, SEGMENT_CHECKS) / SEGMENT_CHECKS)[:, None]
+        samples = a[..., None, :] + t * (b - a)[..., None, :]
+        blocked = self._contains_primitives(samples).any(axis=-1)
+        if self.polygons is not None:
+            a, b = np.broadcast_arrays(a, b)
+            d = a.shape[-1]
+            blocked |= self.polygons.segments_hit(
+                a.reshape(-1, d), b.reshape(-1, d)).reshape(a.shape[:-1])
+        for raster in self.rasters:
+            a, b = np.broadcast_arrays(a, b)
+            d = a.shape[-1]
+            blocked |= raster.segments_hit(a.reshape(-1, d), b.reshape(-1, d)).reshape(a.shape[:-1])
+        return blocked
+
+
+def obstacles_bounds(obstacles):
+    """Prostokąt otaczający listę przeszkód -> (lo, hi) lub None dla pustej listy."""
+    if not obstacles:
+        return None
+    lo, hi = [], []
+    for o in obstacles:
+        if o['type'] == 'circle':
+            c, r = np.asarray(o['center'], dtype=float), o['radius']
+            lo.append(c - r)
+            hi.append(c + r)
+        elif o['type'] == 'rect':
+            lo.append([o['x'], o['y']])
+            hi.append([o['x'] + o['width'], o['y'] + o['height']])
+        elif o['type'] == 'polygon':
+            v = np.asarray(o['vertices'], dtype=float)
+            lo.append(v.min(axis=0))
+            hi.append(v.max(axis=0))
+        elif o['type'] == 'raster':
+            r_lo, r_hi = o['raster'].bounds
+            lo.append(r_lo)
+            hi.append(r_hi)
+    return np.min(lo, axis=0), np.max(hi, axis=0)
+
+
+def segments_touch_bounds(paths, bounds):
+    """Które trasy (N, W, 2) mają odcinek, którego prostokąt otaczający przecina ``bounds``."""
+    paths = np.asarray(paths, dtype=float)
+    if bounds is None:
+        return np.zeros(paths.shape[0], dtype=bool)
+    lo, hi = bounds
+    a, b = paths[:, :-1, :2], paths[:, 1:, :2]
+    seg_lo, seg_hi = np.minimum(a, b), np.maximum(a, b)
+    overlap = ((seg_lo <= hi) & (seg_hi >= lo)).all(axis=-1)
+    return overlap.any(axis=-1)
+
+
+# Ostatnio używane mapy (LRU) - usługa kompiluje mapy od klientów, więc cache musi mieć limit
+COMPILED_CACHE_SIZE = 32
+_COMPILED_CACHE = OrderedDict()
+_COMPILED_LOCK = threading.Lock()
+
+
+def compile_obstacles(obstacles):
+    """Kompiluje listę przeszkód (z cache LRU po skrócie zawartości)."""
+    if isinstance(obstacles, CompiledObstacles):
+        return obstacles
+    key = obstacles_fingerprint(obstacles)
+    with _COMPILED_LOCK:
+        compiled = _COMPILED_CACHE.get(key)
+        if compiled is not None:
+            _COMPILED_CACHE.move_to_end(key)
+            return compiled
+    # Kompilacja poza blokadą - inne wątki nie czekają na dużą mapę
+    compiled = CompiledObstacles(obstacles)
+    with _COMPILED_LOCK:
+        compiled = _COMPILED_CACHE.setdefault(key, compiled)
+        _COMPILED_CACHE.move_to_end(key)
+        while len(_COMPILED_CACHE) > COMPILED_CACHE_SIZE:
+            _COMPILED_CACHE.popitem(last=False)
+    return compiled
+
+
+def path_lengths(paths):
+    """Długości tras (N, W, 2) -> (N,)."""
+    paths = np.asarray(paths, dtype=float)
+    return np.sqrt((np.diff(paths, axis=-2) ** 2).sum(axis=-1)).sum(axis=-1)
+
+
+def climb_heights(paths):
+    """Suma wznoszeń tras 3D (N, W, 3) -> (N,)."""
+    return np.maximum(np.diff(np.asarray(paths, dtype=float)[..., 2], axis=-1), 0).sum(axis=-1)
+
+
+def pad_paths(paths):
+    """Trasy różnej długości -> (tablica (N, W_max, D) dopełniona ostatnim punktem, długości (N,)).
+
+    Dopełnienie powtarza metę, więc dodatkowe odcinki mają zerową długość.
+    """
+    lengths = np.array([len(p) for p in paths])
+    flat = np.concatenate([np.asarray(p, dtype=float) for p in paths])
+    offsets = np.cumsum(lengths) - lengths
+    idx = offsets[:, None] + np.minimum(np.arange(lengths.max()), lengths[:, None] - 1)
+    return flat[idx], lengths
+
+
+def _segments_blocked_split(geometry, paths, max_segment):
+    """segments_blocked z odcinkami dzielonymi na kawałki nie dłuższe niż ``max_segment``."""
+    a = paths[..., :-1, :].reshape(-1, paths.shape[-1])
+    step = np.diff(paths, axis=-2).reshape(-1, paths.shape[-1])
+    pieces = np.maximum(np.ceil(np.sqrt((step ** 2).sum(axis=-1)) / max_segment), 1).astype(int)
+    seg, k = expand_ranges(np.zeros(len(a), dtype=int), pieces)
+    piece = step[seg] / pieces[seg, None]
+    start = a[seg] + k[:, None] * piece
+    hit = geometry.segments_blocked(start, start + piece)
+    blocked = np.logical_or.reduceat(hit, np.cumsum(pieces) - pieces) if len(hit) else hit
+    return blocked.reshape(paths.shape[:-2] + (paths.shape[-2] - 1,))
+
+
+def evaluate_paths(paths, geometry, wind_speed, wind_direction, lengths=None, max_segment=None):
+    """Zwektoryzowany fitness populacji tras (N, W, 2) -> (N,).
+
+    Ta sama funkcja celu co evaluate_fitness: długość + 100 za każdy
+    kolidujący odcinek + 0.5 * dryf wiatru w każdym punkcie. Dla tras 3D
+    (N, W, 3) dochodzi koszt wznoszenia. ``lengths`` (N,) to liczby
+    waypointów tras dopełnionych przez pad_paths - odcinki dopełnienia
+    są pomijane. ``max_segment`` dzieli dłuższe odcinki na kawałki przy
+    sprawdzaniu kolizji, żeby trasy z kilkoma długimi odcinkami nie
+    przeskakiwały między próbkami przez cienkie przeszkody.
+    """
+    paths = np.asarray(paths, dtype=float)
+    if max_segment is None:
+        blocked = geometry.segments_blocked(paths[..., :-1, :], paths[..., 1:, :])
+    else:
+        blocked = _segments_blocked_split(geometry, paths, max_segment)
+    count = paths.shape[-2]
+    if lengths is not None:
+        count = np.asarray(lengths)
+        blocked &= np.arange(paths.shape[-2] - 1) < count[..., None] - 1
+
+    wind_rad = np.radians(wind_direction)
+    drift = np.hypot(wind_speed * np.cos(wind_rad), wind_speed * np.sin(wind_rad))
+
+    fitness = (path_lengths(paths)
+               + OBSTACLE_PENALTY * blocked.sum(axis=-1)
+               + WIND_PENALTY_WEIGHT * drift * count)
+    if paths.shape[-1] == 3:
+        fitness = fitness + CLIMB_PENALTY_WEIGHT * climb_heights(paths)
+    return fitness
+
+
+def resample_path(path, num_waypoints):
+    """Przepróbkowuje trasę do ``num_waypoints`` punktów równomiernie po długości."""
+    path = np.asarray(path, dtype=float)
+    seg = np.sqrt((np.diff(path, axis=0) ** 2).sum(axis=1))
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    if s[-1] == 0:
+        return np.repeat(path[:1], num_waypoints, axis=0)
+    targets = np.linspace(0.0, s[-1], num_waypoints)
+    return np.stack([np.interp(targets, s, path[:, d]) for d in range(path.shape[1])], axis=1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Typy osobników DEAP (FitnessMin, Individual) definiowane raz na proces.
+Nie używamy ``deap.creator`` - jego klasy są globalne i każde
+``setup_deap`` je kasowało i tworzyło od nowa, więc dwa GA w jednym
+procesie (wątki, usługa asyncio) psuły sobie typy. Klasy tworzone są
+leniwie przy pierwszym odwołaniu (``individuals.Individual``), więc
+import nie ładuje DEAP, a pickle odnajduje je pod stałą nazwą.
+"""
+
+import pickle
+import threading
+
+_LOCK = threading.Lock()
+_TYPES = {}
+_NAMES = ('FitnessMin', 'Individual')
+
+
+def _define_types():
+    """Tworzy klasy FitnessMin i Individual (raz, pod blokadą)"""
+    with _LOCK:
+        if _TYPES:
+            return _TYPES
+        from deap import base
+
+        class FitnessMin(base.Fitness):
+            """Fitness minimalizowany (jedno kryterium)"""
+            weights = (-1.0,)
+
+        class Individual(list):
+            """Trasa jako lista waypointów z atrybutem ``fitness``"""
+
+            def __init__(self, iterable=()):
+                super().__init__(iterable)
+                self.fitness = FitnessMin()
+
+        for cls in (FitnessMin, Individual):
+            cls.__module__ = __name__
+            cls.__qualname__ = cls.__name__
+        _TYPES.update(FitnessMin=FitnessMin, Individual=Individual)
+        return _TYPES
+
+
+def __getattr__(name):
+    if name in _NAMES:
+        return _define_types()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _legacy_create(name, base, dct):
+    """Zamiennik ``deap.creator.meta_create`` - zwraca typ tego modułu zamiast tworzyć globalną klasę"""
+    if name not in _NAMES:
+        raise pickle.UnpicklingError(f"Nieznana klasa deap.creator: {name}")
+    return _define_types()[name]
+
+
+class ResultsUnpickler(pickle.Unpickler):
+    """Unpickler zapisanych wyników - klasy z deap.creator zamienia na typy tego modułu.
+
+    DEAP zapisuje swoje klasy jako wywołanie ``meta_create``, które przy
+    odczycie ponownie tworzyłoby globalne klasy w ``deap.creator``.
+    """
+
+    def find_class(self, module, name):
+        if module == 'deap.creator':
+            if name == 'meta_create':
+                return _legacy_create
+            if name in _NAMES:
+                return _define_types()[name]
+        return super().find_class(module, name)
+
+
+def load_results(path):
+    """Wczytuje wyniki z pliku pickle, także zapisane przed zmianą typów osobników"""
+    with open(path, 'rb') as f:
+        return ResultsUnpickler(f).load()
@@ -43,6 +43,15 @@ def interactive_menu():
     print("OPTYMALIZACJA TRASY DRONA - MODE INTERAKTYWNY")
     print("=" * 70)
 
+    # Scenariusz z pliku (mapa, wiatr, start i meta) zamiast stałych modułu
+    print("\n🗺️  SCENARIUSZ\n")
+    scenario = None
+    scenario_path = input("Plik scenariusza JSON/GeoJSON [domyślna mapa]: ").strip()
+    if scenario_path:
+        from scenario import load_scenario
+        scenario = load_scenario(scenario_path)
+        print(f"✓ Scenariusz {scenario.name or scenario_path}: {len(scenario.obstacles)} przeszkód")
+
     print("\n📊 PARAMETRY ALGORYTMU GENETYCZNEGO\n")
 
     # Populacja
@@ -72,14 +81,16 @@ def interactive_menu():
     # Wiatr
     print("\n🌬️  PARAMETRY WIATRU\n")
 
+    default_speed = scenario.wind_speed if scenario else 5.0
+    default_direction = int(scenario.wind_direction) if scenario else 45
     wind_speed = input_float(
-        "Prędkość wiatru [5.0]: ",
-        default=5.0
+        f"Prędkość wiatru [{default_speed}]: ",
+        default=default_speed
     )
 
     wind_direction = input_integer(
-        "Kierunek wiatru w stopniach [45]: ",
-        default=45
+        f"Kierunek wiatru w stopniach [{default_direction}]: ",
+        default=default_direction
     )
 
     # Potwierdzenie
@@ -104,7 +115,8 @@ def interactive_menu():
         'mutation_rate': mut,
         'crossover_prob': cross,
         'wind_speed': wind_speed,
-        'wind_direction': wind_direction
+        'wind_direction': wind_direction,
+        'scenario': scenario
     }
 
 
@@ -114,11 +126,15 @@ def run_with_custom_params(params):
     print("🚀 URUCHAMIANIE ALGORYTMU GENETYCZNEGO")
     print("=" * 70 + "\n")
 
+    kwargs = params['scenario'].engine_kwargs() if params.get('scenario') else {}
+    # Wiatr podany przez użytkownika (domyślnie wiatr scenariusza)
+    kwargs.update(wind_speed=params['wind_speed'], wind_direction=params['wind_direction'])
     ga = GeneticAlgorithm(
         population_size=params['population_size'],
         generations=params['generations'],
         mutation_rate=params['mutation_rate'],
-        crossover_prob=params['crossover_prob']
+        crossover_prob=params['crossover_prob'],
+        **kwargs
     )
 
     result = ga.run()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planowanie wsadowe - wiele misji (start, meta) na wspólnej mapie.
+Przeszkody kompilowane są raz na proces roboczy, a misje
+optymalizowane równolegle w puli procesów.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithms.cma_es import CMAES
+from algorithms.differential_evolution import DifferentialEvolution
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.nsga2 import NSGA2
+from algorithms.pso import ParticleSwarmOptimization
+from algorithms.simulated_annealing import SimulatedAnnealing
+from drone_path_optimization import OBSTACLES
+from geometry import compile_obstacles, evaluate_paths
+from random_streams import spawn_seeds
+
+ALGORITHMS = {
+    'ga': GeneticAlgorithm,
+    'pso': ParticleSwarmOptimization,
+    'sa': SimulatedAnnealing,
+    'de': DifferentialEvolution,
+    'cmaes': CMAES,
+    'nsga2': NSGA2,
+}
+
+# Skompilowana mapa procesu roboczego (ustawiana przez _init_worker)
+_WORKER_GEOMETRY = None
+
+
+def _init_worker(obstacles):
+    """Inicjalizuje proces roboczy - kompiluje przeszkody raz."""
+    global _WORKER_GEOMETRY
+    _WORKER_GEOMETRY = compile_obstacles(obstacles)
+
+
+def plan_mission(mission, algorithm='pso', geometry=None, **params):
+    """Optymalizuje jedną misję i zwraca słownik wyniku."""
+    if geometry is None:
+        geometry = _WORKER_GEOMETRY if _WORKER_GEOMETRY is not None else compile_obstacles(OBSTACLES)
+    start, goal = mission
+
+    t0 = time.perf_counter()
+    algo = ALGORITHMS[algorithm](start=start, goal=goal, obstacles=geometry,
+                                 verbose=False, **params)
+    result = algo.run()
+    elapsed = time.perf_counter() - t0
+
+    # Zwykłe listy - osobniki DEAP nie przechodzą przez pickle między procesami
+    best = [[float(c) for c in p] for p in result['best_individual']]
+    fitness = float(evaluate_paths([best], geometry, algo.wind_speed, algo.wind_direction)[0])
+    return {
+        'start': list(start),
+        'goal': list(goal),
+        'algorithm': result['algorithm'],
+        'best_individual': best,
+        'fitness': fitness,
+        'evaluations': result['evaluations'],
+        'time': elapsed,
+    }
+
+
+def _plan_task(task):
+    """Zadanie dla puli procesów."""
+    mission, algorithm, params = task
+    return plan_mission(mission, algorithm, **params)
+
+
+def plan_missions(missions, algorithm='pso', obstacles=None, workers=None, seed=None, **params):
+    """Planuje listę misji [(start, meta), ...] na wspólnej mapie.
+
+    ``workers=0`` uruchamia misje szeregowo w bieżącym procesie,
+    ``None`` używa wszystkich rdzeni. Wyniki są w kolejności misji.
+    Każda misja dostaje własny strumień losowy z ``seed`` (SeedSequence.spawn),
+    więc wyniki nie zależą od liczby procesów.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Nieznany algorytm: {algorithm!r} (dostępne: {', '.join(ALGORITHMS)})")
+    if obstacles is None:
+        obstacles = OBSTACLES
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(missions))
+
+    seeds = spawn_seeds(seed, len(missions))
+    if workers <= 1:
+        geometry = compile_obstacles(obstacles)
+        return [plan_mission(m, algorithm, geometry=geometry, seed=s, **params)
+                for m, s in zip(missions, seeds)]
+
+    tasks = [(m, algorithm, dict(params, seed=s)) for m, s in zip(missions, seeds)]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(obstacles,)) as pool:
+        return list(pool.map(_plan_task, tasks, chunksize=chunksize))
+
+
+def main():
+    """Przykład: kilka dostaw na domyślnej mapie"""
+    rng = np.random.default_rng()
+    missions = [(list(rng.uniform(0, 20, 2)), list(rng.uniform(80, 100, 2))) for _ in range(8)]
+
+    t0 = time.perf_counter()
+    results = plan_missions(missions, algorithm='pso', population_size=30, generations=40)
+    print(f"Zaplanowano {len(results)} misji w {time.perf_counter() - t0:.2f}s")
+    for r in results:
+        print(f"  ({r['start'][0]:.1f}, {r['start'][1]:.1f}) -> "
+              f"({r['goal'][0]:.1f}, {r['goal'][1]:.1f}): fitness={r['fitness']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
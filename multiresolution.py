@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Optymalizacja od zgrubnej do gęstej siatki waypointów.
+Najpierw optymalizowane są trasy z kilkoma waypointami, potem cała
+populacja jest zagęszczana (punkty wstawiane na odcinkach, z małym
+zaburzeniem) i optymalizacja trwa z dłuższym genomem - aż do docelowej
+liczby waypointów.
+"""
+
+import numpy as np
+
+from algorithms.cma_es import CMAES
+from algorithms.differential_evolution import DifferentialEvolution
+from drone_path_optimization import (
+    GRID_WIDTH, GENERATIONS, OBSTACLES, WIND_SPEED, WIND_DIRECTION
+)
+from geometry import WIND_PENALTY_WEIGHT, compile_obstacles, evaluate_paths
+from observers import (
+    ProgressPrinter, TargetFitness, notify_run_start, notify_run_end
+)
+from random_streams import make_rng
+from smoothing import smooth_result
+
+# Liczby waypointów kolejnych poziomów
+LEVELS = (4, 8, 16, 32, 64)
+ENGINES = {
+    'de': DifferentialEvolution,
+    'cmaes': CMAES,
+}
+
+
+def subdivide_paths(paths, num_waypoints, jitter=0.0, rng=None):
+    """Zagęszcza trasy (N, W, D) do ``num_waypoints`` punktów, zachowując ich kształt.
+
+    Nowe punkty rozdzielane są między odcinki proporcjonalnie do długości
+    i leżą na nich równomiernie; dotychczasowe waypointy zostają. Tylko
+    nowe punkty dostają szum o odchyleniu ``jitter`` × długość kawałka.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    paths = np.asarray(paths, dtype=float)
+    n, w = paths.shape[:2]
+    extra = num_waypoints - w
+    if extra < 0:
+        raise ValueError("Zagęszczanie nie może zmniejszyć liczby waypointów")
+
+    seg_len = np.sqrt((np.diff(paths, axis=1) ** 2).sum(axis=-1))
+    share = seg_len / np.maximum(seg_len.sum(axis=1, keepdims=True), 1e-12) * extra
+    counts = np.floor(share).astype(int)
+    # Metoda największych reszt - w sumie dokładnie ``extra`` punktów na trasę
+    missing = extra - counts.sum(axis=1)
+    order = np.argsort(-(share - counts), axis=1, kind='stable')
+    counts[np.arange(n)[:, None], order] += np.arange(w - 1) < missing[:, None]
+
+    result = np.empty((n, num_waypoints, paths.shape[2]))
+    for i in range(n):
+        # Parametr wzdłuż trasy: k + j / (c_k + 1) dla odcinka k
+        t = np.concatenate([k + np.arange(c + 1) / (c + 1) for k, c in enumerate(counts[i])]
+                           + [[w - 1]])
+        k = np.minimum(t.astype(int), w - 2)
+        f = (t - k)[:, None]
+        result[i] = paths[i, k] + f * (paths[i, k + 1] - paths[i, k])
+        if jitter:
+            new = t % 1 > 0
+            scale = (seg_len[i] / (counts[i] + 1))[k[new], None]
+            result[i, new] += rng.normal(0.0, 1.0, scale.shape[:1] + paths.shape[2:]) * jitter * scale
+    return result
+
+
+class ProgressiveRefinement:
+    """Optymalizacja trasy na kolejnych poziomach liczby waypointów.
+
+    Na każdym poziomie działa silnik ``engine`` (DE lub CMA-ES) przez
+    ``generations`` generacji. DE przenosi całą końcową populację,
+    CMA-ES - najlepszą trasę (średnią nowego rozkładu). Pierwszy osobnik
+    przeniesionej populacji to najlepsza trasa bez zaburzenia, więc
+    poziom nie pogarsza wyniku. ``target_fitness`` (na poziomie docelowym)
+    kończy bieg wcześniej.
+    """
+
+    def __init__(self, engine='de', levels=LEVELS, generations=GENERATIONS,
+                 population_size=None, jitter=0.1, target_fitness=None,
+                 start=None, goal=None, obstacles=None, initial_paths=None,
+                 observers=None, verbose=True, seeding=None, smooth=False, seed=None,
+                 wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION, **params):
+        if engine not in ENGINES:
+            raise ValueError(f"Nieznany silnik: {engine!r} (dostępne: {', '.join(ENGINES)})")
+        if list(levels) != sorted(levels) or levels[0] < 3:
+            raise ValueError("Poziomy muszą rosnąć i mieć co najmniej 3 waypointy")
+        self.engine = engine
+        self.levels = list(levels)
+        self.generations = generations
+        # None - domyślna liczebność silnika (POPULATION_SIZE dla DE, λ z wymiaru dla CMA-ES)
+        self.population_size = population_size
+        self.jitter = jitter
+        # Jeden generator dla zaburzeń i wszystkich poziomów (silniki losują z niego po kolei)
+        self.rng = make_rng(seed)
+        self.target_fitness = target_fitness
+        self.start = start
+        self.goal = goal
+        self.geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        self.initial_paths = list(initial_paths or [])
+        self.seeding = seeding
+        self.smooth = smooth
+        # Pozostałe parametry silnika (np. F, CR, strategy, sigma0)
+        self.params = params
+        self.observers = list(observers or [])
+        self.verbose = verbose
+        self.best_fitness = []
+        self.avg_fitness = []
+        self.evaluations = 0
+        self.level_stats = []
+
+    def _wind_offset(self, num_waypoints):
+        """Różnica składnika wiatru fitness między poziomem a poziomem docelowym"""
+        wind_rad = np.radians(self.wind_direction)
+        drift = np.hypot(self.wind_speed * np.cos(wind_rad), self.wind_speed * np.sin(wind_rad))
+        return WIND_PENALTY_WEIGHT * drift * (self.levels[-1] - num_waypoints)
+
+    def _carry(self, algo, result, num_waypoints):
+        """Trasy przenoszone na poziom ``num_waypoints``: najlepsza bez szumu, reszta z szumem"""
+        population = getattr(algo, 'population', None)
+        if population is None:
+            paths = np.asarray([result['best_individual']], dtype=float)
+        else:
+            order = np.argsort(algo.fitnesses)
+            paths = population[order]
+        refined = subdivide_paths(paths, num_waypoints, self.jitter, self.rng)
+        refined[0] = subdivide_paths(paths[:1], num_waypoints)[0]
+        return refined.tolist()
+
+    def run(self):
+        """Uruchamia kolejne poziomy i zwraca wynik z poziomu docelowego"""
+        notify_run_start(self.observers, self)
+        seeds = self.initial_paths
+        target = None
+        best, best_fit = None, np.inf
+        for level, num_waypoints in enumerate(self.levels):
+            observers = list(self.observers)
+            if self.verbose:
+                observers.insert(0, ProgressPrinter(
+                    fmt=f"[{num_waypoints} wp] " + ProgressPrinter.DEFAULT_FORMAT))
+            if self.target_fitness is not None:
+                target = TargetFitness(self.target_fitness, self._wind_offset(num_waypoints))
+                observers.append(target)
+
+            params = dict(self.params)
+            if self.population_size is not None:
+                params['population_size'] = self.population_size
+            if self.engine == 'cmaes' and level > 0:
+                # Krok CMA-ES maleje z długością kawałków trasy - duży krok rozrywa gęstą trasę
+                params['sigma0'] = (params.get('sigma0', GRID_WIDTH * 0.1)
+                                    * (self.levels[0] - 1) / (num_waypoints - 1))
+            algo = ENGINES[self.engine](
+                generations=self.generations,
+                num_waypoints=num_waypoints, start=self.start, goal=self.goal,
+                obstacles=self.geometry, initial_paths=seeds, observers=observers,
+                verbose=False, seeding=self.seeding if level == 0 else None, seed=self.rng,
+                wind_speed=self.wind_speed, wind_direction=self.wind_direction, **params)
+            result = algo.run()
+
+            # Historia w skali poziomu docelowego - poziomy są porównywalne
+            offset = self._wind_offset(num_waypoints)
+            self.best_fitness += [f + offset for f in result['best_fitness']]
+            self.avg_fitness += [f + offset for f in result['avg_fitness']]
+            self.evaluations += result['evaluations'] + 1
+            # Najlepsza trasa wszystkich poziomów (na wypadek pogorszenia po zagęszczeniu)
+            fit = float(evaluate_paths([result['best_individual']], self.geometry,
+                                       self.wind_speed, self.wind_direction)[0]) + offset
+            if fit < best_fit:
+                best, best_fit = result['best_individual'], fit
+            self.level_stats.append({
+                'num_waypoints': num_waypoints,
+                'generations': len(result['best_fitness']),
+                'evaluations': result['evaluations'],
+                'best_fitness': fit,
+            })
+            if target is not None and target.reached:
+                break
+            if level + 1 < len(self.levels):
+                seeds = self._carry(algo, result, self.levels[level + 1])
+
+        # Trasa z wcześniejszego poziomu jest zagęszczana do docelowej liczby waypointów
+        best = subdivide_paths([best], self.levels[-1])[0]
+        result = {
+            'best_individual': best.tolist(),
+            'best_fitness': self.best_fitness,
+            'avg_fitness': self.avg_fitness,
+            'evaluations': self.evaluations,
+            'levels': self.level_stats,
+            'algorithm': f"Progressive {result['algorithm']}",
+        }
+        smooth_result(self, result)
+        notify_run_end(self.observers, self, result)
+        return result
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Obserwatorzy generacji - punkty rozszerzeń pętli algorytmów.
+Obserwator dostaje stan raz na generację, może zatrzymać bieg
+albo wstrzyknąć nowe osobniki do populacji.
+"""
+
+import pickle
+
+import numpy as np
+
+
+def _readonly(values):
+    """Zwraca tablicę tylko do odczytu (widok, jeśli to już ndarray)."""
+    view = np.asarray(values, dtype=float).view()
+    view.flags.writeable = False
+    return view
+
+
+class GenerationState:
+    """Stan jednej generacji przekazywany obserwatorom.
+
+    ``population`` i ``fitness`` to tablice tylko do odczytu budowane
+    leniwie - raz na generację i wspólne dla wszystkich obserwatorów.
+    Jeśli algorytm trzyma populację w ndarray, nie ma kopiowania.
+    """
+
+    def __init__(self, algorithm, generation, total_generations, population,
+                 fitnesses, best_fitness, evaluations, elapsed, info=None):
+        self.algorithm = algorithm
+        self.generation = generation
+        self.total_generations = total_generations
+        self.best_fitness = best_fitness
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+        self.info = info or {}
+        self.stop_requested = False
+        self.stop_reason = None
+        self.injected = []
+        self._population_src = population
+        self._fitness_src = fitnesses
+        self._population = None
+        self._fitness = None
+
+    @property
+    def population(self):
+        """Populacja jako tablica (N, W, 2) tylko do odczytu."""
+        if self._population is None:
+            self._population = _readonly(self._population_src)
+        return self._population
+
+    @property
+    def fitness(self):
+        """Fitness populacji jako tablica (N,) tylko do odczytu."""
+        if self._fitness is None:
+            self._fitness = _readonly(self._fitness_src)
+        return self._fitness
+
+    def request_stop(self, reason=None):
+        """Prosi algorytm o zakończenie po bieżącej generacji."""
+        self.stop_requested = True
+        self.stop_reason = reason
+
+    def inject(self, *individuals):
+        """Wstrzykuje osobniki (listy waypointów) w miejsce najgorszych."""
+        self.injected.extend(individuals)
+
+
+class GenerationObserver:
+    """Bazowa klasa obserwatora - wszystkie metody są opcjonalne."""
+
+    def on_run_start(self, algorithm):
+        pass
+
+    def on_generation(self, state):
+        pass
+
+    def on_run_end(self, algorithm, result):
+        pass
+
+
+def notify_run_start(observers, algorithm):
+    """Powiadamia obserwatorów o starcie biegu."""
+    for observer in observers:
+        observer.on_run_start(algorithm)
+
+
+def notify_generation(observers, state):
+    """Wywołuje obserwatorów dla generacji i zwraca stan."""
+    for observer in observers:
+        observer.on_generation(state)
+    return state
+
+
+def notify_run_end(observers, algorithm, result):
+    """Powiadamia obserwatorów o końcu biegu."""
+    for observer in observers:
+        observer.on_run_end(algorithm, result)
+
+
+class ProgressPrinter(GenerationObserver):
+    """Wypisuje postęp co ``every`` generacji."""
+
+    DEFAULT_FORMAT = "{algorithm} Gen {generation}/{total} - Best: {best:.2f}"
+
+    def __init__(self, every=20, fmt=DEFAULT_FORMAT):
+        self.every = every
+        self.fmt = fmt
+
+    def on_generation(self, state):
+        if state.generation % self.every != 0:
+            return
+        fields = dict(state.info)
+        fields.update(algorithm=state.algorithm, generation=state.generation,
+                      total=state.total_generations, best=state.best_fitness)
+        if '{mean' in self.fmt:
+            fields['mean'] = float(state.fitness.mean())
+        print(self.fmt.format(**fields))
+
+
+class EarlyStopping(GenerationObserver):
+    """Zatrzymuje bieg, gdy najlepszy fitness nie poprawia się przez ``patience`` generacji."""
+
+    def __init__(self, patience=30, min_delta=1e-6):
+        self.patience = patience
+        self.min_delta = min_delta
+        self._best = None
+        self._stale = 0
+
+    def on_run_start(self, algorithm):
+        self._best = None
+        self._stale = 0
+
+    def on_generation(self, state):
+        if self._best is None or state.best_fitness < self._best - self.min_delta:
+            self._best = state.best_fitness
+            self._stale = 0
+        else:
+            self._stale += 1
+            if self._stale >= self.patience:
+                state.request_stop(f"brak poprawy od {self.patience} generacji")
+
+
+class TargetFitness(GenerationObserver):
+    """Zatrzymuje bieg po osiągnięciu fitness ``target`` (po dodaniu ``offset``)."""
+
+    def __init__(self, target, offset=0.0):
+        self.target = target
+        self.offset = offset
+        self.reached = False
+
+    def on_run_start(self, algorithm):
+        self.reached = False
+
+    def on_generation(self, state):
+        if state.best_fitness + self.offset <= self.target:
+            self.reached = True
+            state.request_stop(f"osiągnięto fitness {self.target:.2f}")
+
+
+class Checkpoint(GenerationObserver):
+    """Zapisuje populację i fitness do pliku pickle co ``every`` generacji."""
+
+    def __init__(self, path, every=50):
+        self.path = path
+        self.every = every
+
+    def on_generation(self, state):
+        if state.generation % self.every != 0:
+            return
+        with open(self.path, 'wb') as f:
+            pickle.dump({
+                'algorithm': state.algorithm,
+                'generation': state.generation,
+                'population': np.array(state.population),
+                'fitness': np.array(state.fitness),
+                'best_fitness': state.best_fitness,
+            }, f)
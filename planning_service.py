@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokalna usługa planowania tras (HTTP na asyncio, tylko biblioteka standardowa).
+
+    POST /plan   {"scenario": {"obstacles": [...], "start": [x, y], "goal": [x, y]},
+                  "algorithm": "pso", "budget": {"generations": 100, "population_size": 50}}
+    GET  /stats  głębokość kolejki, liczniki i percentyle opóźnień
+    GET  /health
+
+Żądania trafiają do kolejki, a dyspozytory przekazują je do puli procesów
+roboczych. Procesy trzymają skompilowane mapy w cache (compile_obstacles),
+więc kolejne żądania na tej samej mapie nie kompilują jej ponownie.
+Identyczne żądania obsługiwane w tym samym czasie są łączone w jedno.
+Z ``threads=True`` (``--threads``) żądania wykonuje pula wątków jednego
+procesu - algorytmy nie współdzielą stanu (typy DEAP w ``individuals``).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from drone_path_optimization import OBSTACLES, GRID_WIDTH, GRID_HEIGHT
+from geometry import compile_obstacles
+from mission_planner import ALGORITHMS, plan_mission
+
+BUDGET_KEYS = ('generations', 'population_size')
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+def _execute_plan(obstacles, start, goal, algorithm, budget):
+    """Zadanie procesu roboczego - mapa pochodzi z cache procesu."""
+    geometry = compile_obstacles(obstacles)
+    return plan_mission((start, goal), algorithm, geometry=geometry, **budget)
+
+
+def normalize_request(payload):
+    """Waliduje żądanie planowania i uzupełnia wartości domyślne."""
+    if not isinstance(payload, dict):
+        raise ValueError("Żądanie musi być obiektem JSON")
+    scenario = payload.get('scenario') or {}
+    algorithm = payload.get('algorithm', 'pso')
+    budget = payload.get('budget') or {}
+
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Nieznany algorytm: {algorithm!r}")
+    unknown = set(budget) - set(BUDGET_KEYS)
+    if unknown:
+        raise ValueError(f"Nieznane pola budżetu: {', '.join(sorted(unknown))}")
+    if algorithm == 'sa':
+        budget = {k: v for k, v in budget.items() if k != 'population_size'}
+
+    return {
+        'obstacles': scenario.get('obstacles', OBSTACLES),
+        'start': list(scenario.get('start', [0, 0])),
+        'goal': list(scenario.get('goal', [GRID_WIDTH, GRID_HEIGHT])),
+        'algorithm': algorithm,
+        'budget': {k: int(v) for k, v in budget.items()},
+    }
+
+
+def request_key(request):
+    """Klucz łączenia identycznych żądań."""
+    payload = json.dumps(request, sort_keys=True, default=list)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class PlanningService:
+    """Usługa planowania z kolejką, pulą procesów i łączeniem żądań."""
+
+    def __init__(self, host='127.0.0.1', port=8765, workers=None, latency_window=1000,
+                 threads=False):
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        # Pula wątków zamiast procesów (wspólna pamięć i cache map)
+        self.threads = threads
+        self.latencies = deque(maxlen=latency_window)
+        self.completed = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._queue = None
+        self._inflight = {}
+        self._dispatchers = []
+        self._pool = None
+        self._server = None
+
+    async def start(self):
+        """Uruchamia pulę, dyspozytory i serwer HTTP."""
+        if self.threads:
+            self._pool = ThreadPoolExecutor(max_workers=max(1, self.workers))
+        elif self.workers > 0:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            # Tryb bez procesów (testy, debugowanie) - jeden wątek roboczy
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        self._queue = asyncio.Queue()
+        self._dispatchers = [asyncio.create_task(self._dispatch())
+                             for _ in range(max(1, self.workers))]
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Zatrzymuje serwer, dyspozytory i pulę."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    async def serve_forever(self):
+        """Uruchamia usługę do przerwania."""
+        await self.start()
+        kind = 'wątki' if self.threads else 'procesy'
+        print(f"Usługa planowania: http://{self.host}:{self.port} ({kind}: {self.workers})")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def submit(self, payload):
+        """Kolejkuje żądanie (lub dołącza do identycznego w toku) i czeka na wynik."""
+        request = normalize_request(payload)
+        key = request_key(request)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        await self._queue.put((key, request, time.perf_counter()))
+        return await asyncio.shield(future)
+
+    async def _dispatch(self):
+        """Pobiera żądania z kolejki i wykonuje je w puli."""
+        loop = asyncio.get_running_loop()
+        while True:
+            key, request, enqueued = await self._queue.get()
+            future = self._inflight[key]
+            try:
+                result = await loop.run_in_executor(
+                    self._pool, _execute_plan, request['obstacles'], request['start'],
+                    request['goal'], request['algorithm'], request['budget'])
+                self.completed += 1
+                future.set_result(result)
+            except Exception as e:
+                self.failed += 1
+                future.set_exception(e)
+            finally:
+                self.latencies.append(time.perf_counter() - enqueued)
+                del self._inflight[key]
+                self._queue.task_done()
+
+    def stats(self):
+        """Głębokość kolejki, liczniki i percentyle opóźnień [ms]."""
+        latency = {}
+        if self.latencies:
+            values = np.array(self.latencies) * 1000
+            for q in (50, 90, 99):
+                latency[f'p{q}'] = float(np.percentile(values, q))
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': len(self._inflight),
+            'completed': self.completed,
+            'coalesced': self.coalesced,
+            'failed': self.failed,
+            'latency_ms': latency,
+        }
+
+    async def _handle_connection(self, reader, writer):
+        """Obsługuje jedno połączenie HTTP/1.1 (jedno żądanie)."""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            status, response = await self._route(request_line, body)
+        except Exception as e:
+            status, response = 500, {'error': str(e)}
+
+        data = json.dumps(response).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + data)
+        await writer.drain()
+        writer.close()
+
+    async def _route(self, request_line, body):
+        """Kieruje żądanie do odpowiedniego endpointu."""
+        if len(request_line) < 2:
+            return 400, {'error': 'Niepoprawne żądanie HTTP'}
+        method, path = request_line[0], request_line[1]
+
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/stats':
+            return 200, self.stats()
+        if method == 'POST' and path == '/plan':
+            try:
+                payload = json.loads(body or b'{}')
+                return 200, await self.submit(payload)
+            except (ValueError, TypeError) as e:
+                return 400, {'error': str(e)}
+        return 404, {'error': f"Brak endpointu {method} {path}"}
+
+
+def run_service_in_thread(service):
+    """Uruchamia usługę w wątku w tle; zwraca funkcję zatrzymującą."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def runner():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start())
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(service.stop())
+        loop.close()
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return stop
+
+
+class PlanningClient:
+    """Lokalny klient usługi planowania."""
+
+    def __init__(self, host='127.0.0.1', port=8765, timeout=300):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = json.loads(response.read() or b'{}')
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {data.get('error')}")
+        return data
+
+    def plan(self, scenario=None, algorithm='pso', budget=None):
+        """Wysyła żądanie planowania i zwraca wynik."""
+        return self._request('POST', '/plan', {'scenario': scenario or {},
+                                               'algorithm': algorithm,
+                                               'budget': budget or {}})
+
+    def stats(self):
+        """Pobiera statystyki usługi."""
+        return self._request('GET', '/stats')
+
+
+def main():
+    """Uruchamia usługę z linii poleceń"""
+    parser = argparse.ArgumentParser(description="Lokalna usługa planowania tras drona")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--threads', action='store_true', help="pula wątków zamiast procesów")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(PlanningService(args.host, args.port, args.workers,
+                                    threads=args.threads).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
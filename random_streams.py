@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Powtarzalne strumienie liczb losowych.
+Każdy algorytm przyjmuje ``seed`` (int, ``np.random.SeedSequence`` albo
+gotowy ``np.random.Generator``) i losuje tylko z własnego generatora -
+globalne ``random`` i ``np.random`` nie są używane. Zadania równoległe
+dostają niezależne strumienie potomne (``SeedSequence.spawn``), więc wynik
+nie zależy od liczby procesów roboczych ani kolejności wykonania.
+"""
+
+import random
+
+import numpy as np
+
+
+def make_rng(seed=None):
+    """Generator NumPy z ziarna (None - losowe ziarno z systemu)"""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def python_rng(rng):
+    """``random.Random`` zasilany z generatora NumPy - do operatorów na listach
+
+    Pojedyncza liczba z ``random.Random`` jest ok. 10 razy tańsza niż z
+    ``np.random.Generator``, a operatory GA/PSO/SA losują po jednej.
+    """
+    return random.Random(int(rng.integers(2 ** 63)))
+
+
+def spawn_seeds(seed, n):
+    """``n`` niezależnych ziaren potomnych (SeedSequence) dla zadań równoległych"""
+    if isinstance(seed, np.random.Generator):
+        # Generator nie udostępnia spawn w NumPy < 1.25 - entropia z jego strumienia
+        seed = np.random.SeedSequence(seed.integers(2 ** 63, size=4))
+    elif not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scenariusze z plików - mapa, wiatr, start i meta zamiast stałych modułu.
+Przeszkody podaje się jako listę słowników (jak OBSTACLES) albo kolekcję
+obiektów GeoJSON. Skompilowana geometria (z indeksami) i pole odległości
+zapisywane są na dysku pod skrótem zawartości pliku, więc kolejne
+uruchomienia na tej samej mapie pomijają przetwarzanie wstępne.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from drone_path_optimization import (
+    GRID_WIDTH, GRID_HEIGHT, MAX_ALTITUDE, WIND_SPEED, WIND_DIRECTION
+)
+from geometry import CompiledObstacles, evaluate_paths, expand_ranges
+
+DEFAULT_CACHE_DIR = os.path.join('output', 'scenario_cache')
+# Zmiana formatu skompilowanych danych unieważnia stare wpisy cache
+CACHE_VERSION = 1
+# Pole odległości: rozdzielczość siatki i odległość, powyżej której jest obcinane
+FIELD_RESOLUTION = 1.0
+FIELD_MAX_DISTANCE = 20.0
+
+
+class DistanceField:
+    """Obcięte pole odległości ze znakiem na regularnej siatce.
+
+    Wartości w węzłach siatki, między węzłami - interpolacja dwuliniowa.
+    Poza mapą używany jest najbliższy węzeł brzegowy.
+    """
+
+    def __init__(self, values, origin, resolution, max_distance):
+        self.values = values
+        self.origin = np.asarray(origin, dtype=float)
+        self.resolution = resolution
+        self.max_distance = max_distance
+
+    def __call__(self, points):
+        """Odległość od przeszkód w punktach (..., 2) lub (..., 3) -> (...)."""
+        points = np.asarray(points, dtype=float)
+        ny, nx = self.values.shape
+        g = (points[..., :2] - self.origin) / self.resolution
+        g = np.clip(g, 0, [nx - 1, ny - 1])
+        i0 = np.minimum(g.astype(int), [nx - 2, ny - 2])
+        f = g - i0
+        x0, y0 = i0[..., 0], i0[..., 1]
+        fx, fy = f[..., 0], f[..., 1]
+        v = self.values
+        return ((v[y0, x0] * (1 - fx) + v[y0, x0 + 1] * fx) * (1 - fy)
+                + (v[y0 + 1, x0] * (1 - fx) + v[y0 + 1, x0 + 1] * fx) * fy)
+
+
+def compute_distance_field(geometry, width=GRID_WIDTH, height=GRID_HEIGHT,
+                           resolution=FIELD_RESOLUTION, max_distance=FIELD_MAX_DISTANCE):
+    """Pole odległości mapy ``width`` x ``height`` obcięte do ``max_distance``.
+
+    Każde koło i prostokąt liczone jest tylko w węzłach swojego prostokąta
+    otaczającego poszerzonego o ``max_distance`` - koszt zależy od liczby
+    przeszkód i ich rozmiaru, a nie od iloczynu przeszkód i węzłów.
+    Wielokąty liczone są w całości przez PolygonIndex.distance.
+    """
+    xs = np.arange(0.0, width + 1e-9, resolution)
+    ys = np.arange(0.0, height + 1e-9, resolution)
+    nx, ny = len(xs), len(ys)
+    values = np.full(ny * nx, float(max_distance))
+
+    radii = np.sqrt(geometry.radii_sq)[:, None]
+    lo = np.concatenate([geometry.centers - radii, geometry.rect_lo]) - max_distance
+    hi = np.concatenate([geometry.centers + radii, geometry.rect_hi]) + max_distance
+    c_lo = np.clip(np.ceil(lo / resolution).astype(int), 0, [nx, ny])
+    c_hi = np.clip(np.floor(hi / resolution).astype(int) + 1, 0, [nx, ny])
+    width_cells = np.maximum(c_hi[:, 0] - c_lo[:, 0], 0)
+    num_circles = len(geometry.centers)
+
+    # Pary (przeszkoda, węzeł) przetwarzane porcjami przeszkód
+    counts = width_cells * np.maximum(c_hi[:, 1] - c_lo[:, 1], 0)
+    bounds = np.searchsorted(np.cumsum(counts), np.arange(1, counts.sum() // 2 ** 22 + 1) * 2 ** 22)
+    for s, e in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(lo)]])):
+        prim, k = expand_ranges(np.zeros(e - s, dtype=int), counts[s:e])
+        prim += s
+        ix = c_lo[prim, 0] + k % width_cells[prim]
+        iy = c_lo[prim, 1] + k // width_cells[prim]
+        p = np.stack([xs[ix], ys[iy]], axis=1)
+
+        d = np.empty(len(prim))
+        circle = prim < num_circles
+        c = prim[circle]
+        d[circle] = (np.sqrt(((p[circle] - geometry.centers[c]) ** 2).sum(axis=1))
+                     - np.sqrt(geometry.radii_sq[c]))
+        r = prim[~circle] - num_circles
+        q = p[~circle]
+        outside = np.maximum(np.maximum(geometry.rect_lo[r] - q, q - geometry.rect_hi[r]), 0)
+        inside = np.minimum(q - geometry.rect_lo[r], geometry.rect_hi[r] - q).min(axis=1)
+        d[~circle] = np.where(inside >= 0, -inside, np.sqrt((outside ** 2).sum(axis=1)))
+        # Minimum po węzłach: sortowanie i reduceat zamiast wolnego np.minimum.at
+        node = iy * nx + ix
+        order = np.argsort(node, kind='stable')
+        node, d = node[order], d[order]
+        first = np.flatnonzero(np.diff(node, prepend=-1))
+        values[node[first]] = np.minimum(values[node[first]], np.minimum.reduceat(d, first))
+
+    if geometry.polygons is not None:
+        grid = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+        values = np.minimum(values, geometry.polygons.distance(grid))
+    values = np.minimum(values, max_distance).reshape(ny, nx)
+    return DistanceField(values, (0.0, 0.0), resolution, max_distance)
+
+
+def _geojson_obstacles(collection):
+    """Obiekty GeoJSON -> lista przeszkód w formacie OBSTACLES.
+
+    Point z ``properties.radius`` to koło, Polygon i MultiPolygon -
+    wielokąty (tylko pierścień zewnętrzny). ``properties.top`` to
+    wysokość przeszkody w trybie 3D.
+    """
+    obstacles = []
+    for feature in collection.get('features', []):
+        geom = feature['geometry']
+        props = feature.get('properties') or {}
+        extra = {'top': float(props['top'])} if 'top' in props else {}
+        if geom['type'] == 'Point':
+            if 'radius' not in props:
+                raise ValueError("Punkt GeoJSON wymaga properties.radius")
+            obstacles.append({'type': 'circle', 'center': list(geom['coordinates'][:2]),
+                              'radius': float(props['radius']), **extra})
+            continue
+        if geom['type'] == 'Polygon':
+            rings = [geom['coordinates'][0]]
+        elif geom['type'] == 'MultiPolygon':
+            rings = [polygon[0] for polygon in geom['coordinates']]
+        else:
+            raise ValueError(f"Nieznany typ geometrii: {geom['type']!r}")
+        for ring in rings:
+            ring = [list(p[:2]) for p in ring]
+            # GeoJSON zamyka pierścień powtórzeniem pierwszego wierzchołka
+            if len(ring) > 1 and ring[0] == ring[-1]:
+                ring = ring[:-1]
+            obstacles.append({'type': 'polygon', 'vertices': ring, **extra})
+    return obstacles
+
+
+def parse_scenario(data):
+    """Słownik scenariusza (wczytany JSON) -> słownik z polami ``Scenario``."""
+    if data.get('type') == 'FeatureCollection':
+        data = dict(data.get('properties') or {}, obstacles=data)
+    obstacles = data.get('obstacles', [])
+    if isinstance(obstacles, dict):
+        obstacles = _geojson_obstacles(obstacles)
+    grid = data.get('grid', {})
+    wind = data.get('wind', {})
+    width = float(grid.get('width', GRID_WIDTH))
+    height = float(grid.get('height', GRID_HEIGHT))
+    return {
+        'name': data.get('name', ''),
+        'width': width,
+        'height': height,
+        'max_altitude': float(grid.get('max_altitude', MAX_ALTITUDE)),
+        'wind_speed': float(wind.get('speed', WIND_SPEED)),
+        'wind_direction': float(wind.get('direction', WIND_DIRECTION)),
+        'start': [float(v) for v in data.get('start', [0, 0])],
+        'goal': [float(v) for v in data.get('goal', [width, height])],
+        'obstacles': obstacles,
+    }
+
+
+class Scenario:
+    """Wczytany scenariusz ze skompilowaną geometrią i polem odległości."""
+
+    def __init__(self, name, width, height, max_altitude, wind_speed, wind_direction,
+                 start, goal, obstacles, field_resolution=FIELD_RESOLUTION, key=None):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.max_altitude = max_altitude
+        self.wind_speed = wind_speed
+        self.wind_direction = wind_direction
+        self.start = start
+        self.goal = goal
+        self.obstacles = obstacles
+        self.key = key
+        self.geometry = CompiledObstacles(obstacles)
+        self.distance_field = compute_distance_field(self.geometry, width, height,
+                                                     field_resolution)
+
+    def engine_kwargs(self, distance_field=False):
+        """Argumenty wspólne dla konstruktorów algorytmów (mapa, start, meta, wiatr).
+
+        ``distance_field=True`` dodaje pole odległości - dla NSGA-II, który
+        liczy z niego kryterium odstępu.
+        """
+        kwargs = {'start': self.start, 'goal': self.goal, 'obstacles': self.geometry,
+                  'wind_speed': self.wind_speed, 'wind_direction': self.wind_direction}
+        if distance_field:
+            kwargs['distance_field'] = self.distance_field
+        return kwargs
+
+    def evaluate(self, paths):
+        """Fitness tras (N, W, 2) na mapie i przy wietrze scenariusza -> (N,)."""
+        return evaluate_paths(paths, self.geometry, self.wind_speed, self.wind_direction)
+
+
+def scenario_key(raw, field_resolution=FIELD_RESOLUTION):
+    """Klucz cache: skrót zawartości pliku, wersji formatu i rozdzielczości pola."""
+    h = hashlib.sha1(raw)
+    h.update(f"|{CACHE_VERSION}|{field_resolution}".encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_scenario(path, cache_dir=DEFAULT_CACHE_DIR, field_resolution=FIELD_RESOLUTION):
+    """Wczytuje scenariusz z pliku JSON, korzystając z cache na dysku.
+
+    ``cache_dir=None`` wyłącza cache. Przy trafieniu wczytywany jest gotowy
+    obiekt ``Scenario`` - bez parsowania przeszkód i budowy indeksów.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    key = scenario_key(raw, field_resolution)
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, key + '.pkl')
+        if os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+
+    scenario = Scenario(**parse_scenario(json.loads(raw.decode('utf-8'))),
+                        field_resolution=field_resolution, key=key)
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Zapis atomowy - równoległe uruchomienia nie wczytają niepełnego pliku
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(scenario, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    return scenario
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inicjalizacja populacji trasami z A* na zgrubnej siatce.
+Kilka różnych, bezkolizyjnych szkieletów trasy jest dopasowywanych
+do liczby waypointów, zaburzanych i wstrzykiwanych do populacji.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+from drone_path_optimization import GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS
+
+_MOVES = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+# Podział odcinka przy sprawdzaniu widoczności - próbki pokrywają też próbki
+# połówek powstałych przy późniejszym wstawianiu punktów środkowych
+_VISIBILITY_SPLITS = 32
+
+
+def occupancy_grid(geometry, resolution=2.0, margin=1.0,
+                   grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+    """Siatka zajętości (ny, nx) ze środków komórek, poszerzona o ``margin``."""
+    xs = np.arange(0.0, grid_width + 1e-9, resolution)
+    ys = np.arange(0.0, grid_height + 1e-9, resolution)
+    centers = np.stack(np.meshgrid(xs, ys), axis=-1)
+    occupied = geometry.contains(centers)
+
+    # Dylatacja o margines bezpieczeństwa (przesunięcia tablicy zamiast pętli po komórkach)
+    r = int(math.ceil(margin / resolution))
+    if r > 0 and occupied.any():
+        padded = np.pad(occupied, r)
+        dilated = np.zeros_like(occupied)
+        ny, nx = occupied.shape
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                if dx * dx + dy * dy <= r * r:
+                    dilated |= padded[r + dy:r + dy + ny, r + dx:r + dx + nx]
+        occupied = dilated
+    return occupied, xs, ys
+
+
+def astar(occupied, start_cell, goal_cell, extra_cost=None):
+    """A* na siatce 8-spójnej; zwraca listę komórek (iy, ix) lub None."""
+    ny, nx = occupied.shape
+    gy, gx = goal_cell
+    g_score = {start_cell: 0.0}
+    came_from = {}
+    heap = [(0.0, start_cell)]
+    closed = set()
+
+    while heap:
+        _, cell = heapq.heappop(heap)
+        if cell == goal_cell:
+            path = [cell]
+            while cell in came_from:
+                cell = came_from[cell]
+                path.append(cell)
+            return path[::-1]
+        if cell in closed:
+            continue
+        closed.add(cell)
+
+        cy, cx = cell
+        for dy, dx in _MOVES:
+            y, x = cy + dy, cx + dx
+            if not (0 <= y < ny and 0 <= x < nx) or occupied[y, x]:
+                continue
+            step = math.sqrt(dy * dy + dx * dx)
+            if extra_cost is not None:
+                step *= 1.0 + extra_cost[y, x]
+            tentative = g_score[cell] + step
+            if tentative < g_score.get((y, x), math.inf):
+                g_score[(y, x)] = tentative
+                came_from[(y, x)] = cell
+                h = math.hypot(gy - y, gx - x)
+                heapq.heappush(heap, (tentative + h, (y, x)))
+    return None
+
+
+def segments_visible(geometry, a, b):
+    """Czy odcinki a->b (..., 2) lub (..., 3) są wolne także po podziale na połówki -> bool (...)."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    t = (np.arange(_VISIBILITY_SPLITS + 1) / _VISIBILITY_SPLITS)[:, None]
+    points = a[..., None, :] + t * (b - a)[..., None, :]
+    return ~geometry.segments_blocked(points[..., :-1, :], points[..., 1:, :]).any(axis=-1)
+
+
+def shortcut(path, geometry):
+    """Zachłanne skracanie: z każdego punktu skok do najdalszego widocznego."""
+    path = np.asarray(path, dtype=float)
+    result = [path[0]]
+    i = 0
+    while i < len(path) - 1:
+        # Wszystkie kandydaty j > i sprawdzane jednym wywołaniem, a dokładny
+        # test widoczności tylko dla najdalszych z nich
+        candidates = np.arange(i + 1, len(path))
+        blocked = geometry.segments_blocked(np.broadcast_to(path[i], path[candidates].shape),
+                                            path[candidates])
+        nxt = i + 1
+        for j in candidates[~blocked][::-1]:
+            if segments_visible(geometry, path[i], path[j]):
+                nxt = int(j)
+                break
+        i = nxt
+        result.append(path[i])
+    return np.array(result)
+
+
+def fit_waypoints(skeleton, num_waypoints, geometry=None):
+    """Dopasowuje szkielet do ``num_waypoints`` punktów, zachowując narożniki."""
+    from geometry import resample_path
+
+    points = np.asarray(skeleton, dtype=float)
+    # Za dużo narożników - usuwanie najmniej znaczącego, o ile nie wprowadza kolizji
+    while len(points) > num_waypoints:
+        prev, mid, nxt = points[:-2], points[1:-1], points[2:]
+        detour = (np.linalg.norm(mid - prev, axis=1) + np.linalg.norm(nxt - mid, axis=1)
+                  - np.linalg.norm(nxt - prev, axis=1))
+        if geometry is not None:
+            detour[~segments_visible(geometry, prev, nxt)] = np.inf
+        k = int(np.argmin(detour))
+        if not np.isfinite(detour[k]):
+            return resample_path(points, num_waypoints)
+        points = np.delete(points, k + 1, axis=0)
+
+    points = list(points)
+    # Wstawianie punktów w środku najdłuższego odcinka
+    while len(points) < num_waypoints:
+        lengths = [np.linalg.norm(points[k + 1] - points[k]) for k in range(len(points) - 1)]
+        k = int(np.argmax(lengths))
+        points.insert(k + 1, (points[k] + points[k + 1]) / 2)
+    return np.array(points)
+
+
+def astar_seed_paths(geometry, start, goal, num_waypoints=NUM_WAYPOINTS, count=5,
+                     alternatives=3, resolution=2.0, margin=1.0, jitter=1.0,
+                     grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, rng=None):
+    """Zwraca ``count`` tras startowych z A* (puste, gdy brak połączenia)."""
+    rng = np.random.default_rng() if rng is None else rng
+    occupied, xs, ys = occupancy_grid(geometry, resolution, margin, grid_width, grid_height)
+
+    def to_cell(p):
+        return (int(np.clip(round(p[1] / resolution), 0, len(ys) - 1)),
+                int(np.clip(round(p[0] / resolution), 0, len(xs) - 1)))
+
+    start_cell, goal_cell = to_cell(start), to_cell(goal)
+    # Start i meta zawsze dostępne (mogą leżeć w marginesie)
+    occupied[start_cell] = occupied[goal_cell] = False
+
+    skeletons = []
+    extra_cost = np.zeros(occupied.shape)
+    for _ in range(alternatives):
+        cells = astar(occupied, start_cell, goal_cell, extra_cost)
+        if cells is None:
+            break
+        pts = np.array([[xs[ix], ys[iy]] for iy, ix in cells])
+        pts[0], pts[-1] = start, goal
+        skeletons.append(fit_waypoints(shortcut(pts, geometry), num_waypoints, geometry))
+
+        # Kara wokół znalezionej trasy wymusza inny wariant w kolejnym przebiegu
+        for iy, ix in cells:
+            extra_cost[max(0, iy - 2):iy + 3, max(0, ix - 2):ix + 3] += 2.0
+
+    if not skeletons:
+        return []
+    base = np.array([skeletons[i % len(skeletons)] for i in range(count)])
+    paths = base.copy()
+    paths[len(skeletons):, 1:-1] += rng.normal(0.0, jitter, paths[len(skeletons):, 1:-1].shape)
+    # Zaburzenie nie może wprowadzić kolizji - takie kopie wracają do szkieletu
+    blocked = geometry.segments_blocked(paths[:, :-1], paths[:, 1:]).any(axis=1)
+    blocked |= geometry.contains(paths).any(axis=1)
+    paths[blocked] = base[blocked]
+    return paths.tolist()
+
+
+def initial_seeds(algorithm, count):
+    """Trasy startowe algorytmu: ``initial_paths`` plus opcjonalny seeding A*.
+
+    W trybie 3D trasy A* (planowane w rzucie, z przeszkodami jak nieskończenie
+    wysokimi) dostają wysokość liniowo od startu do mety.
+    """
+    seeds = list(algorithm.initial_paths)
+    if algorithm.seeding == 'astar':
+        paths = astar_seed_paths(algorithm.geometry, algorithm.start[:2], algorithm.goal[:2],
+                                 getattr(algorithm, 'num_waypoints', NUM_WAYPOINTS),
+                                 count=count, rng=getattr(algorithm, 'rng', None))
+        if paths and len(algorithm.start) == 3:
+            z = np.linspace(algorithm.start[2], algorithm.goal[2], len(paths[0]))
+            paths = [[list(p) + [h] for p, h in zip(path, z)] for path in paths]
+        seeds += paths
+    elif algorithm.seeding is not None:
+        raise ValueError(f"Nieznany seeding: {algorithm.seeding!r}")
+    return seeds
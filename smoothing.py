@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deterministyczne wygładzanie najlepszej trasy po optymalizacji.
+Najpierw zachłanne skracanie (pomijanie waypointów, których obejście
+jest bezkolizyjne), potem lokalne ruchy punktów w stronę środka sąsiadów.
+"""
+
+import numpy as np
+
+from drone_path_optimization import WIND_SPEED, WIND_DIRECTION
+from geometry import evaluate_paths
+from seeding import fit_waypoints, shortcut
+
+
+def relax_path(path, geometry, iterations=30, alpha=0.5):
+    """Przesuwa punkty w stronę środka sąsiadów, o ile nie powoduje to kolizji.
+
+    Parzyste i nieparzyste punkty przesuwane są na zmianę, więc sąsiedzi
+    każdego ruchu są nieruchomi - żaden ruch nie wydłuża trasy.
+    """
+    path = np.array(path, dtype=float)
+    interior = np.arange(1, len(path) - 1)
+    for _ in range(iterations):
+        moved = False
+        for parity in (0, 1):
+            k = interior[interior % 2 == parity]
+            target = path[k] + alpha * ((path[k - 1] + path[k + 1]) / 2 - path[k])
+            # Po tym etapie nic nie jest już wstawiane - wystarczy test z funkcji celu
+            ok = ~(geometry.segments_blocked(path[k - 1], target)
+                   | geometry.segments_blocked(target, path[k + 1])
+                   | geometry.contains(target))
+            ok &= np.abs(target - path[k]).max(axis=1) > 1e-6
+            path[k[ok]] = target[ok]
+            moved |= bool(ok.any())
+        if not moved:
+            break
+    return path
+
+
+def smooth_path(path, geometry, iterations=30, wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
+    """Skraca i wygładza trasę; zwraca ją z tą samą liczbą waypointów.
+
+    Wynik jest przyjmowany tylko gdy fitness (przy podanym wietrze) się poprawia.
+    """
+    path = np.asarray(path, dtype=float)
+    candidate = fit_waypoints(shortcut(path, geometry), len(path), geometry)
+    candidate = relax_path(candidate, geometry, iterations)
+
+    before, after = evaluate_paths([path, candidate], geometry, wind_speed, wind_direction)
+    return (candidate, float(after)) if after < before else (path, float(before))
+
+
+def smooth_result(algorithm, result):
+    """Wygładza ``best_individual`` wyniku, jeśli algorytm ma włączone ``smooth``."""
+    if not algorithm.smooth:
+        return result
+    best = result['best_individual']
+    path, fitness = smooth_path(best, algorithm.geometry, wind_speed=algorithm.wind_speed,
+                                wind_direction=algorithm.wind_direction)
+    smoothed = type(best)(path.tolist()) if isinstance(best, list) else path.tolist()
+    if hasattr(smoothed, 'fitness'):
+        smoothed.fitness.values = (fitness,)
+    result['best_individual'] = smoothed
+    result['smoothed_fitness'] = fitness
+    return result
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Biblioteka wcześniej zoptymalizowanych tras do ciepłego startu.
+Wpisy kluczowane są skrótem mapy oraz parą (start, meta); najbliższe
+trasy są dopasowywane do nowych końców, przepróbkowane i zaburzane,
+a następnie trafiają do populacji początkowej algorytmu.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from drone_path_optimization import (
+    NUM_WAYPOINTS, POPULATION_SIZE, OBSTACLES, WIND_SPEED, WIND_DIRECTION
+)
+from geometry import compile_obstacles, evaluate_paths, resample_path
+from random_streams import make_rng, spawn_seeds
+
+
+class SolutionLibrary:
+    """Trwała biblioteka tras z wyszukiwaniem najbliższych sąsiadów."""
+
+    def __init__(self, path=None, other_map_penalty=50.0):
+        self.path = path
+        # Kara w odległości za trasę z innej mapy (np. przed zmianą przeszkód)
+        self.other_map_penalty = other_map_penalty
+        self.entries = []
+        self._keys = None
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self):
+        """Wczytuje bibliotekę z pliku JSON."""
+        with open(self.path, encoding='utf-8') as f:
+            self.entries = json.load(f)
+        self._keys = None
+
+    def save(self):
+        """Zapisuje bibliotekę atomowo (plik tymczasowy + rename)."""
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+    def add(self, fingerprint, start, goal, path, fitness):
+        """Dodaje trasę do biblioteki."""
+        self.entries.append({
+            'fingerprint': fingerprint,
+            'start': [float(v) for v in start],
+            'goal': [float(v) for v in goal],
+            'path': np.asarray(path, dtype=float).tolist(),
+            'fitness': float(fitness),
+        })
+        self._keys = None
+
+    def nearest(self, start, goal, fingerprint=None, k=3):
+        """Zwraca ``k`` wpisów najbliższych parze (start, meta)."""
+        if not self.entries:
+            return []
+        if self._keys is None:
+            self._keys = np.array([e['start'] + e['goal'] for e in self.entries])
+            self._fingerprints = np.array([e['fingerprint'] for e in self.entries])
+
+        query = np.concatenate([np.asarray(start, float), np.asarray(goal, float)])
+        dist = np.sqrt(((self._keys - query) ** 2).sum(axis=1))
+        if fingerprint is not None:
+            dist = dist + self.other_map_penalty * (self._fingerprints != fingerprint)
+
+        k = min(k, len(dist))
+        idx = np.argpartition(dist, k - 1)[:k]
+        return [self.entries[i] for i in idx[np.argsort(dist[idx])]]
+
+    def seed_paths(self, start, goal, count, fingerprint=None, num_waypoints=NUM_WAYPOINTS,
+                   jitter=1.0, k=3, rng=None):
+        """Tworzy ``count`` tras startowych z najbliższych wpisów biblioteki.
+
+        ``rng`` - generator lub ziarno zaburzeń (None - losowe ziarno z systemu).
+        """
+        rng = make_rng(rng)
+        neighbours = self.nearest(start, goal, fingerprint, k)
+        if not neighbours:
+            return []
+
+        start = np.asarray(start, dtype=float)
+        goal = np.asarray(goal, dtype=float)
+        bases = []
+        for entry in neighbours:
+            path = np.asarray(entry['path'], dtype=float)
+            if len(path) != num_waypoints:
+                path = resample_path(path, num_waypoints)
+            # Przesunięcie końców rozłożone liniowo wzdłuż trasy
+            s = np.linspace(0.0, 1.0, num_waypoints)[:, None]
+            path = path + (1 - s) * (start - path[0]) + s * (goal - path[-1])
+            bases.append(path)
+
+        seeds = []
+        for i in range(count):
+            path = bases[i % len(bases)].copy()
+            # Pierwsza kopia każdej trasy bez zaburzenia
+            if i >= len(bases):
+                path[1:-1] += rng.normal(0.0, jitter, path[1:-1].shape)
+            seeds.append(path.tolist())
+        return seeds
+
+    def record(self, result, start, goal, obstacles=None,
+               wind_speed=WIND_SPEED, wind_direction=WIND_DIRECTION):
+        """Zapisuje najlepszą trasę wyniku algorytmu (fitness przy wietrze, z którym działał algorytm)."""
+        geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+        best = np.asarray(result['best_individual'], dtype=float)
+        fitness = evaluate_paths([best], geometry, wind_speed, wind_direction)[0]
+        self.add(geometry.fingerprint, start, goal, best, fitness)
+
+
+def plan_with_library(library, algorithm_cls, start, goal, obstacles=None,
+                      seed_fraction=0.3, seed=None, **params):
+    """Uruchamia algorytm z ciepłym startem z biblioteki i zapisuje wynik.
+
+    ``seed_fraction`` populacji pochodzi z biblioteki (SA startuje z najbliższej trasy).
+    ``seed`` dzielone jest na strumień zaburzeń tras z biblioteki i strumień algorytmu.
+    """
+    geometry = compile_obstacles(OBSTACLES if obstacles is None else obstacles)
+    count = max(1, int(round(seed_fraction * params.get('population_size', POPULATION_SIZE))))
+    library_seed, engine_seed = spawn_seeds(seed, 2)
+
+    seeds = library.seed_paths(start, goal, count, fingerprint=geometry.fingerprint,
+                               num_waypoints=params.get('num_waypoints', NUM_WAYPOINTS),
+                               rng=library_seed)
+    algo = algorithm_cls(start=start, goal=goal, obstacles=geometry,
+                         initial_paths=seeds or None, seed=engine_seed, **params)
+    result = algo.run()
+
+    library.record(result, start, goal, geometry, algo.wind_speed, algo.wind_direction)
+    if library.path is not None:
+        library.save()
+    return result
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tani model zastępczy (surrogate) fitness do wstępnej selekcji potomków.
+Regresja k-NN na spłaszczonych waypointach, uczona na bieżąco na
+osobnikach ocenionych prawdziwą funkcją celu. Model ocenia dużą pulę
+kandydatów, a prawdziwą ewaluację dostaje tylko najlepiej rokująca część.
+"""
+
+import math
+
+import numpy as np
+
+from drone_path_optimization import NUM_WAYPOINTS
+from geometry import path_lengths, resample_path
+
+# Liczba sąsiadów, rozmiar archiwum (najnowsze oceny) i minimalna liczba ocen przed selekcją
+SURROGATE_K = 5
+SURROGATE_ARCHIVE = 2000
+SURROGATE_MIN_SAMPLES = 100
+
+
+def rank_correlation(a, b):
+    """Korelacja rang Spearmana (remisy dostają średnią rangę)"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if len(a) < 2:
+        return float('nan')
+
+    def ranks(x):
+        _, inverse, counts = np.unique(x, return_inverse=True, return_counts=True)
+        # Średnia ranga grupy remisów: pozycja początku + (liczność - 1) / 2
+        return (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+
+    ra, rb = ranks(a) - (len(a) + 1) / 2, ranks(b) - (len(b) + 1) / 2
+    denom = np.sqrt((ra ** 2).sum() * (rb ** 2).sum())
+    return float((ra * rb).sum() / denom) if denom > 0 else float('nan')
+
+
+def _lengths(paths):
+    """Długości tras, także o różnej liczbie waypointów"""
+    if len({len(path) for path in paths}) == 1:
+        return path_lengths(paths)
+    return np.array([path_lengths(path) for path in paths])
+
+
+class SurrogateModel:
+    """Regresja k-NN (ważona odwrotnością odległości) fitness tras.
+
+    Długość trasy jest tania i liczona dokładnie - model uczy się tylko
+    reszty fitness (kary za kolizje, wiatr, wznoszenie). Cechy to
+    spłaszczone wewnętrzne waypointy (start i meta są stałe); trasy innej
+    długości są przepróbkowywane do ``num_points`` punktów. Archiwum
+    przechowuje ``max_archive`` najnowszych ocen.
+    """
+
+    def __init__(self, k=SURROGATE_K, max_archive=SURROGATE_ARCHIVE, num_points=NUM_WAYPOINTS):
+        self.k = k
+        self.max_archive = max_archive
+        self.num_points = num_points
+        self.X = None
+        self.y = np.empty(0)
+
+    def __len__(self):
+        return len(self.y)
+
+    def features(self, paths):
+        """Wektory cech (N, F)"""
+        if all(len(path) == self.num_points for path in paths):
+            arr = np.asarray(paths, dtype=float)
+        else:
+            arr = np.array([path if len(path) == self.num_points
+                            else resample_path(path, self.num_points) for path in paths], dtype=float)
+        return arr[:, 1:-1].reshape(len(arr), -1)
+
+    def update(self, paths, fitnesses):
+        """Dodaje ocenione trasy do archiwum"""
+        X = self.features(paths)
+        y = np.asarray(fitnesses, dtype=float) - _lengths(paths)
+        self.X = (X if self.X is None else np.concatenate([self.X, X]))[-self.max_archive:]
+        self.y = np.concatenate([self.y, y])[-self.max_archive:]
+
+    def predict(self, paths, return_distance=False):
+        """Przewidywany fitness tras (opcjonalnie z odległością do najbliższej ocenionej)"""
+        X = self.features(paths)
+        d2 = (X ** 2).sum(axis=1)[:, None] + (self.X ** 2).sum(axis=1) - 2 * X @ self.X.T
+        dist = np.sqrt(np.maximum(d2, 0.0))
+        k = min(self.k, len(self.y))
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        # Dokładne odległości do k sąsiadów (rozwinięcie kwadratu gubi precyzję przy zerze)
+        nd = np.sqrt(((X[:, None] - self.X[nearest]) ** 2).sum(axis=-1))
+        weights = 1.0 / np.maximum(nd, 1e-9)
+        predicted = _lengths(paths) + (weights * self.y[nearest]).sum(axis=1) / weights.sum(axis=1)
+        if return_distance:
+            return predicted, nd.min(axis=1)
+        return predicted
+
+
+class SurrogateScreening:
+    """Wstępna selekcja kandydatów modelem zastępczym ze statystykami.
+
+    ``fraction`` to część puli kandydatów oceniana prawdziwą funkcją celu.
+    Dopóki archiwum ma mniej niż ``min_samples`` ocen, selekcja jest
+    wyłączona (wszyscy kandydaci są oceniani). Po każdej selekcji
+    zapisywana jest korelacja rang Spearmana między przewidywaniem a
+    prawdziwym fitness ocenionych kandydatów.
+    """
+
+    def __init__(self, fraction=0.25, min_samples=SURROGATE_MIN_SAMPLES, **model_params):
+        if not 0 < fraction <= 1:
+            raise ValueError("Część oceniana musi być w przedziale (0, 1]")
+        self.fraction = fraction
+        self.min_samples = min_samples
+        self.model = SurrogateModel(**model_params)
+        self.screened = 0
+        self.evaluated = 0
+        self.rank_history = []
+
+    @property
+    def ready(self):
+        return len(self.model) >= self.min_samples
+
+    def pool_size(self, n):
+        """Wielkość puli, z której po selekcji zostaje ``n`` kandydatów"""
+        return math.ceil(n / self.fraction) if self.ready else n
+
+    def keep_size(self, n):
+        """Ilu z ``n`` kandydatów dostaje prawdziwą ewaluację"""
+        return math.ceil(n * self.fraction) if self.ready else n
+
+    def select(self, candidates, n):
+        """Indeksy ``n`` najlepiej rokujących kandydatów i ich przewidywany fitness"""
+        if not self.ready:
+            return np.arange(min(n, len(candidates))), None
+        predicted, distance = self.model.predict(candidates, return_distance=True)
+        # Kopie ocenionych tras (np. potomkowie bez zmian) idą na koniec kolejki
+        chosen = np.lexsort((predicted, distance < 1e-6))[:n]
+        self.screened += len(candidates)
+        self.evaluated += len(chosen)
+        return chosen, predicted
+
+    def record(self, paths, fitnesses, predicted=None):
+        """Uczy model na ocenionych trasach; z przewidywaniem zapisuje korelację rang"""
+        if predicted is not None:
+            rho = rank_correlation(predicted, fitnesses)
+            if not np.isnan(rho):
+                self.rank_history.append(rho)
+        self.model.update(paths, fitnesses)
+
+    def report(self):
+        """Oszczędność ewaluacji i trafność modelu"""
+        return {
+            'screened': self.screened,
+            'evaluated': self.evaluated,
+            'evaluations_saved': self.screened - self.evaluated,
+            'rank_correlation': float(np.mean(self.rank_history)) if self.rank_history else None,
+        }
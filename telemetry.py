@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Strumieniowa telemetria generacji w formacie JSON Lines.
+Jeden rekord na generację: best, mean, std, diversity, evaluations, elapsed.
+"""
+
+import json
+import queue
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from observers import GenerationObserver
+
+
+def generation_stats(fitnesses, population=None):
+    """Oblicza statystyki generacji (best, mean, std, diversity)."""
+    fits = np.asarray(fitnesses, dtype=float)
+    diversity = 0.0
+    if population is not None and len(population) > 1:
+        # Średnie odchylenie standardowe współrzędnych waypointów w populacji
+        diversity = float(np.asarray(population, dtype=float).std(axis=0).mean())
+    return {
+        'best': float(fits.min()),
+        'mean': float(fits.mean()),
+        'std': float(fits.std()),
+        'diversity': diversity,
+    }
+
+
+class JsonlTelemetry(GenerationObserver):
+    """Buforowany, nieblokujący zapis telemetrii do pliku JSON Lines.
+
+    Rekordy trafiają do kolejki, a zapisuje je wątek w tle, więc pętla
+    algorytmu nie czeka na dysk. Gdy kolejka jest pełna, rekord jest
+    pomijany (licznik ``dropped``). Funkcje z ``callbacks`` dostają każdy
+    rekord synchronicznie, w wątku algorytmu.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path=None, callbacks=None, run_id=None,
+                 max_queue=10000, flush_interval=1.0):
+        self.path = path
+        self.callbacks = list(callbacks or [])
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._thread = None
+
+        if path is not None:
+            self._file = open(path, 'a', encoding='utf-8', buffering=1 << 16)
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+
+    def add_callback(self, callback):
+        """Dodaje konsumenta rekordów w procesie."""
+        self.callbacks.append(callback)
+
+    def on_generation(self, state):
+        self.record(state.algorithm, state.generation, state.fitness,
+                    state.population, state.evaluations, state.elapsed)
+
+    def record(self, algorithm, generation, fitnesses, population=None,
+               evaluations=0, elapsed=0.0):
+        """Emituje rekord jednej generacji."""
+        rec = {
+            'run_id': self.run_id,
+            'algorithm': algorithm,
+            'generation': generation,
+            'time': time.time(),
+        }
+        rec.update(generation_stats(fitnesses, population))
+        rec['evaluations'] = int(evaluations)
+        rec['elapsed'] = float(elapsed)
+
+        for callback in self.callbacks:
+            callback(rec)
+
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(rec)
+            except queue.Full:
+                self.dropped += 1
+        return rec
+
+    def _writer(self):
+        """Wątek zapisujący rekordy z kolejki do pliku."""
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                break
+            if item is not None:
+                self._file.write(json.dumps(item) + '\n')
+
+            # Flush gdy kolejka opróżniona lub minął interwał
+            now = time.monotonic()
+            if self._queue.empty() or now - last_flush >= self.flush_interval:
+                self._file.flush()
+                last_flush = now
+
+        self._file.flush()
+
+    def close(self):
+        """Opróżnia kolejkę i zamyka plik."""
+        if self._thread is not None:
+            self._queue.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
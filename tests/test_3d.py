@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy trybu 3D (wysokość lotu, przeszkody o skończonej wysokości)
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.cma_es import CMAES
+from algorithms.differential_evolution import DifferentialEvolution
+from drone_path_optimization import (
+    MAX_ALTITUDE, evaluate_fitness, is_line_intersecting_obstacle, is_point_in_obstacle,
+    repair_population
+)
+from geometry import compile_obstacles, evaluate_paths
+from seeding import initial_seeds
+
+BUILDINGS = [
+    {'type': 'circle', 'center': (30, 30), 'radius': 8, 'top': 10},
+    {'type': 'rect', 'x': 60, 'y': 20, 'width': 12, 'height': 20, 'top': 15},
+    {'type': 'circle', 'center': (70, 70), 'radius': 10},
+]
+# Niska ściana w poprzek całej mapy - da się ją tylko przelecieć
+WALL = [{'type': 'rect', 'x': 45, 'y': 0, 'width': 10, 'height': 100, 'top': 5}]
+
+
+class TestGeometry3D(unittest.TestCase):
+    """Testy kolizji i funkcji celu w 3D"""
+
+    def test_contains(self):
+        """Test kolizji: poniżej i powyżej wierzchołka, przeszkoda bez 'top'"""
+        geometry = compile_obstacles(BUILDINGS)
+        points = [[30, 30, 5], [30, 30, 12], [65, 30, 14], [65, 30, 16], [70, 70, 29]]
+        expected = [True, False, True, False, True]
+        np.testing.assert_array_equal(geometry.contains(points), expected)
+        for point, inside in zip(points, expected):
+            self.assertEqual(is_point_in_obstacle(point, BUILDINGS), inside)
+        # Punkty 2D - przeszkody jak dotąd nieskończenie wysokie
+        self.assertTrue(geometry.contains([30, 30]))
+        self.assertTrue(is_point_in_obstacle([30, 30], BUILDINGS))
+
+    def test_segments(self):
+        """Test przelotu nad budynkiem i przez budynek"""
+        geometry = compile_obstacles(BUILDINGS)
+        self.assertTrue(geometry.segments_blocked([10, 10, 5], [50, 50, 5]))
+        self.assertFalse(geometry.segments_blocked([10, 10, 12], [50, 50, 12]))
+        self.assertTrue(is_line_intersecting_obstacle([10, 10, 5], [50, 50, 5], BUILDINGS))
+        self.assertFalse(is_line_intersecting_obstacle([10, 10, 12], [50, 50, 12], BUILDINGS))
+
+    def test_fitness_matches_scalar(self):
+        """Test zgodności evaluate_paths z evaluate_fitness (z kosztem wznoszenia)"""
+        rng = np.random.default_rng(0)
+        paths = rng.uniform(0, 30, (5, 6, 3)) * [3, 3, 1]
+        vectorized = evaluate_paths(paths, compile_obstacles(BUILDINGS), 5.0, 45)
+        scalar = [evaluate_fitness(p.tolist(), BUILDINGS)[0] for p in paths]
+        np.testing.assert_allclose(vectorized, scalar)
+
+    def test_repair_altitude(self):
+        """Test naprawy w 3D: pułap, warstwy wysokości i przesunięcie poziome"""
+        geometry = compile_obstacles(BUILDINGS)
+        pop = np.array([[[0, 0, 0], [30, 30, 8], [50, 50, 99], [100, 100, 0]]], dtype=float)
+        repaired = repair_population(pop, [0, 0, 0], [100, 100, 0], geometry)
+        self.assertEqual(repaired[0, 2, 2], MAX_ALTITUDE)
+        self.assertEqual(repaired[0, 1, 2], 8)
+        self.assertNotEqual(repaired[0, 1, :2].tolist(), [30, 30])
+        self.assertFalse(geometry.contains(repaired).any())
+
+        layered = repair_population(pop, [0, 0, 0], [100, 100, 0], geometry,
+                                    altitude_layers=[0, 12, 24])
+        # Warstwa 12 jest ponad walcem - punkt nie musi być przesuwany
+        np.testing.assert_array_equal(layered[0, 1:-1, 2], [12, 24])
+        np.testing.assert_array_equal(layered[0, 1, :2], [30, 30])
+
+
+class TestEngines3D(unittest.TestCase):
+    """Testy DE i CMA-ES w trybie 3D"""
+
+    def test_de_overflies_wall(self):
+        """Test przelotu DE nad niską ścianą"""
+        de = DifferentialEvolution(population_size=30, generations=60, start=[0, 0, 0],
+                                   obstacles=WALL, verbose=False, seed=0)
+        result = de.run()
+        best = np.asarray(result['best_individual'])
+        self.assertEqual(best.shape, (8, 3))
+        np.testing.assert_array_equal(best[-1], [100, 100, 0])
+        geometry = compile_obstacles(WALL)
+        self.assertFalse(geometry.segments_blocked(best[:-1], best[1:]).any())
+        self.assertGreater(best[:, 2].max(), 5)
+
+    def test_cma_es_3d(self):
+        """Test CMA-ES z warstwami wysokości"""
+        cma = CMAES(generations=30, start=[0, 0, 0], obstacles=BUILDINGS,
+                    altitude_layers=[0, 10, 20], verbose=False, seed=0)
+        result = cma.run()
+        best = np.asarray(result['best_individual'])
+        self.assertEqual(cma.dim, 3 * 6)
+        self.assertTrue(np.isin(best[1:-1, 2], [0, 10, 20]).all())
+
+    def test_astar_seeds_3d(self):
+        """Test seedingu A* w 3D - wysokość liniowo od startu do mety"""
+        de = DifferentialEvolution(population_size=10, start=[0, 0, 0], goal=[100, 100, 20],
+                                   obstacles=BUILDINGS, seeding='astar', verbose=False)
+        seeds = np.asarray(initial_seeds(de, 2))
+        self.assertEqual(seeds.shape[-1], 3)
+        np.testing.assert_allclose(seeds[0, :, 2], np.linspace(0, 20, seeds.shape[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
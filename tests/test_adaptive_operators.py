@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy adaptacyjnego wyboru operatorów mutacji GA
+"""
+
+import unittest
+
+from algorithms.genetic_algorithm import (
+    GeneticAlgorithm, MUTATION_TYPES, MIN_OPERATOR_PROB, SIGMA_BOUNDS
+)
+
+
+class FakeFitness:
+    """Minimalny fitness z polem values"""
+
+    def __init__(self, value):
+        self.values = (value,)
+
+
+class FakeChild(list):
+    """Potomek z zapamiętanym fitness rodzica i operatorem"""
+
+    def __init__(self, parent_fitness, fitness, operator):
+        super().__init__()
+        self.parent_fitness = parent_fitness
+        self.fitness = FakeFitness(fitness)
+        self.operator = operator
+
+
+class TestAdaptiveOperators(unittest.TestCase):
+    """Testy przypisania zasług i samoadaptacji kroku"""
+
+    def test_credit_favours_improving_operator(self):
+        """Test że operator poprawiający potomków zyskuje prawdopodobieństwo"""
+        ga = GeneticAlgorithm(verbose=False, adaptive=True)
+        for _ in range(5):
+            ga._update_operator_credit([
+                FakeChild(200, 195, None),        # kontrola (bez mutacji): poprawa 5
+                FakeChild(200, 180, 'gaussian'),  # nadwyżka 15
+                FakeChild(200, 196, 'uniform'),   # poniżej kontroli
+                FakeChild(200, 195, 'repair'),    # jak kontrola
+            ])
+        probs = ga.operator_probs
+        self.assertAlmostEqual(sum(probs.values()), 1.0)
+        self.assertGreater(probs['gaussian'], 0.8)
+        self.assertAlmostEqual(probs['uniform'], MIN_OPERATOR_PROB)
+        self.assertEqual(len(ga.operator_history), 5)
+
+    def test_uniform_without_credit(self):
+        """Test równych prawdopodobieństw bez żadnej poprawy"""
+        ga = GeneticAlgorithm(verbose=False, adaptive=True)
+        ga._update_operator_credit([FakeChild(100, 110, op) for op in MUTATION_TYPES])
+        for op in MUTATION_TYPES:
+            self.assertAlmostEqual(ga.operator_probs[op], 1 / len(MUTATION_TYPES))
+
+    def test_self_adaptive_sigma(self):
+        """Test że krok mutacji jest zapisany w osobniku i mieści się w granicach"""
+        ga = GeneticAlgorithm(population_size=10, generations=1, verbose=False, seed=0,
+                              adaptive=True, mutation_rate=1.0)
+        ga.setup_deap()
+        ind = ga.toolbox.individual()
+        for _ in range(20):
+            ga._mutate(ind)
+            self.assertIn(ind.operator, MUTATION_TYPES)
+            self.assertTrue(SIGMA_BOUNDS[0] <= ind.sigma <= SIGMA_BOUNDS[1])
+
+    def test_adaptive_run(self):
+        """Test pełnego przebiegu w trybie adaptacyjnym"""
+        ga = GeneticAlgorithm(population_size=20, generations=5, verbose=False, seed=1, adaptive=True)
+        result = ga.run()
+        self.assertEqual(len(result['best_fitness']), 5)
+        self.assertEqual(len(ga.operator_history), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
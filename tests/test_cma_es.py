@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy CMA-ES
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.cma_es import CMAES
+from drone_path_optimization import GRID_WIDTH, GRID_HEIGHT
+from geometry import path_lengths
+
+
+class TestCMAES(unittest.TestCase):
+    """Testy silnika CMA-ES"""
+
+    def test_converges_without_obstacles(self):
+        """Test zbieżności do odcinka start-meta na pustej mapie"""
+        cma = CMAES(generations=150, obstacles=[], verbose=False, seed=0)
+        result = cma.run()
+        self.assertAlmostEqual(path_lengths([result['best_individual']])[0],
+                               np.hypot(GRID_WIDTH, GRID_HEIGHT), places=1)
+        self.assertEqual(result['algorithm'], 'CMA-ES')
+        self.assertEqual(len(result['best_fitness']), 150)
+
+    def test_batch_evaluation_count(self):
+        """Test że każde pokolenie λ kandydatów jest liczone w ewaluacjach"""
+        cma = CMAES(generations=5, population_size=12, restarts=0, verbose=False, seed=1)
+        result = cma.run()
+        # + ocena naprawionej średniej startowej
+        self.assertEqual(result['evaluations'], 5 * 12 + 1)
+        self.assertTrue(np.all(np.diff(result['best_fitness']) <= 0))
+
+    def test_ipop_restarts(self):
+        """Test restartów z podwojeniem populacji"""
+        cma = CMAES(generations=400, obstacles=[], restarts=2, verbose=False, seed=2)
+        cma.run()
+        self.assertEqual(cma.restarts_done, 2)
+
+    def test_many_waypoints(self):
+        """Test trasy z dużą liczbą waypointów"""
+        cma = CMAES(generations=5, num_waypoints=30, verbose=False, seed=3)
+        result = cma.run()
+        self.assertEqual(len(result['best_individual']), 30)
+        self.assertEqual(result['best_individual'][0], [0, 0])
+
+    def test_zero_generations(self):
+        """Test wyniku bez żadnej generacji (naprawiona średnia startowa)"""
+        result = CMAES(generations=0, verbose=False, seed=0).run()
+        self.assertEqual(result['best_individual'][0], [0, 0])
+        self.assertEqual(result['best_individual'][-1], [GRID_WIDTH, GRID_HEIGHT])
+        self.assertEqual((result['best_fitness'], result['evaluations']), ([], 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
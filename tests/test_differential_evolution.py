@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy Differential Evolution
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.differential_evolution import DifferentialEvolution
+from drone_path_optimization import GRID_WIDTH, GRID_HEIGHT
+from geometry import compile_obstacles
+from observers import EarlyStopping
+
+
+class TestDifferentialEvolution(unittest.TestCase):
+    """Testy silnika DE"""
+
+    def test_run_result(self):
+        """Test wyniku w konwencji pozostałych algorytmów"""
+        for strategy in ('rand/1/bin', 'current-to-best/1/bin'):
+            de = DifferentialEvolution(population_size=20, generations=10,
+                                       strategy=strategy, verbose=False, seed=0)
+            result = de.run()
+            self.assertEqual(result['algorithm'], 'Differential Evolution')
+            self.assertEqual(len(result['best_fitness']), 10)
+            self.assertEqual(result['evaluations'], 20 * 11)
+            self.assertEqual(result['best_individual'][0], [0, 0])
+            self.assertEqual(result['best_individual'][-1], [GRID_WIDTH, GRID_HEIGHT])
+            # Selekcja jeden-na-jeden - najlepszy fitness nigdy nie rośnie
+            self.assertTrue(np.all(np.diff(result['best_fitness']) <= 0))
+
+    def test_repair_population(self):
+        """Test naprawy populacji: granice, końce i przeszkody"""
+        de = DifferentialEvolution(population_size=4, generations=1, verbose=False)
+        pop = np.full((4, 8, 2), 50.0)
+        pop[0, 3] = [-10, 200]
+        repaired = de._repair_population(pop)
+        np.testing.assert_allclose(repaired[0, 3], [0, GRID_HEIGHT])
+        np.testing.assert_allclose(repaired[:, 0], [[0, 0]] * 4)
+        self.assertFalse(compile_obstacles(de.geometry).contains(repaired).any())
+
+    def test_donor_indices_distinct(self):
+        """Test różnych indeksów dawców w mutacji"""
+        de = DifferentialEvolution(population_size=5, generations=1, verbose=False, seed=1)
+        r = de._donor_indices(5)
+        rows = np.vstack([r, np.arange(5)])
+        for column in rows.T:
+            self.assertEqual(len(set(column)), 4)
+
+    def test_invalid_strategy(self):
+        """Test błędu dla nieznanej strategii"""
+        with self.assertRaises(ValueError):
+            DifferentialEvolution(strategy='best/2/exp')
+
+    def test_observers(self):
+        """Test wczesnego zatrzymania przez obserwatora"""
+        de = DifferentialEvolution(population_size=10, generations=50, verbose=False,
+                                   observers=[EarlyStopping(patience=1, min_delta=1e9)])
+        result = de.run()
+        self.assertLess(len(result['best_fitness']), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
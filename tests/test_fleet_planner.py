@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy planowania floty i wykrywania konfliktów
+"""
+
+import unittest
+
+import numpy as np
+
+from fleet_planner import FleetPlanner, conflict_counts, detect_conflicts, trajectory_samples
+
+CROSSING = [[[0, 50], [50, 50], [100, 50]], [[50, 0], [50, 50], [50, 100]]]
+
+
+def brute_force_conflicts(paths, separation=3.0):
+    """Referencyjne wykrywanie: wszystkie pary dronów i przedziałów czasu"""
+    pos, segment, active = trajectory_samples(paths, separation=separation)
+    found = set()
+    for a in range(len(paths)):
+        for b in range(a + 1, len(paths)):
+            for k in np.flatnonzero(active[a] & active[b]):
+                p = pos[a, k] - pos[b, k]
+                v = (pos[a, k + 1] - pos[a, k]) - (pos[b, k + 1] - pos[b, k])
+                s = np.clip(-(p @ v) / max(v @ v, 1e-12), 0, 1)
+                if np.linalg.norm(p + s * v) < separation:
+                    found.add((a, segment[a, k], b, segment[b, k]))
+    return found
+
+
+class TestConflictDetection(unittest.TestCase):
+    """Testy wykrywania konfliktów haszowaniem przestrzennym"""
+
+    def test_matches_brute_force(self):
+        """Test zgodności z przeglądem wszystkich par"""
+        rng = np.random.default_rng(0)
+        for d in (3, 15):
+            paths = rng.uniform(0, 100, (d, 6, 2))
+            found = set(map(tuple, detect_conflicts(paths).tolist()))
+            self.assertEqual(found, brute_force_conflicts(paths))
+
+    def test_crossing_and_departures(self):
+        """Test skrzyżowania: konflikt przy równym starcie, brak przy opóźnieniu"""
+        np.testing.assert_array_equal(detect_conflicts(CROSSING), [[0, 0, 1, 0], [0, 1, 1, 1]])
+        np.testing.assert_array_equal(conflict_counts(CROSSING), [2, 2])
+        self.assertEqual(len(detect_conflicts(CROSSING, departures=[0, 10])), 0)
+
+    def test_trajectory_samples(self):
+        """Test parametryzacji czasem: pozycje, odcinki i aktywność"""
+        pos, segment, active = trajectory_samples([[[0, 0], [10, 0], [10, 10]]], dt=5,
+                                                  departures=[5])
+        np.testing.assert_allclose(pos[0, :6], [[0, 0], [0, 0], [5, 0], [10, 0], [10, 5], [10, 10]])
+        np.testing.assert_array_equal(segment[0, :6], [0, 0, 0, 1, 1, 1])
+        np.testing.assert_array_equal(active[0, :5], [False, True, True, True, True])
+
+
+class TestFleetPlanner(unittest.TestCase):
+    """Testy planera floty"""
+
+    def test_run_result(self):
+        """Test wyniku: trasy każdego drona z jego startem i metą, kara maleje"""
+        missions = [([0, 50], [100, 50]), ([50, 0], [50, 100]), ([0, 0], [100, 100])]
+        planner = FleetPlanner(missions, population_size=12, generations=20, verbose=False, seed=0)
+        result = planner.run()
+
+        self.assertEqual(result['algorithm'], 'Fleet DE')
+        self.assertEqual(len(result['paths']), 3)
+        for (start, goal), path in zip(missions, result['paths']):
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], goal)
+        self.assertEqual(result['evaluations'], 12 * 21)
+        self.assertTrue(np.all(np.diff(result['best_fitness']) <= 0))
+        self.assertEqual(len(result['conflicts']), len(planner.detect_conflicts(
+            np.asarray(result['paths']))))
+
+    def test_warm_start(self):
+        """Test ciepłego startu: pierwsza flota to trasy startowe"""
+        planner = FleetPlanner([m[::2] for m in CROSSING], population_size=6, generations=1,
+                               initial_paths=[[p[0]] * 3 + [p[2]] * 5 for p in CROSSING],
+                               verbose=False)
+        pop = planner._initial_population()
+        self.assertEqual(pop.shape, (6, 2, 8, 2))
+        np.testing.assert_allclose(pop[0, 0, 1], CROSSING[0][0])
+
+    def test_astar_unreachable_goal(self):
+        """Test seedingu A* przy mecie odciętej ścianą - bez tras z A*"""
+        planner = FleetPlanner([([0, 0], [100, 100])], population_size=6, generations=2,
+                               obstacles=[{'type': 'rect', 'x': 40, 'y': -5,
+                                           'width': 20, 'height': 120}],
+                               seeding='astar', verbose=False, seed=0)
+        result = planner.run()
+        self.assertEqual(result['paths'][0][-1], [100, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
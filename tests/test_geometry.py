@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy skompilowanej geometrii przeszkód
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+import geometry
+from geometry import compile_obstacles, evaluate_paths
+from drone_path_optimization import (
+    is_point_in_obstacle, is_line_intersecting_obstacle, evaluate_fitness,
+    repair_individual, OBSTACLES, WIND_SPEED, WIND_DIRECTION
+)
+
+
+class TestCompiledObstacles(unittest.TestCase):
+    """Testy zgodności z funkcjami skalarnymi"""
+
+    def setUp(self):
+        self.geometry = compile_obstacles(OBSTACLES)
+        self.rng = random.Random(7)
+
+    def test_contains_matches_scalar(self):
+        """Test zgodności testu punktów"""
+        points = np.array([[self.rng.uniform(0, 100), self.rng.uniform(0, 100)]
+                           for _ in range(500)])
+        expected = [is_point_in_obstacle(p) for p in points]
+        np.testing.assert_array_equal(self.geometry.contains(points), expected)
+
+    def test_segments_match_scalar(self):
+        """Test zgodności testu odcinków"""
+        a = np.array([[self.rng.uniform(0, 100), self.rng.uniform(0, 100)] for _ in range(200)])
+        b = np.array([[self.rng.uniform(0, 100), self.rng.uniform(0, 100)] for _ in range(200)])
+        expected = [is_line_intersecting_obstacle(p, q) for p, q in zip(a, b)]
+        np.testing.assert_array_equal(self.geometry.segments_blocked(a, b), expected)
+
+    def test_evaluate_paths_matches_evaluate_fitness(self):
+        """Test zgodności zwektoryzowanego fitness"""
+        paths = [[[0, 0]] + [[self.rng.uniform(0, 100), self.rng.uniform(0, 100)]
+                             for _ in range(6)] + [[100, 100]] for _ in range(50)]
+        expected = [evaluate_fitness(p)[0] for p in paths]
+        actual = evaluate_paths(paths, self.geometry, WIND_SPEED, WIND_DIRECTION)
+        np.testing.assert_allclose(actual, expected)
+
+    def test_compile_is_cached(self):
+        """Test że ta sama mapa kompilowana jest raz"""
+        self.assertIs(compile_obstacles(list(OBSTACLES)), self.geometry)
+
+    def test_compile_cache_is_bounded(self):
+        """Test limitu cache - najdawniej używane mapy są usuwane"""
+        maps = [[{'type': 'circle', 'center': [50, 50], 'radius': 1 + k}]
+                for k in range(geometry.COMPILED_CACHE_SIZE + 5)]
+        first = compile_obstacles(maps[0])
+        for obstacles in maps[1:]:
+            compile_obstacles(obstacles)
+            compile_obstacles(OBSTACLES)    # często używana mapa zostaje w cache
+        self.assertEqual(len(geometry._COMPILED_CACHE), geometry.COMPILED_CACHE_SIZE)
+        self.assertIs(compile_obstacles(OBSTACLES), self.geometry)
+        self.assertIsNot(compile_obstacles(maps[0]), first)
+
+    def test_repair_with_custom_endpoints(self):
+        """Test naprawy osobnika z własnym startem i metą"""
+        repaired = repair_individual([[0, 0], [30, 30], [0, 0]],
+                                     start=[5, 90], goal=[95, 10], obstacles=self.geometry)
+        self.assertEqual(repaired[0], [5, 90])
+        self.assertEqual(repaired[-1], [95, 10])
+        self.assertFalse(is_point_in_obstacle(repaired[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy typów osobników bez globalnego deap.creator (współbieżne GA, pickle)
+"""
+
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import individuals
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from drone_path_optimization import OBSTACLES, WIND_SPEED, WIND_DIRECTION
+from geometry import compile_obstacles, evaluate_paths
+from planning_service import PlanningClient, PlanningService, run_service_in_thread
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEGACY_WRITER = """
+import pickle, sys
+from deap import base, creator
+creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+creator.create("Individual", list, fitness=creator.FitnessMin)
+ind = creator.Individual([[0, 0], [50, 50], [100, 100]])
+ind.fitness.values = (150.0,)
+with open(sys.argv[1], 'wb') as f:
+    pickle.dump({'best_individual': ind, 'generations': 10}, f)
+"""
+
+
+def run_python(code, *args):
+    """Uruchamia kod w nowym procesie (czysty deap.creator) i zwraca stdout"""
+    out = subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+class TestIndividualTypes(unittest.TestCase):
+    """Testy typów osobników"""
+
+    def test_no_global_creator(self):
+        """Test biegu GA bez tworzenia klas w deap.creator"""
+        from deap import creator
+
+        result = GeneticAlgorithm(population_size=10, generations=2, verbose=False).run()
+        self.assertIsInstance(result['best_individual'], individuals.Individual)
+        self.assertFalse(hasattr(creator, 'Individual'))
+        # Każda instancja ma własny toolbox, typ osobnika jest wspólny i stały
+        first, second = GeneticAlgorithm(verbose=False), GeneticAlgorithm(verbose=False)
+        first.setup_deap()
+        second.setup_deap()
+        self.assertIsNot(first.toolbox, second.toolbox)
+        self.assertIs(type(first.toolbox.individual()), type(second.toolbox.individual()))
+
+    def test_pickle_in_fresh_process(self):
+        """Test odczytu zapisanego osobnika w nowym procesie"""
+        ind = individuals.Individual([[0, 0], [50, 50], [100, 100]])
+        ind.fitness.values = (150.0,)
+        code = ("import pickle, sys\n"
+                "ind = pickle.loads(bytes.fromhex(sys.argv[1]))\n"
+                "print(type(ind).__module__, ind.fitness.values[0], len(ind))")
+        self.assertEqual(run_python(code, pickle.dumps(ind).hex()), 'individuals 150.0 3')
+
+    def test_legacy_results(self):
+        """Test wczytania wyników zapisanych z klasami deap.creator"""
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'wyniki.pkl')
+            run_python(LEGACY_WRITER, path)
+            results = individuals.load_results(path)
+        finally:
+            shutil.rmtree(tmp)
+        best = results['best_individual']
+        self.assertIsInstance(best, individuals.Individual)
+        self.assertEqual(best.fitness.values, (150.0,))
+        self.assertEqual(best, [[0, 0], [50, 50], [100, 100]])
+
+
+class TestConcurrentRuns(unittest.TestCase):
+    """Testy wielu GA w jednym procesie"""
+
+    def test_threads(self):
+        """Test GA w puli wątków: spójny fitness każdego wyniku"""
+        geometry = compile_obstacles(OBSTACLES)
+
+        def run(memetic):
+            return GeneticAlgorithm(population_size=20, generations=15, verbose=False,
+                                    memetic=memetic, obstacles=geometry).run()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(run, [False, True] * 4))
+        for result in results:
+            best = result['best_individual']
+            self.assertEqual(len(result['population']), 20)
+            fit = evaluate_paths([best], geometry, WIND_SPEED, WIND_DIRECTION)[0]
+            self.assertAlmostEqual(best.fitness.values[0], fit)
+
+    def test_service_thread_pool(self):
+        """Test usługi z pulą wątków - równoległe żądania GA"""
+        service = PlanningService(port=0, workers=3, threads=True)
+        stop = run_service_in_thread(service)
+        try:
+            client = PlanningClient(port=service.port)
+            budgets = [{'generations': g, 'population_size': 12} for g in (5, 6, 7)]
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                results = list(pool.map(lambda b: client.plan(algorithm='ga', budget=b), budgets))
+            self.assertEqual(client.stats()['completed'], 3)
+        finally:
+            stop()
+        for result in results:
+            self.assertEqual(result['algorithm'], 'Genetic Algorithm')
+            self.assertEqual(result['best_individual'][-1], [100, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
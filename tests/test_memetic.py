@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy trybu memetycznego GA
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithm
+
+
+class TestMemeticGA(unittest.TestCase):
+    """Testy lokalnego przeszukiwania elit"""
+
+    def test_local_search_shortens_elites(self):
+        """Test że kroki gradientowe nie pogarszają elit i są liczone"""
+        ga = GeneticAlgorithm(population_size=10, generations=1, verbose=False, seed=0,
+                              obstacles=[], memetic=True, memetic_k=3, memetic_steps=4)
+        ga.setup_deap()
+        pop = ga.toolbox.population(n=10)
+        ga._evaluate_invalid(pop)
+        before = sorted(ind.fitness.values[0] for ind in pop)[:3]
+        evaluations = ga.evaluations
+
+        ga._local_search(pop)
+        after = sorted(ind.fitness.values[0] for ind in pop)[:3]
+        self.assertLess(after[0], before[0])
+        self.assertEqual(ga.evaluations - evaluations, 3 * 4)
+        # Fitness po lokalnym przeszukiwaniu zgadza się z ponowną ewaluacją
+        for ind in pop:
+            self.assertAlmostEqual(ind.fitness.values[0], ga._evaluate_fitness(ind)[0])
+        np.testing.assert_allclose(pop[0][0], ga.start)
+
+    def test_memetic_run(self):
+        """Test pełnego przebiegu w trybie memetycznym"""
+        ga = GeneticAlgorithm(population_size=10, generations=5, verbose=False, seed=1, memetic=True)
+        result = ga.run()
+        self.assertEqual(len(result['best_fitness']), 5)
+        self.assertGreater(ga.memetic_improved, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy planowania wsadowego misji
+"""
+
+import unittest
+
+from mission_planner import plan_missions
+
+MISSIONS = [([0, 0], [100, 100]), ([10, 90], [90, 10]), ([50, 0], [50, 100])]
+
+
+class TestPlanMissions(unittest.TestCase):
+    """Testy planera wielu misji"""
+
+    def test_serial_results_per_mission(self):
+        """Test wyniku dla każdej misji z właściwym startem i metą"""
+        results = plan_missions(MISSIONS, algorithm='sa', workers=0, generations=20)
+
+        self.assertEqual(len(results), len(MISSIONS))
+        for (start, goal), result in zip(MISSIONS, results):
+            self.assertEqual(result['best_individual'][0], start)
+            self.assertEqual(result['best_individual'][-1], goal)
+            self.assertGreater(result['fitness'], 0)
+
+    def test_process_pool(self):
+        """Test planowania w puli procesów"""
+        results = plan_missions(MISSIONS, algorithm='ga', workers=2,
+                                population_size=6, generations=3)
+        self.assertEqual([r['start'] for r in results], [m[0] for m in MISSIONS])
+        self.assertEqual(results[0]['algorithm'], 'Genetic Algorithm')
+
+    def test_3d_missions(self):
+        """Test misji 3D (DE i CMA-ES) szeregowo i w puli procesów"""
+        missions = [([0, 0, 10], [100, 100, 10]), ([0, 100, 5], [100, 0, 20])]
+        for algorithm in ('de', 'cmaes'):
+            for workers in (0, 2):
+                with self.subTest(algorithm=algorithm, workers=workers):
+                    results = plan_missions(missions, algorithm=algorithm, workers=workers,
+                                            population_size=8, generations=3)
+                    for (start, goal), result in zip(missions, results):
+                        self.assertEqual(result['best_individual'][0], start)
+                        self.assertEqual(result['best_individual'][-1], goal)
+                        self.assertTrue(all(len(p) == 3 for p in result['best_individual']))
+                        self.assertGreater(result['fitness'], 0)
+
+    def test_unknown_algorithm(self):
+        """Test błędu dla nieznanego algorytmu"""
+        with self.assertRaises(ValueError):
+            plan_missions(MISSIONS, algorithm='xyz')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy optymalizacji od zgrubnej do gęstej siatki waypointów
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.differential_evolution import DifferentialEvolution
+from drone_path_optimization import OBSTACLES, WIND_SPEED, WIND_DIRECTION
+from geometry import compile_obstacles, evaluate_paths, path_lengths
+from multiresolution import ProgressiveRefinement, subdivide_paths
+from observers import TargetFitness
+
+
+class TestSubdivide(unittest.TestCase):
+    """Testy zagęszczania tras"""
+
+    def test_shape_preserved(self):
+        """Test zachowania waypointów i długości trasy bez szumu"""
+        rng = np.random.default_rng(0)
+        paths = rng.uniform(0, 100, (5, 6, 2))
+        refined = subdivide_paths(paths, 23)
+        self.assertEqual(refined.shape, (5, 23, 2))
+        np.testing.assert_allclose(path_lengths(refined), path_lengths(paths))
+        for path, dense in zip(paths, refined):
+            for point in path:
+                self.assertTrue(np.isclose(dense, point).all(axis=1).any())
+
+    def test_jitter_only_new_points(self):
+        """Test szumu tylko na nowych punktach (3D)"""
+        paths = np.array([[[0, 0, 0], [50, 0, 10], [50, 50, 10]]], dtype=float)
+        exact = subdivide_paths(paths, 9)
+        noisy = subdivide_paths(paths, 9, jitter=0.2, rng=np.random.default_rng(1))
+        kept = np.isclose(noisy, exact).all(axis=-1)[0]
+        np.testing.assert_array_equal(np.flatnonzero(kept), [0, 4, 8])
+
+    def test_cannot_shrink(self):
+        """Test błędu przy zmniejszaniu liczby waypointów"""
+        with self.assertRaises(ValueError):
+            subdivide_paths(np.zeros((1, 8, 2)), 4)
+
+
+class TestProgressiveRefinement(unittest.TestCase):
+    """Testy trybu progresywnego"""
+
+    def test_levels(self):
+        """Test przejścia przez wszystkie poziomy i wyniku na poziomie docelowym"""
+        result = ProgressiveRefinement(levels=(4, 8, 16), generations=15, population_size=12,
+                                       verbose=False, seed=0).run()
+        self.assertEqual([lvl['num_waypoints'] for lvl in result['levels']], [4, 8, 16])
+        self.assertEqual(len(result['best_individual']), 16)
+        self.assertEqual(result['evaluations'],
+                         sum(lvl['evaluations'] for lvl in result['levels']) + 3)
+        # Przeniesiona najlepsza trasa nie pozwala pogorszyć wyniku
+        fits = [lvl['best_fitness'] for lvl in result['levels']]
+        self.assertTrue(all(b <= a + 1e-9 for a, b in zip(fits, fits[1:])))
+        geometry = compile_obstacles(OBSTACLES)
+        final = evaluate_paths([result['best_individual']], geometry, WIND_SPEED, WIND_DIRECTION)[0]
+        self.assertAlmostEqual(final, fits[-1])
+
+    def test_target_fitness(self):
+        """Test wcześniejszego końca po osiągnięciu docelowego fitness"""
+        result = ProgressiveRefinement(levels=(4, 8, 16), generations=50, population_size=12,
+                                       target_fitness=1e6, verbose=False, seed=0).run()
+        self.assertEqual(len(result['levels']), 1)
+        self.assertEqual(result['levels'][0]['generations'], 1)
+        self.assertEqual(len(result['best_individual']), 16)
+
+    def test_fewer_evaluations_than_direct(self):
+        """Test osiągnięcia fitness długiej trasy mniejszą liczbą ewaluacji niż DE od razu"""
+        progressive = ProgressiveRefinement(levels=(4, 8, 16, 32), generations=30,
+                                            population_size=20, verbose=False, seed=0).run()
+        target = progressive['levels'][-1]['best_fitness']
+        stop = TargetFitness(target)
+        DifferentialEvolution(population_size=20, generations=4 * 30, num_waypoints=32,
+                              observers=[stop], verbose=False, seed=0).run()
+        self.assertFalse(stop.reached)
+
+    def test_cmaes_engine(self):
+        """Test silnika CMA-ES"""
+        result = ProgressiveRefinement(engine='cmaes', levels=(4, 8), generations=10,
+                                       verbose=False, seed=0).run()
+        self.assertEqual(result['algorithm'], 'Progressive CMA-ES')
+        self.assertEqual(len(result['best_individual']), 8)
+
+    def test_invalid_levels(self):
+        """Test walidacji poziomów i silnika"""
+        with self.assertRaises(ValueError):
+            ProgressiveRefinement(levels=(8, 4))
+        with self.assertRaises(ValueError):
+            ProgressiveRefinement(engine='ga')
+
+
+if __name__ == '__main__':
+    unittest.main()
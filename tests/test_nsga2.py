@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy NSGA-II (sortowanie niezdominowane, zatłoczenie, silnik)
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.nsga2 import NSGA2, crowding_distance, evaluate_objectives, non_dominated_sort
+from drone_path_optimization import GRID_WIDTH, GRID_HEIGHT
+from geometry import OccupancyRaster, compile_obstacles, evaluate_paths
+from observers import EarlyStopping
+
+
+def naive_sort(f, v):
+    """Referencyjne sortowanie O(N^2) z pętlami"""
+    n = len(f)
+    rank = np.full(n, -1)
+    remaining = set(range(n))
+    level = 0
+    while remaining:
+        front = [j for j in remaining if not any(
+            v[i] < v[j] or (v[i] == v[j] and (f[i] <= f[j]).all() and (f[i] < f[j]).any())
+            for i in remaining)]
+        for j in front:
+            rank[j] = level
+        remaining -= set(front)
+        level += 1
+    return rank
+
+
+class TestNonDominatedSort(unittest.TestCase):
+    """Testy sortowania niezdominowanego i odległości zatłoczenia"""
+
+    def test_matches_naive(self):
+        """Test zgodności z implementacją referencyjną (remisy, naruszenia, bloki)"""
+        rng = np.random.default_rng(0)
+        for _ in range(3):
+            f = rng.integers(0, 4, (120, 3)).astype(float)
+            v = rng.integers(0, 2, 120)
+            np.testing.assert_array_equal(non_dominated_sort(f, v, chunk=17), naive_sort(f, v))
+
+    def test_n_keep(self):
+        """Test przerwania po sklasyfikowaniu n_keep osobników"""
+        f = np.array([[i, 10 - i] for i in range(5)] + [[i + 1, 11 - i] for i in range(5)], float)
+        rank = non_dominated_sort(f, n_keep=3)
+        np.testing.assert_array_equal(rank, [0] * 5 + [1] * 5)
+        f = np.arange(10, dtype=float)[:, None].repeat(2, axis=1)
+        np.testing.assert_array_equal(non_dominated_sort(f, n_keep=3), [0, 1, 2] + [3] * 7)
+
+    def test_crowding_distance(self):
+        """Test zatłoczenia: skrajne punkty inf, wnętrze wg sąsiadów"""
+        f = np.array([[0, 4], [1, 2], [3, 1], [4, 0], [9, 9]], float)
+        rank = np.array([0, 0, 0, 0, 1])
+        d = crowding_distance(f, rank)
+        self.assertTrue(np.isinf(d[[0, 3, 4]]).all())
+        self.assertAlmostEqual(d[1], 3 / 4 + 3 / 4)
+        self.assertAlmostEqual(d[2], 3 / 4 + 2 / 4)
+
+
+class TestNSGA2(unittest.TestCase):
+    """Testy silnika NSGA-II"""
+
+    def test_objectives(self):
+        """Test kryteriów: odstęp ujemny, kolizje jako naruszenie"""
+        geometry = compile_obstacles([{'type': 'circle', 'center': [50, 50], 'radius': 10}])
+        straight = [[0, 0], [50, 50], [100, 100]]
+        detour = [[0, 0], [10, 90], [100, 100]]
+        obj, violation, _ = evaluate_objectives([straight, detour], geometry)
+        np.testing.assert_array_equal(violation, [2, 0])
+        self.assertLess(obj[0, 0], obj[1, 0])
+        self.assertGreater(obj[0, 2], 0)
+        self.assertLess(obj[1, 2], 0)
+
+    def test_scalar_matches_evaluate_paths(self):
+        """Test fitness skalarnego zgodnego z evaluate_paths (wielokąty i raster)"""
+        rng = np.random.default_rng(1)
+        occupancy = (rng.random((50, 50)) < 0.05).astype(np.uint8)
+        maps = {
+            'polygon': [{'type': 'polygon', 'vertices': [[30, 20], [70, 25], [50, 60]]},
+                        {'type': 'polygon', 'vertices': [[10, 70], [40, 70], [40, 72], [10, 72]]}],
+            'raster': [{'type': 'raster', 'raster': OccupancyRaster(occupancy, resolution=2.0)}],
+        }
+        inner = rng.uniform(0, 100, (40, 6, 2))
+        paths = np.concatenate([np.zeros((40, 1, 2)), inner, np.full((40, 1, 2), 100.0)], axis=1)
+        for name, obstacles in maps.items():
+            with self.subTest(name):
+                geometry = compile_obstacles(obstacles)
+                _, violation, scalar = evaluate_objectives(paths, geometry, 3.0, 45.0)
+                np.testing.assert_allclose(scalar, evaluate_paths(paths, geometry, 3.0, 45.0))
+                self.assertGreater(violation.sum(), 0)
+
+    def test_distance(self):
+        """Test odległości ze znakiem dla koła i prostokąta"""
+        geometry = compile_obstacles([
+            {'type': 'circle', 'center': [0, 0], 'radius': 2},
+            {'type': 'rect', 'x': 10, 'y': 0, 'width': 4, 'height': 4}])
+        d = geometry.distance([[5, 0], [1, 0], [12, 2], [17, 8]])
+        np.testing.assert_allclose(d, [3, -1, -2, 5])
+
+    def test_distance_indexed(self):
+        """Test odległości na mapie z indeksem - zgodność z przeglądem wszystkich przeszkód"""
+        rng = np.random.default_rng(0)
+        obstacles = [{'type': 'circle', 'center': list(c), 'radius': float(r)}
+                     for c, r in zip(rng.uniform(0, 100, (300, 2)), rng.uniform(0.5, 3, 300))]
+        obstacles += [{'type': 'rect', 'x': float(x), 'y': float(y), 'width': 2, 'height': 3}
+                      for x, y in rng.uniform(-10, 110, (50, 2))]
+        geometry = compile_obstacles(obstacles)
+        self.assertIsNotNone(geometry.index)
+        points = rng.uniform(-50, 150, (3000, 2))
+        expected = geometry._distance_primitives(points)
+        np.testing.assert_allclose(geometry.distance(points), expected)
+        np.testing.assert_allclose(geometry.distance(points, max_distance=4.0),
+                                   np.minimum(expected, 4.0))
+
+    def test_run_result(self):
+        """Test wyniku: front Pareto bez kolizji i wzajemnie niezdominowany"""
+        result = NSGA2(population_size=40, generations=15, verbose=False, seed=0).run()
+        self.assertEqual(result['algorithm'], 'NSGA-II')
+        self.assertEqual(len(result['best_fitness']), 15)
+        self.assertEqual(result['evaluations'], 40 * 16)
+        self.assertEqual(result['best_individual'][0], [0, 0])
+        self.assertEqual(result['best_individual'][-1], [GRID_WIDTH, GRID_HEIGHT])
+
+        obj = np.asarray(result['pareto_objectives'])
+        self.assertEqual(len(obj), len(result['pareto_front']))
+        _, violation, _ = evaluate_objectives(result['pareto_front'], NSGA2().geometry)
+        self.assertFalse(violation.any())
+        minimized = obj * [1, 1, -1]
+        self.assertTrue((non_dominated_sort(minimized) == 0).all())
+
+    def test_observers(self):
+        """Test wczesnego zatrzymania przez obserwatora"""
+        nsga = NSGA2(population_size=10, generations=100, verbose=False, seed=0,
+                     observers=[EarlyStopping(patience=2, min_delta=1e6)])
+        result = nsga.run()
+        self.assertEqual(len(result['best_fitness']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy API obserwatorów generacji
+"""
+
+import unittest
+
+import numpy as np
+
+from observers import GenerationObserver, GenerationState, EarlyStopping
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.pso import ParticleSwarmOptimization
+from algorithms.simulated_annealing import SimulatedAnnealing
+from drone_path_optimization import GRID_WIDTH, GRID_HEIGHT, NUM_WAYPOINTS
+
+
+class StopAt(GenerationObserver):
+    """Zatrzymuje bieg po zadanej generacji i zapamiętuje stany"""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.states = []
+
+    def on_generation(self, state):
+        self.states.append(state)
+        if state.generation == self.generation:
+            state.request_stop()
+
+
+class TestGenerationState(unittest.TestCase):
+    """Testy stanu generacji"""
+
+    def test_views_are_read_only(self):
+        """Test że populacja i fitness są tylko do odczytu"""
+        pop = np.zeros((3, 4, 2))
+        state = GenerationState('X', 1, 10, pop, [1.0, 2.0, 3.0], 1.0, 3, 0.0)
+
+        self.assertEqual(state.population.shape, (3, 4, 2))
+        self.assertTrue(np.shares_memory(state.population, pop))
+        with self.assertRaises(ValueError):
+            state.population[0, 0, 0] = 1.0
+        with self.assertRaises(ValueError):
+            state.fitness[0] = 0.0
+
+
+class TestObserversInAlgorithms(unittest.TestCase):
+    """Testy obserwatorów w GA, PSO i SA"""
+
+    def test_request_stop(self):
+        """Test wcześniejszego zatrzymania każdego algorytmu"""
+        for algo in (GeneticAlgorithm(population_size=6, generations=10, verbose=False),
+                     ParticleSwarmOptimization(population_size=6, generations=10, verbose=False),
+                     SimulatedAnnealing(generations=10, verbose=False)):
+            observer = StopAt(3)
+            algo.observers.append(observer)
+            result = algo.run()
+
+            self.assertEqual(len(observer.states), 3)
+            self.assertEqual(len(result['best_fitness']), 3)
+
+    def test_inject_individual(self):
+        """Test wstrzyknięcia osobnika do populacji GA"""
+        straight = [[0, 0]] + [[GRID_WIDTH * k / 7, 0] for k in range(1, 7)] + \
+                   [[GRID_WIDTH, GRID_HEIGHT]]
+
+        class Injector(GenerationObserver):
+            def on_generation(self, state):
+                if state.generation == 1:
+                    state.inject(straight)
+
+        checker = StopAt(2)
+        ga = GeneticAlgorithm(population_size=6, generations=2,
+                              observers=[Injector(), checker], verbose=False)
+        ga.run()
+
+        population = checker.states[1].population
+        self.assertEqual(population.shape[0], 6)
+        # Populacja mniejsza niż elita - po pierwszej generacji oceniany jest tylko wstrzyknięty
+        self.assertEqual(ga.evaluations, 6 + 1)
+
+    def test_inject_resampled_in_pso(self):
+        """Test wstrzyknięcia do PSO trasy o innej liczbie punktów"""
+        class Injector(GenerationObserver):
+            def on_generation(self, state):
+                if state.generation == 1:
+                    state.inject([[0, 0], [GRID_WIDTH / 2, 0], [GRID_WIDTH, GRID_HEIGHT]])
+
+        checker = StopAt(3)
+        pso = ParticleSwarmOptimization(population_size=6, generations=3, obstacles=[], seed=0,
+                                        observers=[Injector(), checker], verbose=False)
+        pso.run()
+        self.assertEqual(np.shape(checker.states[-1].population), (6, NUM_WAYPOINTS, 2))
+
+    def test_early_stopping(self):
+        """Test zatrzymania przy braku poprawy"""
+        state = None
+        stopper = EarlyStopping(patience=2)
+        for gen in range(1, 5):
+            state = GenerationState('X', gen, 10, [[[0, 0]]], [5.0], 5.0, gen, 0.0)
+            stopper.on_generation(state)
+        self.assertTrue(state.stop_requested)
+
+
+if __name__ == "__main__":
+    unittest.main()
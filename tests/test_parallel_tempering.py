@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy wielołańcuchowego Simulated Annealing (parallel tempering)
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.simulated_annealing import SimulatedAnnealing
+from observers import GenerationObserver
+
+
+class ShapeRecorder(GenerationObserver):
+    """Zapamiętuje kształt populacji przekazanej obserwatorom"""
+
+    def __init__(self):
+        self.shapes = []
+
+    def on_generation(self, state):
+        self.shapes.append(state.population.shape)
+
+
+class TestParallelTempering(unittest.TestCase):
+    """Testy trybu chains > 1"""
+
+    def test_temperature_ladder(self):
+        """Test geometrycznej drabiny temperatur"""
+        sa = SimulatedAnnealing(chains=5, max_temp=16.0, min_temp=1.0, verbose=False)
+        np.testing.assert_allclose(sa.temperature_ladder(), [16, 8, 4, 2, 1])
+
+    def test_exchange_moves_better_state_to_cold_chain(self):
+        """Test że lepszy stan z gorącego łańcucha zawsze trafia do zimnego"""
+        sa = SimulatedAnnealing(chains=2, verbose=False)
+        states = np.stack([np.zeros((8, 2)), np.ones((8, 2))])
+        fits = np.array([100.0, 200.0])
+        sa._exchange(states, fits, np.array([10.0, 1.0]), 0)
+        np.testing.assert_allclose(fits, [200.0, 100.0])
+        np.testing.assert_allclose(states[1], 0.0)
+        self.assertEqual(sa.swaps_accepted, 1)
+
+    def test_run(self):
+        """Test przebiegu: wektorowy stan łańcuchów i liczba ewaluacji"""
+        recorder = ShapeRecorder()
+        sa = SimulatedAnnealing(generations=50, chains=6, verbose=False, seed=0, observers=[recorder])
+        result = sa.run()
+        self.assertEqual(result['evaluations'], 6 * 51)
+        self.assertEqual(recorder.shapes[0], (6, 8, 2))
+        self.assertTrue(np.all(np.diff(result['best_fitness']) <= 0))
+        self.assertEqual(result['best_individual'][0], [0, 0])
+        self.assertGreater(sa.swap_attempts, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
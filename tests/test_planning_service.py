@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy lokalnej usługi planowania
+"""
+
+import asyncio
+import unittest
+
+from planning_service import PlanningService, PlanningClient, run_service_in_thread
+
+SCENARIO = {'start': [0, 0], 'goal': [100, 100]}
+
+
+class TestPlanningService(unittest.TestCase):
+    """Testy usługi przez lokalnego klienta HTTP"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = PlanningService(port=0, workers=0)
+        cls.stop = run_service_in_thread(cls.service)
+        cls.client = PlanningClient(port=cls.service.port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stop()
+
+    def test_plan_and_stats(self):
+        """Test planowania i raportu statystyk"""
+        result = self.client.plan(SCENARIO, algorithm='sa', budget={'generations': 20})
+        self.assertEqual(result['best_individual'][0], [0, 0])
+        self.assertEqual(result['best_individual'][-1], [100, 100])
+
+        stats = self.client.stats()
+        self.assertGreaterEqual(stats['completed'], 1)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertIn('p50', stats['latency_ms'])
+
+    def test_invalid_request(self):
+        """Test odrzucenia nieznanego algorytmu"""
+        with self.assertRaises(RuntimeError):
+            self.client.plan(SCENARIO, algorithm='xyz')
+
+
+class TestCoalescing(unittest.TestCase):
+    """Testy łączenia identycznych żądań"""
+
+    def test_identical_requests_are_coalesced(self):
+        """Test że dwa identyczne żądania liczone są raz"""
+        async def scenario():
+            service = PlanningService(port=0, workers=0)
+            await service.start()
+            try:
+                request = {'scenario': SCENARIO, 'algorithm': 'sa', 'budget': {'generations': 10}}
+                first, second = await asyncio.gather(service.submit(request),
+                                                     service.submit(request))
+                return service, first, second
+            finally:
+                await service.stop()
+
+        service, first, second = asyncio.run(scenario())
+        self.assertEqual(first, second)
+        self.assertEqual(service.completed, 1)
+        self.assertEqual(service.coalesced, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
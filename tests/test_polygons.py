@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy przeszkód wielokątnych i indeksu krawędzi
+"""
+
+import unittest
+
+import numpy as np
+
+from drone_path_optimization import evaluate_fitness, is_point_in_obstacle
+from geometry import CompiledObstacles, evaluate_paths, obstacles_bounds
+
+# Wielokąt wklęsły w kształcie litery U
+U_SHAPE = {'type': 'polygon',
+           'vertices': [(20, 20), (80, 20), (80, 80), (60, 80), (60, 40), (40, 40), (40, 80), (20, 80)]}
+
+
+def star(center, radius, n, rng):
+    """Wielokąt gwiaździsty o n wierzchołkach"""
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    r = radius * (0.6 + 0.4 * rng.random(n))
+    return np.c_[center[0] + r * np.cos(angles), center[1] + r * np.sin(angles)]
+
+
+class TestPolygons(unittest.TestCase):
+    """Testy wielokątów w skompilowanej geometrii"""
+
+    def test_contains_concave(self):
+        """Test parzystości promienia dla wielokąta wklęsłego"""
+        geometry = CompiledObstacles([U_SHAPE])
+        points = [[30, 50], [50, 50], [50, 30], [70, 70], [90, 50], [10, 10]]
+        expected = [True, False, True, True, False, False]
+        np.testing.assert_array_equal(geometry.contains(points), expected)
+        for point, inside in zip(points, expected):
+            self.assertEqual(is_point_in_obstacle(point, [U_SHAPE]), inside)
+
+    def test_contains_matches_matplotlib(self):
+        """Test zgodności z matplotlib.path dla wielu wielokątów o 200 wierzchołkach"""
+        from matplotlib.path import Path
+
+        rng = np.random.default_rng(0)
+        polygons = [star(rng.uniform(10, 90, 2), rng.uniform(3, 10), 200, rng) for _ in range(8)]
+        geometry = CompiledObstacles([{'type': 'polygon', 'vertices': p.tolist()} for p in polygons])
+        points = rng.uniform(0, 100, (20000, 2))
+        expected = np.zeros(len(points), dtype=bool)
+        for p in polygons:
+            expected |= Path(p).contains_points(points)
+        np.testing.assert_array_equal(geometry.contains(points), expected)
+
+    def test_segments_exact(self):
+        """Test dokładnego przecięcia - cienki wielokąt między próbkami też blokuje"""
+        sliver = {'type': 'polygon', 'vertices': [(50, 0), (50.01, 0), (50.01, 100), (50, 100)]}
+        geometry = CompiledObstacles([sliver, U_SHAPE])
+        a = np.array([[0, 90], [45, 50], [50, 50], [30, 30], [0, 10]], dtype=float)
+        b = np.array([[100, 90], [55, 50], [50, 55], [35, 35], [10, 10]], dtype=float)
+        # Kolejno: przez cienki pas, wewnątrz wcięcia U (przez pas), wzdłuż pasa, wewnątrz U, poza
+        np.testing.assert_array_equal(geometry.segments_blocked(a, b),
+                                      [True, True, True, True, False])
+
+    def test_segments_3d(self):
+        """Test przelotu nad wielokątem o skończonej wysokości"""
+        geometry = CompiledObstacles([dict(U_SHAPE, top=10)])
+        self.assertTrue(geometry.segments_blocked([0, 30, 5], [100, 30, 5]))
+        self.assertFalse(geometry.segments_blocked([0, 30, 12], [100, 30, 12]))
+        # Wznoszenie: wlot na wysokości 5, wylot na 15 - przecięcie krawędzi poniżej wierzchołka
+        self.assertTrue(geometry.segments_blocked([10, 30, 0], [90, 30, 20]))
+
+    def test_fitness_and_bounds(self):
+        """Test funkcji celu i prostokąta otaczającego z wielokątem"""
+        obstacles = [U_SHAPE, {'type': 'circle', 'center': (90, 90), 'radius': 3}]
+        geometry = CompiledObstacles(obstacles)
+        path = [[0, 0], [30, 10], [30, 90], [100, 100]]
+        vectorized = evaluate_paths([path], geometry, 5.0, 45)[0]
+        self.assertAlmostEqual(vectorized, evaluate_fitness(path, obstacles)[0])
+        lo, hi = obstacles_bounds(obstacles)
+        np.testing.assert_array_equal(lo, [20, 20])
+        np.testing.assert_array_equal(hi, [93, 93])
+
+    def test_distance(self):
+        """Test odległości ze znakiem od wielokąta"""
+        geometry = CompiledObstacles([U_SHAPE])
+        np.testing.assert_allclose(geometry.distance([[50, 50], [30, 50], [10, 50]]),
+                                   [10, -10, 10])
+
+    def test_distance_indexed(self):
+        """Test odległości przez siatkę indeksu - zgodność z przeglądem wszystkich krawędzi"""
+        rng = np.random.default_rng(2)
+        polygons = [star(rng.uniform(10, 90, 2), rng.uniform(2, 6), 50, rng) for _ in range(20)]
+        index = CompiledObstacles([{'type': 'polygon', 'vertices': p.tolist()}
+                                   for p in polygons]).polygons
+        points = rng.uniform(-100, 200, (3000, 2))
+        edges = np.arange(len(index.edge_a))
+        expected = index._edge_distance(points[:, None], edges).min(axis=1)
+        expected = np.where(index.contains(points), -expected, expected)
+        np.testing.assert_allclose(index.distance(points), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
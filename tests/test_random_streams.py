@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy powtarzalności biegów (seed, strumienie potomne dla procesów)
+"""
+
+import contextlib
+import io
+import random
+import unittest
+
+import numpy as np
+
+from algorithms.cma_es import CMAES
+from algorithms.differential_evolution import DifferentialEvolution
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.nsga2 import NSGA2
+from algorithms.pso import ParticleSwarmOptimization
+from algorithms.simulated_annealing import SimulatedAnnealing
+from drone_path_optimization import run_algorithm
+from mission_planner import plan_missions
+from multiresolution import ProgressiveRefinement
+from observers import GenerationObserver
+from random_streams import make_rng, spawn_seeds
+
+ENGINES = {
+    'ga': lambda seed: GeneticAlgorithm(population_size=12, generations=4, verbose=False,
+                                        memetic=True, seed=seed),
+    'ga_variable': lambda seed: GeneticAlgorithm(population_size=12, generations=4, verbose=False,
+                                                 variable_length=True, surrogate=True, seed=seed),
+    'pso': lambda seed: ParticleSwarmOptimization(population_size=12, generations=4,
+                                                  verbose=False, seed=seed),
+    'sa': lambda seed: SimulatedAnnealing(generations=30, chains=3, verbose=False, seed=seed),
+    'de': lambda seed: DifferentialEvolution(population_size=12, generations=4,
+                                             verbose=False, seed=seed),
+    'cmaes': lambda seed: CMAES(generations=4, verbose=False, seed=seed),
+    'nsga2': lambda seed: NSGA2(population_size=12, generations=4, verbose=False, seed=seed),
+    'progressive': lambda seed: ProgressiveRefinement(levels=(4, 8), generations=4,
+                                                      population_size=10, verbose=False, seed=seed),
+}
+
+
+def run(name, seed):
+    """Najlepsza trasa i historia fitness biegu"""
+    result = ENGINES[name](seed).run()
+    return np.asarray(result['best_individual'], dtype=float), list(result['best_fitness'])
+
+
+class TestSeededEngines(unittest.TestCase):
+    """Testy ziarna w każdym algorytmie"""
+
+    def test_same_seed_same_result(self):
+        """Test identycznego wyniku dla tego samego ziarna"""
+        for name in ENGINES:
+            with self.subTest(engine=name):
+                first, second = run(name, 7), run(name, 7)
+                np.testing.assert_array_equal(first[0], second[0])
+                self.assertEqual(first[1], second[1])
+
+    def test_different_seed(self):
+        """Test różnych tras dla różnych ziaren"""
+        for name in ENGINES:
+            with self.subTest(engine=name):
+                first, second = run(name, 1), run(name, 2)
+                self.assertFalse(first[0].shape == second[0].shape
+                                 and np.array_equal(first[0], second[0]))
+
+    def test_generator_and_global_state(self):
+        """Test przyjęcia gotowego generatora i nienaruszonego stanu globalnego"""
+        random.seed(3)
+        np.random.seed(3)
+        expected = random.random(), np.random.random()
+        random.seed(3)
+        np.random.seed(3)
+        for name in ENGINES:
+            first = run(name, np.random.default_rng(5))
+            np.testing.assert_array_equal(first[0], run(name, 5)[0])
+        self.assertEqual((random.random(), np.random.random()), expected)
+
+    def test_run_algorithm(self):
+        """Test powtarzalności podstawowego GA z DEAP (run_algorithm)"""
+        class StopAt(GenerationObserver):
+            def on_generation(self, state):
+                if state.generation == 3:
+                    state.request_stop()
+
+        def run_ga(seed):
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_algorithm(observers=[StopAt()], verbose=False, seed=seed)
+            return [list(p) for p in result['best_individual']], result['best_fitness']
+
+        self.assertEqual(run_ga(7), run_ga(7))
+        self.assertNotEqual(run_ga(8)[0], run_ga(7)[0])
+
+    def test_spawn_seeds(self):
+        """Test niezależnych i powtarzalnych strumieni potomnych"""
+        draws = [make_rng(s).random() for s in spawn_seeds(11, 3)]
+        self.assertEqual(len(set(draws)), 3)
+        self.assertEqual(draws, [make_rng(s).random() for s in spawn_seeds(11, 3)])
+        self.assertEqual(len(spawn_seeds(np.random.default_rng(0), 4)), 4)
+
+
+class TestParallelReproducibility(unittest.TestCase):
+    """Testy niezależności wyniku od liczby procesów"""
+
+    def test_serial_equals_parallel(self):
+        """Test identycznych tras szeregowo i w dwóch procesach"""
+        missions = [([0, 0], [100, 100]), ([0, 100], [100, 0]), ([10, 50], [90, 50])]
+        for algorithm in ('ga', 'pso'):
+            with self.subTest(algorithm=algorithm):
+                serial = plan_missions(missions, algorithm, workers=0, seed=42,
+                                       population_size=10, generations=3)
+                parallel = plan_missions(missions, algorithm, workers=2, seed=42,
+                                         population_size=10, generations=3)
+                self.assertEqual([r['best_individual'] for r in serial],
+                                 [r['best_individual'] for r in parallel])
+                self.assertEqual([r['fitness'] for r in serial],
+                                 [r['fitness'] for r in parallel])
+
+
+if __name__ == '__main__':
+    unittest.main()
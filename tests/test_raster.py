@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy rastrów zajętości (także mapowanych z pliku)
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from drone_path_optimization import is_point_in_obstacle
+from geometry import CompiledObstacles, OccupancyRaster, compile_obstacles, obstacles_bounds
+
+
+def random_occupancy(rng, shape=(60, 80), fill=0.08):
+    """Losowa siatka zajętości (ny, nx)"""
+    return rng.random(shape) < fill
+
+
+class TestOccupancyRaster(unittest.TestCase):
+    """Testy zapytań do rastra zajętości"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.occ = random_occupancy(self.rng)
+        self.raster = OccupancyRaster(self.occ.astype(np.uint8), origin=(-5, 10), resolution=0.5)
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_contains(self):
+        """Test zajętości punktów, także poza rastrem (wolne)"""
+        points = self.rng.uniform(-15, 50, (5000, 2))
+        g = np.floor((points - [-5, 10]) / 0.5).astype(int)
+        valid = (g >= 0).all(axis=1) & (g < [80, 60]).all(axis=1)
+        expected = np.zeros(len(points), dtype=bool)
+        expected[valid] = self.occ[g[valid, 1], g[valid, 0]]
+        np.testing.assert_array_equal(self.raster.contains(points), expected)
+
+    def test_packed_matches_unpacked(self):
+        """Test rastra bitowego (np.packbits) zgodnego z rastrem uint8"""
+        packed = OccupancyRaster(np.packbits(self.occ, axis=1), origin=(-5, 10), resolution=0.5,
+                                 packed=True, width=80)
+        points = self.rng.uniform(-15, 50, (5000, 2))
+        np.testing.assert_array_equal(packed.contains(points), self.raster.contains(points))
+        a, b = points[:2500], points[2500:]
+        np.testing.assert_array_equal(packed.segments_hit(a, b), self.raster.segments_hit(a, b))
+
+    def test_segments_match_dense_sampling(self):
+        """Test DDA zgodnego z bardzo gęstym próbkowaniem odcinków"""
+        a = self.rng.uniform(-15, 50, (2000, 2))
+        b = a + self.rng.normal(0, 8, (2000, 2))
+        t = np.linspace(0, 1, 2001)[:, None, None]
+        samples = (a + t * (b - a)).reshape(-1, 2)
+        sampled = self.raster.contains(samples).reshape(len(t), -1).any(axis=0)
+        hit = self.raster.segments_hit(a, b)
+        np.testing.assert_array_equal(hit, sampled)
+        self.assertTrue(hit.any() and not hit.all())
+
+    def test_distance(self):
+        """Test odległości ze znakiem zgodnej z dokładną odległością od zajętych komórek"""
+        points = self.rng.uniform(-3, 30, (300, 2))
+        cells = np.argwhere(self.occ)[:, ::-1] * 0.5 + [-5, 10]
+        lo, hi = cells[None], cells[None] + 0.5
+        outside = np.maximum(np.maximum(lo - points[:, None], points[:, None] - hi), 0)
+        exact = np.sqrt((outside ** 2).sum(axis=-1)).min(axis=1)
+        dist = self.raster.distance(points)
+        free = ~self.raster.contains(points)
+        np.testing.assert_allclose(dist[free], np.minimum(exact[free], 8 * 0.5))
+        self.assertTrue((dist[~free] <= 0).all())
+
+    def test_memmap_file(self):
+        """Test rastra z pliku: skrót bez czytania danych, pickle jako ścieżka"""
+        path = os.path.join(self.tmp, 'map.bin')
+        np.packbits(self.occ, axis=1).tofile(path)
+        raster = OccupancyRaster.open(path, shape=self.occ.shape, packed=True,
+                                      origin=(-5, 10), resolution=0.5)
+        self.assertIsInstance(raster.data, np.memmap)
+        obstacles = [{'type': 'raster', 'raster': raster}]
+        geometry = compile_obstacles(obstacles)
+        self.assertIs(compile_obstacles(obstacles), geometry)
+
+        restored = pickle.loads(pickle.dumps(geometry))
+        self.assertIsInstance(restored.rasters[0].data, np.memmap)
+        points = self.rng.uniform(-15, 50, (1000, 2))
+        np.testing.assert_array_equal(restored.contains(points), self.raster.contains(points))
+
+    def test_compiled_obstacles(self):
+        """Test rastra obok zwykłych przeszkód i w teście skalarnym"""
+        obstacles = [{'type': 'raster', 'raster': self.raster},
+                     {'type': 'circle', 'center': (100, 100), 'radius': 5}]
+        geometry = CompiledObstacles(obstacles)
+        points = self.rng.uniform(-15, 50, (200, 2))
+        np.testing.assert_array_equal(geometry.contains(points), self.raster.contains(points))
+        for point in points[:50]:
+            self.assertEqual(is_point_in_obstacle(point, obstacles),
+                             bool(self.raster.contains(point[None])[0]))
+        # Punkty 3D - raster jest nieskończenie wysoki
+        points3 = np.c_[points, np.full(len(points), 100.0)]
+        np.testing.assert_array_equal(geometry.contains(points3), self.raster.contains(points))
+        lo, hi = obstacles_bounds(obstacles)
+        np.testing.assert_allclose(lo, [-5, 10])
+        np.testing.assert_allclose(hi, [105, 105])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy przyrostowego przeplanowania GA po zmianie przeszkód
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from geometry import obstacles_bounds, segments_touch_bounds
+from observers import GenerationObserver
+
+
+class TestSegmentsTouchBounds(unittest.TestCase):
+    """Testy prefiltru prostokątów otaczających"""
+
+    def test_touch(self):
+        """Test trasy dotykającej i omijającej obszar zmiany"""
+        paths = np.array([[[0, 0], [10, 10], [20, 0]],
+                          [[0, 50], [10, 60], [20, 50]]], dtype=float)
+        bounds = obstacles_bounds([{'type': 'circle', 'center': (15, 5), 'radius': 1}])
+        np.testing.assert_array_equal(segments_touch_bounds(paths, bounds), [True, False])
+
+    def test_empty_diff(self):
+        """Test braku zmian"""
+        paths = np.zeros((3, 4, 2))
+        self.assertFalse(segments_touch_bounds(paths, obstacles_bounds([])).any())
+
+
+class TestReplan(unittest.TestCase):
+    """Testy GeneticAlgorithm.replan"""
+
+    def setUp(self):
+        self.ga = GeneticAlgorithm(population_size=20, generations=10, verbose=False)
+        self.result = self.ga.run()
+
+    def test_only_touched_individuals_rescored(self):
+        """Test że ponownie oceniani są tylko dotknięci osobnicy"""
+        added = {'type': 'rect', 'x': 90, 'y': 0, 'width': 5, 'height': 5}
+        population = self.result['population']
+        expected = int(segments_touch_bounds(np.asarray(population, dtype=float),
+                                             obstacles_bounds([added])).sum())
+
+        before = self.ga.evaluations
+        observer_fits = []
+
+        class FirstGeneration(GenerationObserver):
+            def on_generation(self, state):
+                if state.generation == 1:
+                    observer_fits.append(state.evaluations)
+
+        self.ga.observers.append(FirstGeneration())
+        self.ga.replan(population, {'added': [added]}, generations=2)
+
+        self.assertEqual(self.ga.rescored, expected)
+        self.assertEqual(observer_fits[0] - before, expected)
+        self.assertIn(added, self.ga.geometry.obstacles)
+
+    def test_removed_obstacle(self):
+        """Test usunięcia przeszkody z mapy"""
+        removed = self.ga.geometry.obstacles[0]
+        result = self.ga.replan(self.result['population'], {'removed': [removed]},
+                                generations=2)
+        self.assertNotIn(removed, self.ga.geometry.obstacles)
+        self.assertEqual(len(result['population']), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
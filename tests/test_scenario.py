@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy wczytywania scenariuszy, cache skompilowanej geometrii i indeksu przeszkód
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import scenario
+from geometry import CompiledObstacles
+from scenario import compute_distance_field, load_scenario, parse_scenario
+
+SCENARIO = {
+    'name': 'test',
+    'grid': {'width': 60, 'height': 40},
+    'wind': {'speed': 2.0, 'direction': 90},
+    'start': [0, 0],
+    'goal': [60, 40],
+    'obstacles': [
+        {'type': 'circle', 'center': [20, 20], 'radius': 5},
+        {'type': 'rect', 'x': 35, 'y': 10, 'width': 10, 'height': 15},
+    ],
+}
+
+GEOJSON = {
+    'type': 'FeatureCollection',
+    'properties': {'name': 'geo', 'start': [0, 0], 'goal': [50, 50]},
+    'features': [
+        {'type': 'Feature', 'properties': {'radius': 3, 'top': 12},
+         'geometry': {'type': 'Point', 'coordinates': [10, 10]}},
+        {'type': 'Feature', 'properties': {},
+         'geometry': {'type': 'Polygon',
+                      'coordinates': [[[20, 20], [30, 20], [30, 30], [20, 20]]]}},
+    ],
+}
+
+
+def random_obstacles(n, rng, size=200.0):
+    """Losowa mapa n/2 kół i n/2 prostokątów"""
+    circles = [{'type': 'circle', 'center': rng.uniform(0, size, 2).tolist(),
+                'radius': float(rng.uniform(0.5, 3))} for _ in range(n // 2)]
+    rects = [{'type': 'rect', 'x': float(x), 'y': float(y),
+              'width': float(rng.uniform(0.5, 5)), 'height': float(rng.uniform(0.5, 5))}
+             for x, y in rng.uniform(0, size, (n - n // 2, 2))]
+    return circles + rects
+
+
+class TestScenario(unittest.TestCase):
+    """Testy scenariuszy z plików"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = os.path.join(self.tmp, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, data, name='scenario.json'):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+    def test_parse_scenario(self):
+        """Test odczytu siatki, wiatru, startu, mety i przeszkód"""
+        parsed = parse_scenario(SCENARIO)
+        self.assertEqual((parsed['width'], parsed['height']), (60.0, 40.0))
+        self.assertEqual((parsed['wind_speed'], parsed['wind_direction']), (2.0, 90.0))
+        self.assertEqual(parsed['goal'], [60.0, 40.0])
+        self.assertEqual(len(parsed['obstacles']), 2)
+
+    def test_geojson(self):
+        """Test GeoJSON: punkt z promieniem to koło, wielokąt bez zamykającego wierzchołka"""
+        parsed = parse_scenario(GEOJSON)
+        circle, polygon = parsed['obstacles']
+        self.assertEqual(parsed['name'], 'geo')
+        self.assertEqual(circle, {'type': 'circle', 'center': [10, 10], 'radius': 3.0, 'top': 12.0})
+        self.assertEqual(polygon['vertices'], [[20, 20], [30, 20], [30, 30]])
+        with self.assertRaises(ValueError):
+            parse_scenario({'type': 'FeatureCollection', 'features': [
+                {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [1, 1]}}]})
+
+    def test_cache_hit_skips_compilation(self):
+        """Test ponownego wczytania z cache bez kompilacji przeszkód"""
+        path = self._write(SCENARIO)
+        first = load_scenario(path, cache_dir=self.cache)
+        with mock.patch.object(scenario, 'CompiledObstacles',
+                               side_effect=AssertionError("kompilacja mimo cache")):
+            second = load_scenario(path, cache_dir=self.cache)
+        self.assertEqual(first.key, second.key)
+        np.testing.assert_array_equal(first.distance_field.values, second.distance_field.values)
+        paths = np.array([[[0, 0], [20, 20], [60, 40]], [[0, 0], [30, 35], [60, 40]]], dtype=float)
+        np.testing.assert_allclose(first.evaluate(paths), second.evaluate(paths))
+
+    def test_cache_key_follows_content(self):
+        """Test zmiany klucza po zmianie zawartości pliku"""
+        path = self._write(SCENARIO)
+        first = load_scenario(path, cache_dir=self.cache)
+        changed = dict(SCENARIO, obstacles=SCENARIO['obstacles'][:1])
+        second = load_scenario(self._write(changed), cache_dir=self.cache)
+        self.assertNotEqual(first.key, second.key)
+        self.assertEqual(len(second.obstacles), 1)
+
+    def test_distance_field(self):
+        """Test pola odległości zgodnego z dokładną odległością (obciętą)"""
+        triangle = {'type': 'polygon', 'vertices': [[5, 30], [15, 30], [10, 38]]}
+        geometry = CompiledObstacles(SCENARIO['obstacles'] + [triangle])
+        field = compute_distance_field(geometry, 60, 40, resolution=1.0, max_distance=8.0)
+        nodes = np.stack(np.meshgrid(np.arange(61.0), np.arange(41.0)), axis=-1)
+        np.testing.assert_allclose(field(nodes), np.minimum(geometry.distance(nodes), 8.0))
+        # Między węzłami błąd interpolacji nie przekracza przekątnej komórki
+        points = np.random.default_rng(0).uniform(0, 40, (500, 2))
+        exact = np.minimum(geometry.distance(points), 8.0)
+        self.assertLess(np.abs(field(points) - exact).max(), np.sqrt(2))
+
+    def test_engine_kwargs(self):
+        """Test argumentów algorytmu ze scenariusza"""
+        from algorithms.differential_evolution import DifferentialEvolution
+
+        loaded = load_scenario(self._write(SCENARIO), cache_dir=None)
+        de = DifferentialEvolution(population_size=10, generations=2, verbose=False,
+                                   **loaded.engine_kwargs())
+        result = de.run()
+        self.assertEqual(list(result['best_individual'][-1]), [60.0, 40.0])
+        # Fitness algorytmu liczony przy wietrze scenariusza
+        self.assertEqual((de.wind_speed, de.wind_direction), (2.0, 90.0))
+        np.testing.assert_allclose(de.fitnesses, loaded.evaluate(de.population))
+
+    def test_nsga2_clearance_from_field(self):
+        """Test kryterium odstępu NSGA-II z pola odległości scenariusza"""
+        from algorithms.nsga2 import NSGA2, evaluate_objectives
+
+        loaded = load_scenario(self._write(SCENARIO), cache_dir=None)
+        paths = np.array([[[0, 0], [10, 30], [60, 40]], [[0, 0], [30, 5], [60, 40]]], dtype=float)
+        exact = evaluate_objectives(paths, loaded.geometry)[0][:, 2]
+        field = evaluate_objectives(paths, loaded.geometry,
+                                    distance_field=loaded.distance_field)[0][:, 2]
+        np.testing.assert_allclose(field, np.maximum(exact, -loaded.distance_field.max_distance),
+                                   atol=np.sqrt(2))
+
+        nsga = NSGA2(population_size=10, generations=2, verbose=False, seed=0,
+                     **loaded.engine_kwargs(distance_field=True))
+        self.assertIs(nsga.distance_field, loaded.distance_field)
+        with mock.patch.object(loaded.geometry, 'distance',
+                               side_effect=AssertionError("odległość liczona mimo pola")):
+            result = nsga.run()
+        self.assertEqual(list(result['best_individual'][-1]), [60.0, 40.0])
+
+
+class TestPrimitiveIndex(unittest.TestCase):
+    """Testy siatki kół i prostokątów dla dużych map"""
+
+    def test_matches_brute_force(self):
+        """Test zgodności zapytań z indeksem i bez niego (2D i 3D)"""
+        rng = np.random.default_rng(1)
+        obstacles = random_obstacles(400, rng)
+        for o in obstacles[::3]:
+            o['top'] = 10.0
+        indexed = CompiledObstacles(obstacles)
+        brute = CompiledObstacles(obstacles)
+        brute.index = None
+        self.assertIsNotNone(indexed.index)
+
+        points = np.c_[rng.uniform(-10, 210, (5000, 2)), rng.uniform(0, 20, 5000)]
+        np.testing.assert_array_equal(indexed.contains(points[:, :2]), brute.contains(points[:, :2]))
+        np.testing.assert_array_equal(indexed.contains(points), brute.contains(points))
+        a, b = points[:2500, :2], points[2500:, :2]
+        np.testing.assert_array_equal(indexed.segments_blocked(a, b), brute.segments_blocked(a, b))
+
+    def test_small_maps_unindexed(self):
+        """Test braku indeksu dla kilku przeszkód"""
+        self.assertIsNone(CompiledObstacles(SCENARIO['obstacles']).index)
+
+
+if __name__ == '__main__':
+    unittest.main()
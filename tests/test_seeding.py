@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy seedingu populacji trasami z A*
+"""
+
+import unittest
+
+import numpy as np
+
+from seeding import astar_seed_paths, occupancy_grid
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.simulated_annealing import SimulatedAnnealing
+from geometry import compile_obstacles
+
+# Ściana z jednym przejściem przy górnej krawędzi
+WALL = [{'type': 'rect', 'x': 45, 'y': 0, 'width': 10, 'height': 80}]
+
+
+class TestAStarSeeding(unittest.TestCase):
+    """Testy tras startowych z A*"""
+
+    def setUp(self):
+        self.geometry = compile_obstacles(WALL)
+
+    def test_seeds_are_feasible(self):
+        """Test że trasy startowe omijają ścianę i mają poprawne końce"""
+        seeds = np.array(astar_seed_paths(self.geometry, [0, 0], [100, 0], count=6,
+                                          rng=np.random.default_rng(0)))
+        self.assertEqual(seeds.shape, (6, 8, 2))
+        np.testing.assert_allclose(seeds[:, 0], [[0, 0]] * 6)
+        np.testing.assert_allclose(seeds[:, -1], [[100, 0]] * 6)
+        self.assertFalse(self.geometry.segments_blocked(seeds[:, :-1], seeds[:, 1:]).any())
+
+    def test_no_connection_returns_empty(self):
+        """Test braku tras gdy meta jest odcięta"""
+        box = [{'type': 'rect', 'x': 70, 'y': 0, 'width': 30, 'height': 5},
+               {'type': 'rect', 'x': 70, 'y': 0, 'width': 5, 'height': 30},
+               {'type': 'rect', 'x': 70, 'y': 25, 'width': 30, 'height': 5}]
+        seeds = astar_seed_paths(compile_obstacles(box), [0, 0], [90, 15])
+        self.assertEqual(seeds, [])
+
+    def test_occupancy_margin(self):
+        """Test poszerzenia przeszkód o margines"""
+        tight, _, _ = occupancy_grid(self.geometry, margin=0)
+        wide, _, _ = occupancy_grid(self.geometry, margin=2)
+        self.assertGreater(wide.sum(), tight.sum())
+
+    def test_engines_use_seeding(self):
+        """Test że GA i SA startują od bezkolizyjnych tras"""
+        ga = GeneticAlgorithm(population_size=10, generations=1, obstacles=WALL,
+                              goal=[100, 0], verbose=False, seeding='astar')
+        sa = SimulatedAnnealing(generations=1, obstacles=WALL, goal=[100, 0],
+                                verbose=False, seeding='astar')
+        for algo in (ga, sa):
+            best = np.array(algo.run()['best_individual'], dtype=float)
+            self.assertFalse(self.geometry.segments_blocked(best[:-1], best[1:]).any())
+
+    def test_unknown_seeding(self):
+        """Test błędu dla nieznanego seedingu"""
+        ga = GeneticAlgorithm(population_size=4, generations=1, verbose=False, seeding='foo')
+        with self.assertRaises(ValueError):
+            ga.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
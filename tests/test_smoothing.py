@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy skracania i wygładzania tras
+"""
+
+import unittest
+
+import numpy as np
+
+from smoothing import relax_path, smooth_path
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.pso import ParticleSwarmOptimization
+from geometry import compile_obstacles, path_lengths
+
+WALL = [{'type': 'rect', 'x': 45, 'y': 0, 'width': 10, 'height': 80}]
+ZIGZAG = [[0, 0], [20, 60], [30, 10], [40, 90], [60, 95], [70, 85], [80, 95], [100, 0]]
+
+
+class TestSmoothing(unittest.TestCase):
+    """Testy post-optymalizacji trasy"""
+
+    def setUp(self):
+        self.geometry = compile_obstacles(WALL)
+
+    def test_zigzag_is_shortened(self):
+        """Test skrócenia zygzaka z zachowaniem końców i braku kolizji"""
+        path, fitness = smooth_path(ZIGZAG, self.geometry)
+        self.assertEqual(path.shape, (8, 2))
+        np.testing.assert_allclose(path[[0, -1]], [[0, 0], [100, 0]])
+        self.assertLess(path_lengths([path])[0], path_lengths([ZIGZAG])[0])
+        self.assertFalse(self.geometry.segments_blocked(path[:-1], path[1:]).any())
+
+    def test_straight_line_in_free_space(self):
+        """Test że bez przeszkód trasa staje się odcinkiem"""
+        path, _ = smooth_path(ZIGZAG, compile_obstacles([]))
+        self.assertAlmostEqual(path_lengths([path])[0], 100.0, places=6)
+
+    def test_relax_never_longer(self):
+        """Test że lokalne ruchy nie wydłużają trasy"""
+        path, _ = smooth_path(ZIGZAG, self.geometry, iterations=0)
+        relaxed = relax_path(path, self.geometry)
+        self.assertLessEqual(path_lengths([relaxed])[0], path_lengths([path])[0] + 1e-9)
+
+    def test_engine_option(self):
+        """Test opcji smooth w algorytmach"""
+        ga = GeneticAlgorithm(population_size=10, generations=3, verbose=False, smooth=True)
+        result = ga.run()
+        self.assertLessEqual(result['smoothed_fitness'], min(result['best_fitness']) + 1e-9)
+        self.assertEqual(result['best_individual'].fitness.values[0], result['smoothed_fitness'])
+
+        pso = ParticleSwarmOptimization(population_size=10, generations=3, verbose=False)
+        self.assertNotIn('smoothed_fitness', pso.run())
+
+
+if __name__ == '__main__':
+    unittest.main()
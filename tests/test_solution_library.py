@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy biblioteki tras (ciepły start)
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from solution_library import SolutionLibrary, plan_with_library
+from algorithms.simulated_annealing import SimulatedAnnealing
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.differential_evolution import DifferentialEvolution
+from drone_path_optimization import OBSTACLES
+from geometry import compile_obstacles, evaluate_paths, resample_path
+
+PATH = [[0, 0], [10, 40], [60, 90], [100, 100]]
+
+
+class TestResample(unittest.TestCase):
+    """Testy przepróbkowania trasy"""
+
+    def test_resample_keeps_endpoints(self):
+        """Test zachowania końców i liczby punktów"""
+        resampled = resample_path(PATH, 8)
+        self.assertEqual(resampled.shape, (8, 2))
+        np.testing.assert_allclose(resampled[0], [0, 0])
+        np.testing.assert_allclose(resampled[-1], [100, 100])
+
+
+class TestSolutionLibrary(unittest.TestCase):
+    """Testy biblioteki tras"""
+
+    def test_nearest_prefers_same_map(self):
+        """Test że trasa z tej samej mapy wygrywa z nieco bliższą z innej"""
+        library = SolutionLibrary()
+        library.add('other', [0, 0], [100, 100], PATH, 200.0)
+        library.add('map', [3, 0], [100, 100], PATH, 210.0)
+
+        best = library.nearest([0, 0], [100, 100], fingerprint='map', k=1)[0]
+        self.assertEqual(best['fingerprint'], 'map')
+
+    def test_seed_paths_match_new_endpoints(self):
+        """Test dopasowania tras do nowego startu i mety"""
+        library = SolutionLibrary()
+        library.add('map', [0, 0], [100, 100], PATH, 200.0)
+
+        seeds = library.seed_paths([5, 5], [90, 95], count=4, num_waypoints=8)
+        self.assertEqual(len(seeds), 4)
+        for seed in seeds:
+            self.assertEqual(len(seed), 8)
+            np.testing.assert_allclose(seed[0], [5, 5])
+            np.testing.assert_allclose(seed[-1], [90, 95])
+
+    def test_save_and_load(self):
+        """Test trwałości biblioteki"""
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        os.remove(path)
+        try:
+            library = SolutionLibrary(path)
+            plan_with_library(library, SimulatedAnnealing, [0, 0], [100, 100],
+                              generations=10, verbose=False)
+            self.assertEqual(len(SolutionLibrary(path)), 1)
+        finally:
+            os.remove(path)
+
+    def test_warm_start_seeds_population(self):
+        """Test że ciepły start poprawia populację początkową GA"""
+        library = SolutionLibrary()
+        plan_with_library(library, GeneticAlgorithm, [0, 0], [100, 100],
+                          population_size=20, generations=40, verbose=False)
+        recorded = library.entries[0]['fitness']
+
+        warm = plan_with_library(library, GeneticAlgorithm, [0, 0], [100, 100],
+                                 population_size=20, generations=1, verbose=False)
+        self.assertLessEqual(warm['best_fitness'][0], recorded + 1e-9)
+
+    def test_seeded_warm_start_is_reproducible(self):
+        """Test powtarzalności ciepłego startu z tym samym ziarnem (zaburzenia i algorytm)"""
+        library = SolutionLibrary()
+        plan_with_library(library, GeneticAlgorithm, [0, 0], [100, 100],
+                          population_size=12, generations=5, verbose=False, seed=1)
+
+        def run(seed):
+            copy = SolutionLibrary()
+            copy.entries = [dict(e) for e in library.entries]
+            return plan_with_library(copy, GeneticAlgorithm, [0, 0], [100, 100], seed=seed,
+                                     population_size=12, generations=5, verbose=False)
+
+        first, second = run(7), run(7)
+        self.assertEqual(first['best_individual'], second['best_individual'])
+        self.assertEqual(first['best_fitness'], second['best_fitness'])
+        self.assertNotEqual(run(8)['best_individual'], first['best_individual'])
+
+    def test_engine_waypoints_and_wind(self):
+        """Test ciepłego startu z liczbą waypointów algorytmu i zapisu fitness przy jego wietrze"""
+        library = SolutionLibrary()
+        plan_with_library(library, GeneticAlgorithm, [0, 0], [100, 100],
+                          population_size=12, generations=3, verbose=False, seed=0)
+        result = plan_with_library(library, DifferentialEvolution, [0, 0], [100, 100],
+                                   population_size=12, generations=3, num_waypoints=12,
+                                   wind_speed=0.0, verbose=False, seed=0)
+        self.assertEqual(len(result['best_individual']), 12)
+        entry = library.entries[-1]
+        expected = evaluate_paths([entry['path']], compile_obstacles(OBSTACLES), 0.0, 0.0)[0]
+        self.assertAlmostEqual(entry['fitness'], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy leniwych importów (szybki start procesów roboczych)
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_heavy_modules(code):
+    """Uruchamia kod w nowym procesie i zwraca załadowane ciężkie moduły"""
+    probe = code + "\nimport sys\nprint([m for m in ('matplotlib', 'deap') if m in sys.modules])"
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1]
+
+
+class TestLazyImports(unittest.TestCase):
+    """Testy importów bez matplotlib i DEAP"""
+
+    def test_import_algorithms_is_light(self):
+        """Test że import algorytmów nie ładuje matplotlib ani DEAP"""
+        code = "import algorithms.pso, algorithms.simulated_annealing, algorithms.genetic_algorithm"
+        self.assertEqual(loaded_heavy_modules(code), '[]')
+
+    def test_headless_run_skips_matplotlib(self):
+        """Test że bieg PSO bez wykresów nie dotyka matplotlib"""
+        code = ("from algorithms.pso import ParticleSwarmOptimization\n"
+                "ParticleSwarmOptimization(population_size=4, generations=2, verbose=False).run()")
+        self.assertEqual(loaded_heavy_modules(code), '[]')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy wstępnej selekcji modelem zastępczym
+"""
+
+import unittest
+
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.pso import ParticleSwarmOptimization
+from drone_path_optimization import OBSTACLES, WIND_SPEED, WIND_DIRECTION
+from geometry import compile_obstacles, evaluate_paths
+from observers import GenerationObserver
+from surrogate import SurrogateModel, SurrogateScreening, rank_correlation
+
+
+def random_paths(rng, n, num_waypoints=8):
+    """Losowe trasy (0, 0) -> (100, 100)"""
+    inner = rng.uniform(0, 100, (n, num_waypoints - 2, 2))
+    return np.concatenate([np.zeros((n, 1, 2)), inner, np.full((n, 1, 2), 100.0)], axis=1)
+
+
+class TestRankCorrelation(unittest.TestCase):
+    """Testy korelacji rang Spearmana"""
+
+    def test_values(self):
+        """Test monotonicznej zależności, odwrócenia i remisów"""
+        x = np.arange(10.0)
+        self.assertAlmostEqual(rank_correlation(x, np.exp(x)), 1.0)
+        self.assertAlmostEqual(rank_correlation(x, -x), -1.0)
+        # Remisy: rangi średnie [1.5, 1.5, 3] i [1, 2, 3]
+        self.assertAlmostEqual(rank_correlation([1, 1, 2], [1, 2, 3]), np.sqrt(3) / 2)
+        self.assertTrue(np.isnan(rank_correlation([1, 1], [1, 2])))
+
+
+class TestSurrogateModel(unittest.TestCase):
+    """Testy regresji k-NN"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.geometry = compile_obstacles(OBSTACLES)
+
+    def _fitness(self, paths):
+        return evaluate_paths(paths, self.geometry, WIND_SPEED, WIND_DIRECTION)
+
+    def test_interpolates_archive(self):
+        """Test dokładnego przewidywania dla tras z archiwum"""
+        paths = random_paths(self.rng, 50)
+        model = SurrogateModel()
+        model.update(paths, self._fitness(paths))
+        np.testing.assert_allclose(model.predict(paths[:10]), self._fitness(paths[:10]))
+
+    def test_rank_correlation_on_new_paths(self):
+        """Test trafności rang na nowych trasach"""
+        model = SurrogateModel()
+        train = random_paths(self.rng, 1000)
+        model.update(train, self._fitness(train))
+        test = random_paths(self.rng, 200)
+        self.assertGreater(rank_correlation(model.predict(test), self._fitness(test)), 0.5)
+
+    def test_variable_length_and_archive_limit(self):
+        """Test tras różnej długości i ograniczenia archiwum"""
+        model = SurrogateModel(max_archive=30)
+        paths = [random_paths(self.rng, 1, n)[0] for n in (3, 5, 8, 12) * 10]
+        model.update(paths, np.arange(len(paths), dtype=float))
+        self.assertEqual(len(model), 30)
+        self.assertEqual(model.features(paths).shape, (40, 12))
+        self.assertEqual(model.predict(paths[:4]).shape, (4,))
+
+
+class TestScreening(unittest.TestCase):
+    """Testy selekcji i statystyk"""
+
+    def test_warmup_and_selection(self):
+        """Test braku selekcji przed zebraniem ocen i wyboru najlepiej rokujących"""
+        rng = np.random.default_rng(1)
+        screening = SurrogateScreening(fraction=0.25, min_samples=20)
+        paths = random_paths(rng, 20)
+        self.assertEqual(screening.pool_size(10), 10)
+        chosen, predicted = screening.select(paths, 10)
+        self.assertIsNone(predicted)
+        np.testing.assert_array_equal(chosen, np.arange(10))
+
+        screening.record(paths, np.arange(20.0))
+        self.assertEqual(screening.pool_size(10), 40)
+        self.assertEqual(screening.keep_size(10), 3)
+        pool = random_paths(rng, 40)
+        chosen, predicted = screening.select(pool, 10)
+        self.assertEqual(len(chosen), 10)
+        self.assertLessEqual(predicted[chosen].max(), np.delete(predicted, chosen).min())
+        report = screening.report()
+        self.assertEqual((report['screened'], report['evaluated'], report['evaluations_saved']),
+                         (40, 10, 30))
+
+    def test_copies_go_last(self):
+        """Test pomijania kopii ocenionych tras"""
+        rng = np.random.default_rng(2)
+        screening = SurrogateScreening(min_samples=1)
+        paths = random_paths(rng, 5)
+        screening.record(paths, [0.0, 1e3, 1e3, 1e3, 1e3])
+        chosen, _ = screening.select(np.concatenate([paths[:1], random_paths(rng, 3)]), 3)
+        self.assertNotIn(0, chosen)
+
+    def test_invalid_fraction(self):
+        """Test walidacji części ocenianej"""
+        with self.assertRaises(ValueError):
+            SurrogateScreening(fraction=0)
+
+
+class TestEngines(unittest.TestCase):
+    """Testy selekcji w GA i PSO"""
+
+    def test_ga(self):
+        """Test GA: ta sama liczba prawdziwych ewaluacji, większa pula kandydatów"""
+        evaluations = {}
+        for surrogate in (False, True):
+            result = GeneticAlgorithm(population_size=30, generations=20, verbose=False, seed=0,
+                                      surrogate=surrogate).run()
+            evaluations[surrogate] = result['evaluations']
+        self.assertEqual(evaluations[True], evaluations[False])
+        report = result['surrogate']
+        self.assertGreater(report['evaluations_saved'], 0)
+        self.assertGreater(report['rank_correlation'], 0.5)
+
+    def test_ga_variable_length(self):
+        """Test GA z genomami zmiennej długości"""
+        result = GeneticAlgorithm(population_size=30, generations=10, verbose=False, seed=1,
+                                  variable_length=True, surrogate=True).run()
+        self.assertGreater(result['surrogate']['screened'], 0)
+
+    def test_pso(self):
+        """Test PSO: prawdziwą ewaluację dostaje część roju"""
+        result = ParticleSwarmOptimization(population_size=40, generations=20, verbose=False, seed=0,
+                                           surrogate=True, surrogate_fraction=0.25).run()
+        self.assertLess(result['evaluations'], 40 * 21)
+        self.assertGreater(result['surrogate']['evaluations_saved'], 0)
+        self.assertEqual(len(result['best_fitness']), 20)
+        geometry = compile_obstacles(OBSTACLES)
+        best = evaluate_paths([result['best_individual']], geometry, WIND_SPEED, WIND_DIRECTION)[0]
+        self.assertLessEqual(best, result['best_fitness'][-1] + 1e-9)
+
+    def test_pso_reports_true_fitness(self):
+        """Test PSO: średni fitness i obserwatorzy widzą tylko prawdziwe oceny"""
+        class Recorder(GenerationObserver):
+            def __init__(self):
+                self.fitness = []
+
+            def on_generation(self, state):
+                self.fitness.append(state.fitness)
+
+        recorder = Recorder()
+        pso = ParticleSwarmOptimization(population_size=40, generations=10, verbose=False, seed=0,
+                                        surrogate=True, observers=[recorder])
+        true = []
+        original = pso._evaluate_swarm
+
+        def evaluate(particles):
+            fits = original(particles)
+            true.extend(fits)
+            return fits
+
+        pso._evaluate_swarm = evaluate
+        result = pso.run()
+        self.assertTrue(pso.surrogate.ready)
+        for fitness, avg in zip(recorder.fitness, result['avg_fitness']):
+            self.assertTrue(np.isin(fitness, true).all())
+            self.assertAlmostEqual(avg, fitness.mean())
+
+    def test_pso_injected_particles_update_best(self):
+        """Test PSO: wstrzyknięta cząstka (prawdziwa ocena) trafia do najlepszych pozycji"""
+        straight = np.linspace([0, 0], [100, 100], 8).tolist()
+
+        class Injector(GenerationObserver):
+            def on_generation(self, state):
+                if state.generation == 6:
+                    state.inject(straight)
+
+        pso = ParticleSwarmOptimization(population_size=40, generations=8, verbose=False, seed=0,
+                                        obstacles=[], surrogate=True, observers=[Injector()])
+        result = pso.run()
+        self.assertTrue(pso.surrogate.ready)
+        fit = evaluate_paths([straight], compile_obstacles([]), WIND_SPEED, WIND_DIRECTION)[0]
+        self.assertAlmostEqual(result['best_fitness'][-1], fit)
+        np.testing.assert_allclose(result['best_individual'], straight)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy telemetrii generacji (JSON Lines)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from telemetry import JsonlTelemetry, generation_stats
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from algorithms.pso import ParticleSwarmOptimization
+from algorithms.simulated_annealing import SimulatedAnnealing
+
+
+class TestGenerationStats(unittest.TestCase):
+    """Testy statystyk generacji"""
+
+    def test_stats_values(self):
+        """Test wartości best/mean/std"""
+        stats = generation_stats([1.0, 2.0, 3.0])
+        self.assertEqual(stats['best'], 1.0)
+        self.assertAlmostEqual(stats['mean'], 2.0)
+        self.assertEqual(stats['diversity'], 0.0)
+
+    def test_diversity_of_identical_population(self):
+        """Test zerowej różnorodności identycznej populacji"""
+        pop = [[[0, 0], [5, 5]], [[0, 0], [5, 5]]]
+        self.assertEqual(generation_stats([1.0, 1.0], pop)['diversity'], 0.0)
+
+
+class TestJsonlTelemetry(unittest.TestCase):
+    """Testy zapisu telemetrii"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _read(self):
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_one_record_per_generation(self):
+        """Test jednego rekordu na generację dla każdego algorytmu"""
+        with JsonlTelemetry(self.path) as telemetry:
+            GeneticAlgorithm(population_size=6, generations=3,
+                             observers=[telemetry], verbose=False).run()
+            ParticleSwarmOptimization(population_size=6, generations=4,
+                                      observers=[telemetry], verbose=False).run()
+            SimulatedAnnealing(generations=5, observers=[telemetry], verbose=False).run()
+
+        records = self._read()
+        counts = {}
+        for rec in records:
+            counts[rec['algorithm']] = counts.get(rec['algorithm'], 0) + 1
+        self.assertEqual(counts, {'GA': 3, 'PSO': 4, 'SA': 5})
+
+        for key in ('best', 'mean', 'std', 'diversity', 'evaluations', 'elapsed'):
+            self.assertIn(key, records[0])
+
+    def test_callback_receives_records(self):
+        """Test wywołania callbacku w procesie"""
+        received = []
+        with JsonlTelemetry(self.path, callbacks=[received.append]) as telemetry:
+            GeneticAlgorithm(population_size=12, generations=2,
+                             observers=[telemetry], verbose=False).run()
+
+        self.assertEqual([r['generation'] for r in received], [1, 2])
+        # Druga generacja ocenia tylko potomków spoza elity (12 - 10)
+        self.assertEqual(received[-1]['evaluations'], 14)
+        self.assertEqual(len(self._read()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
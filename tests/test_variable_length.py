@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testy genomów zmiennej długości
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from algorithms.genetic_algorithm import GeneticAlgorithm
+from drone_path_optimization import (
+    GRID_WIDTH, GRID_HEIGHT, arc_partners, crossover_blx, crossover_splice,
+    mutate_add_waypoint, mutate_delete_waypoint
+)
+from geometry import compile_obstacles, evaluate_paths, pad_paths
+from observers import GenerationObserver
+
+WALL = [{'type': 'rect', 'x': 45, 'y': 0, 'width': 2, 'height': 85}]
+
+
+class TestPadding(unittest.TestCase):
+    """Testy dopełnionej reprezentacji i ewaluacji z maską"""
+
+    def test_pad_paths(self):
+        """Test dopełnienia metą i długości tras"""
+        paths = [[[0, 0], [5, 5], [10, 10]], [[0, 0], [10, 10]], [[0, 0], [2, 8], [4, 4], [10, 10]]]
+        padded, lengths = pad_paths(paths)
+        self.assertEqual(padded.shape, (3, 4, 2))
+        np.testing.assert_array_equal(lengths, [3, 2, 4])
+        np.testing.assert_array_equal(padded[1], [[0, 0], [10, 10], [10, 10], [10, 10]])
+
+    def test_masked_evaluation_matches_unpadded(self):
+        """Test fitness tras dopełnionych równego fitness tras osobno"""
+        rng = np.random.default_rng(0)
+        geometry = compile_obstacles([{'type': 'circle', 'center': (50, 50), 'radius': 10},
+                                      {'type': 'circle', 'center': (100, 100), 'radius': 3}])
+        paths = [np.r_[[[0, 0]], rng.uniform(0, 100, (n, 2)), [[100, 100]]] for n in (1, 4, 9, 2)]
+        padded, lengths = pad_paths(paths)
+        expected = [evaluate_paths([p], geometry, 5.0, 45)[0] for p in paths]
+        np.testing.assert_allclose(evaluate_paths(padded, geometry, 5.0, 45, lengths), expected)
+
+    def test_max_segment_catches_thin_obstacles(self):
+        """Test podziału długich odcinków - cienka ściana nie jest przeskakiwana"""
+        # Ściana między próbkami co 5 jednostek
+        geometry = compile_obstacles([{'type': 'rect', 'x': 46, 'y': 0, 'width': 2, 'height': 85}])
+        path = [[[0, 10], [100, 10]]]
+        self.assertEqual(evaluate_paths(path, geometry, 0, 0)[0], 100)
+        self.assertEqual(evaluate_paths(path, geometry, 0, 0, max_segment=10)[0], 200)
+        # Krótkie odcinki nie są dzielone - wynik bez zmian
+        short = [[[0, 10], [5, 10], [10, 10]]]
+        self.assertEqual(evaluate_paths(short, geometry, 0, 0, max_segment=10)[0],
+                         evaluate_paths(short, geometry, 0, 0)[0])
+
+
+class TestOperators(unittest.TestCase):
+    """Testy operatorów zmieniających liczbę waypointów"""
+
+    def setUp(self):
+        random.seed(0)
+        self.path = [[0, 0], [20, 60], [50, 50], [80, 30], [100, 100]]
+
+    def test_add_and_delete(self):
+        """Test dodania i usunięcia waypointu z zachowaniem końców i granic"""
+        path = [list(p) for p in self.path]
+        mutate_add_waypoint(path)
+        self.assertEqual(len(path), 6)
+        self.assertEqual((path[0], path[-1]), ([0, 0], [100, 100]))
+        self.assertTrue(all(0 <= x <= GRID_WIDTH and 0 <= y <= GRID_HEIGHT for x, y in path))
+        for _ in range(10):
+            mutate_delete_waypoint(path)
+        self.assertEqual(path, [[0, 0], path[1], [100, 100]])
+
+    def test_length_limits(self):
+        """Test granic liczby waypointów"""
+        path = [list(p) for p in self.path]
+        mutate_add_waypoint(path, max_waypoints=5)
+        self.assertEqual(len(path), 5)
+        mutate_delete_waypoint(path, min_waypoints=5)
+        self.assertEqual(len(path), 5)
+
+    def test_delete_prefers_small_detour(self):
+        """Test usuwania punktu leżącego prawie na prostej"""
+        path = [[0, 0], [30, 80], [60, 60.5], [100, 100]]
+        mutate_delete_waypoint(path)
+        self.assertEqual(path, [[0, 0], [30, 80], [100, 100]])
+
+    def test_arc_partners(self):
+        """Test parowania po ułamku długości trasy"""
+        partners = arc_partners([[0, 0], [25, 0], [100, 0]], [[0, 0], [50, 0], [100, 0]])
+        np.testing.assert_allclose(partners, [[0, 0], [25, 0], [100, 0]])
+
+    def test_crossovers_keep_endpoints(self):
+        """Test krzyżowań tras różnej długości"""
+        for _ in range(20):
+            ind1 = [list(p) for p in self.path]
+            ind2 = [[0, 0], [60, 10], [100, 100]]
+            crossover_blx(ind1, ind2)
+            self.assertEqual((len(ind1), len(ind2)), (5, 3))
+            total = len(ind1) + len(ind2)
+            crossover_splice(ind1, ind2)
+            self.assertEqual(len(ind1) + len(ind2), total)
+            for ind in (ind1, ind2):
+                self.assertEqual((ind[0], ind[-1]), ([0, 0], [100, 100]))
+                self.assertGreaterEqual(len(ind), 3)
+
+
+class _Shapes(GenerationObserver):
+    """Zapamiętuje kształt populacji widzianej przez obserwatora"""
+
+    def __init__(self):
+        self.shapes = []
+
+    def on_generation(self, state):
+        self.shapes.append(state.population.shape)
+
+
+class TestVariableLengthGA(unittest.TestCase):
+    """Testy GA z genomami zmiennej długości"""
+
+    def test_run(self):
+        """Test biegu: różne długości w populacji, dopełniona populacja dla obserwatorów"""
+        shapes = _Shapes()
+        ga = GeneticAlgorithm(population_size=30, generations=20, variable_length=True,
+                              observers=[shapes], verbose=False, seed=1, memetic=True)
+        result = ga.run()
+        lengths = [len(ind) for ind in result['population']]
+        self.assertTrue(all(3 <= n <= ga.max_waypoints for n in lengths))
+        self.assertEqual(len(ga.length_history), 20)
+        self.assertTrue(all(len(s) == 3 and s[0] == 30 for s in shapes.shapes))
+        best = result['best_individual']
+        fit = ga._evaluate_population([best])[0]
+        self.assertAlmostEqual(best.fitness.values[0], fit)
+
+    def test_simple_map_needs_fewer_points(self):
+        """Test krótszego genomu i lepszego fitness na mapie z jedną ścianą"""
+        results = {}
+        for variable in (False, True):
+            ga = GeneticAlgorithm(population_size=60, generations=60, variable_length=variable,
+                                  obstacles=WALL, verbose=False, seed=0)
+            best = ga.run()['best_individual']
+            results[variable] = (ga._evaluate_population([best])[0], len(best))
+        self.assertLess(results[True][1], results[False][1])
+        self.assertLess(results[True][0], results[False][0])
+
+    def test_replan(self):
+        """Test przeplanowania populacji o różnych długościach"""
+        ga = GeneticAlgorithm(population_size=20, generations=5, variable_length=True, verbose=False, seed=2)
+        result = ga.run()
+        replanned = ga.replan(result['population'], {'added': WALL}, generations=3)
+        self.assertEqual(len(replanned['population']), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()